@@ -3,8 +3,16 @@ pragma solidity ^0.8.0;
 
 contract AuthLogger {
     event AuthEvent(bytes32 vehicleHash, uint256 timestamp, bool authenticated);
+    event AuthBatch(bytes32 merkleRoot, uint256 count, uint256 fromTimestamp, uint256 toTimestamp);
 
     function logAuth(bytes32 vehicleHash, uint256 timestamp, bool authenticated) public {
         emit AuthEvent(vehicleHash, timestamp, authenticated);
     }
+
+    // Anchor the Merkle root of a batch of auth events instead of logging each one
+    function logAuthBatch(bytes32 merkleRoot, uint256 count, uint256 fromTimestamp, uint256 toTimestamp) public {
+        require(count > 0, "empty batch");
+        require(fromTimestamp <= toTimestamp, "invalid time range");
+        emit AuthBatch(merkleRoot, count, fromTimestamp, toTimestamp);
+    }
 }
\ No newline at end of file
@@ -0,0 +1,325 @@
+"""
+benchmark.py
+
+Purpose:
+    Measures throughput and per-stage latency of the authentication pipeline, so RSU hardware can be sized from
+    numbers instead of pass/fail counts.
+
+Methodology:
+    - Simulated path: for every vehicle, times generate_otp, create_zkp, verify_zkp and
+      simulate_blockchain_verification individually, and the whole run end to end.
+    - The fleet is split across `concurrency` worker processes, each with its own RSU for its share of the fleet.
+    - ZoKrates path (optional): times whole witness/proof/verify jobs via prove_many and, when py_ecc is installed,
+      in-process Groth16 verification of the resulting proofs, as a stage named after the verifier backend
+      (groth16_verify_native when zksnake is installed, a few milliseconds per proof; otherwise
+      groth16_verify_py_ecc, the reference verifier at about a second per proof).
+    - Reports auths/sec and p50/p95/p99 latency per stage, writes the results as JSON, and compares them against a
+      stored baseline, flagging throughput drops or p95 increases beyond a tolerance.
+
+Usage:
+    python benchmark.py --fleet-sizes 100 1000 --concurrency 1 4 --output bench.json --baseline baseline.json
+    Exits with status 1 if a regression against the baseline is found.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from vehicle import Vehicle
+from rsu import RSU
+from blockchain import simulate_blockchain_verification
+from zokrates_cache import get_circuit_artifacts
+from zokrates_pool import prove_many
+
+SIMULATED_STAGES = ("generate_otp", "create_zkp", "verify_zkp", "simulate_blockchain_verification")
+DEFAULT_TOLERANCE = 0.2         # Allowed fractional slowdown before a result counts as a regression
+
+
+"""
+Function: percentile
+
+Nearest-rank percentile of a sorted list.
+
+Args:
+    sorted_values (list of float): Values in ascending order.
+    fraction (float): Percentile as a fraction, e.g. 0.95.
+"""
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * fraction // 1))
+    return sorted_values[int(rank) - 1]
+
+
+"""
+Function: summarize_latencies
+
+Summarize per-operation latencies (in seconds) as count, mean and p50/p95/p99 in milliseconds.
+"""
+def summarize_latencies(latencies):
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "mean_ms": 1000 * sum(values) / len(values) if values else 0.0,
+        "p50_ms": 1000 * percentile(values, 0.50),
+        "p95_ms": 1000 * percentile(values, 0.95),
+        "p99_ms": 1000 * percentile(values, 0.99),
+    }
+
+
+"""
+Function: _simulated_shard
+
+Run the simulated pipeline for one share of the fleet and record per-stage latencies (runs in a worker process).
+
+Args:
+    vehicle_secrets (dict): vehicle_id -> secret for this shard.
+
+Returns:
+    dict: {stage: list of latencies in seconds, "authenticated": int, "elapsed": seconds spent authenticating}
+"""
+def _simulated_shard(vehicle_secrets):
+    clock = time.perf_counter
+    latencies = {stage: [] for stage in SIMULATED_STAGES}
+    authenticated = 0
+    rsu = RSU(vehicle_secrets, precompute=True)
+    rsu.start_ticker()                  # Window precomputed up front and kept current in the background
+    vehicles = [Vehicle(vehicle_id, secret) for vehicle_id, secret in vehicle_secrets.items()]
+    # The blockchain simulation prints every event; send that to /dev/null so terminal speed is not measured
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = clock()
+        for vehicle in vehicles:
+            t0 = clock()
+            otp, timestamp = vehicle.generate_otp()
+            t1 = clock()
+            zkp_proof = vehicle.create_zkp(otp, timestamp)
+            t2 = clock()
+            result = rsu.verify_zkp(vehicle.vehicle_id, zkp_proof, timestamp)
+            t3 = clock()
+            result = simulate_blockchain_verification(vehicle.vehicle_id, zkp_proof, timestamp, result)
+            t4 = clock()
+            latencies["generate_otp"].append(t1 - t0)
+            latencies["create_zkp"].append(t2 - t1)
+            latencies["verify_zkp"].append(t3 - t2)
+            latencies["simulate_blockchain_verification"].append(t4 - t3)
+            authenticated += bool(result)
+        elapsed = clock() - start
+    rsu.stop_ticker()
+    latencies["authenticated"] = authenticated
+    latencies["elapsed"] = elapsed
+    return latencies
+
+
+"""
+Function: benchmark_simulated
+
+Benchmark the simulated authentication pipeline.
+
+Args:
+    fleet_size (int): Number of vehicles to authenticate.
+    concurrency (int): Number of worker processes (1 runs in the current process).
+
+Returns:
+    dict: Run record with auths_per_sec, wall_seconds, authenticated and per-stage latency summaries.
+          auths_per_sec is measured over the authentication loops only (the slowest shard bounds it);
+          wall_seconds also includes worker start-up and RSU window precomputation.
+"""
+def benchmark_simulated(fleet_size, concurrency):
+    vehicle_secrets = {f"VEH{i:07d}": secrets.token_hex(16) for i in range(fleet_size)}
+    items = list(vehicle_secrets.items())
+    shards = [dict(items[i::concurrency]) for i in range(concurrency)]
+    start = time.perf_counter()
+    if concurrency == 1:
+        shard_results = [_simulated_shard(shards[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=concurrency) as executor:
+            shard_results = list(executor.map(_simulated_shard, shards))
+    wall = time.perf_counter() - start
+    busy = max(result["elapsed"] for result in shard_results)
+    stages = {}
+    for stage in SIMULATED_STAGES:
+        stages[stage] = summarize_latencies([value for result in shard_results for value in result[stage]])
+    return {
+        "path": "simulated",
+        "fleet_size": fleet_size,
+        "concurrency": concurrency,
+        "wall_seconds": wall,
+        "auths_per_sec": fleet_size / busy if busy else 0.0,
+        "authenticated": sum(result["authenticated"] for result in shard_results),
+        "stages": stages,
+    }
+
+
+"""
+Function: benchmark_zokrates
+
+Benchmark real proofs for a circuit: whole witness/proof/verify jobs, plus in-process Groth16 verification
+when py_ecc is available (with the native backend if zksnake is installed).
+
+Args:
+    circuit_path (str): ZoKrates circuit (compiled and set up once, outside the timed region).
+    jobs (int): Number of proofs to generate.
+    concurrency (int): Worker processes for prove_many.
+
+Returns:
+    dict or None: Run record, or None if the circuit could not be compiled/set up.
+"""
+def benchmark_zokrates(circuit_path, jobs, concurrency):
+    artifacts = get_circuit_artifacts(circuit_path)                 # Compile/setup outside the timed region
+    if artifacts is None:
+        return None
+    start = time.perf_counter()
+    results = prove_many(circuit_path, [[i, i + 1] for i in range(jobs)], max_workers=concurrency)
+    wall = time.perf_counter() - start
+    stages = {"zokrates_prove": summarize_latencies([r["elapsed"] for r in results])}
+    proofs = [r["proof"] for r in results if r["proof"] is not None]
+    try:
+        from groth16_verifier import Groth16Verifier     # Optional: needs py_ecc
+    except ImportError:
+        Groth16Verifier = None
+    if Groth16Verifier is not None and proofs:
+        try:
+            verifier = Groth16Verifier.from_file(artifacts["verification_key"])
+        except (KeyError, ValueError) as e:
+            print(f"[Benchmark] Cannot load verification key for in-process verification: {e}")
+            proofs = []
+    if proofs and Groth16Verifier is not None:
+        latencies = []
+        for proof in proofs:
+            t0 = time.perf_counter()
+            verifier.verify(proof)
+            latencies.append(time.perf_counter() - t0)
+        # Keyed by backend, so a baseline is only compared against runs of the same verifier
+        stages[f"groth16_verify_{verifier.backend}"] = summarize_latencies(latencies)
+    return {
+        "path": "zokrates",
+        "fleet_size": jobs,
+        "concurrency": concurrency,
+        "wall_seconds": wall,
+        "auths_per_sec": jobs / wall if wall else 0.0,
+        "authenticated": sum(1 for r in results if r["verified"]),
+        "stages": stages,
+    }
+
+
+"""
+Function: compare_to_baseline
+
+Compare benchmark runs against a baseline report.
+
+Runs are matched on (path, fleet_size, concurrency). A run regresses if its auths/sec falls below
+(1 - tolerance) x baseline, or a stage's p95 latency rises above (1 + tolerance) x baseline.
+
+Args:
+    report (dict): Current benchmark report.
+    baseline (dict): Baseline benchmark report (same format).
+    tolerance (float): Allowed fractional change (default DEFAULT_TOLERANCE).
+
+Returns:
+    list of str: Human-readable regression descriptions (empty if none).
+"""
+def compare_to_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    baseline_runs = {(r["path"], r["fleet_size"], r["concurrency"]): r for r in baseline.get("runs", [])}
+    regressions = []
+    for run in report["runs"]:
+        key = (run["path"], run["fleet_size"], run["concurrency"])
+        base = baseline_runs.get(key)
+        if base is None:
+            continue
+        label = f"{run['path']} fleet={run['fleet_size']} concurrency={run['concurrency']}"
+        if run["auths_per_sec"] < base["auths_per_sec"] * (1 - tolerance):
+            regressions.append(f"{label}: auths/sec {run['auths_per_sec']:.0f} vs baseline {base['auths_per_sec']:.0f}")
+        for stage, summary in run["stages"].items():
+            base_stage = base["stages"].get(stage)
+            if base_stage and summary["p95_ms"] > base_stage["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{label}: {stage} p95 {summary['p95_ms']:.3f} ms "
+                                   f"vs baseline {base_stage['p95_ms']:.3f} ms")
+    return regressions
+
+
+"""
+Function: print_report
+
+Print one line per run and one line per stage.
+"""
+def print_report(report):
+    for run in report["runs"]:
+        print(f"[Benchmark] {run['path']} fleet={run['fleet_size']} concurrency={run['concurrency']}: "
+              f"{run['auths_per_sec']:.0f} auths/sec ({run['authenticated']}/{run['fleet_size']} authenticated, "
+              f"{run['wall_seconds']:.2f}s)")
+        for stage, summary in run["stages"].items():
+            print(f"[Benchmark]     {stage:<34} p50 {summary['p50_ms']:8.3f} ms  "
+                  f"p95 {summary['p95_ms']:8.3f} ms  p99 {summary['p99_ms']:8.3f} ms")
+
+
+"""
+Function: run_benchmarks
+
+Run every requested benchmark configuration and assemble the report.
+
+Args:
+    fleet_sizes (list of int): Fleet sizes for the simulated path.
+    concurrency_levels (list of int): Worker process counts.
+    zokrates_circuit (str, optional): Circuit to benchmark the ZoKrates path with (skipped if None).
+    zokrates_jobs (int): Proofs per ZoKrates run.
+
+Returns:
+    dict: {"meta": {...}, "runs": [run records]}
+"""
+def run_benchmarks(fleet_sizes, concurrency_levels, zokrates_circuit=None, zokrates_jobs=4):
+    runs = []
+    for fleet_size in fleet_sizes:
+        for concurrency in concurrency_levels:
+            runs.append(benchmark_simulated(fleet_size, concurrency))
+    if zokrates_circuit:
+        for concurrency in concurrency_levels:
+            run = benchmark_zokrates(zokrates_circuit, zokrates_jobs, concurrency)
+            if run is None:
+                print("[Benchmark] ZoKrates compilation or setup failed; skipping the ZoKrates path.")
+                break
+            runs.append(run)
+    meta = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    return {"meta": meta, "runs": runs}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ZKP-OTP authentication pipeline.")
+    parser.add_argument("--fleet-sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1])
+    parser.add_argument("--zokrates", metavar="CIRCUIT", help="Also benchmark real proofs for this circuit (e.g. dummy.zok)")
+    parser.add_argument("--zokrates-jobs", type=int, default=4, help="Proofs per ZoKrates run (default 4)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against this JSON report and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.fleet_sizes, args.concurrency, args.zokrates, args.zokrates_jobs)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[Benchmark] Report written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"[Benchmark] REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("[Benchmark] No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,10 @@ Methodology:
     - Anonymizes vehicle IDs using hashing before logging.
     - Simulates a smart contract call and logs the event with vehicle hash, timestamp, and authentication status.
     - Returns the outcome to mimic infrastructure access control.
+    - With an event_log (see auth_log.py), the event is queued for a background writer instead of printed,
+      so the access decision never waits on console or disk I/O.
+    - With a pseudonym service (see pseudonyms.py), the vehicle hash is replaced by the vehicle's rotating
+      per-epoch pseudonym, looked up from a precomputed table instead of hashed per event.
 """
 
 import hashlib      # Import hashlib for hashing vehicle IDs to anonymize them
@@ -24,30 +28,41 @@ Args:
     zkp_proof (str): The zero-knowledge proof generated by the vehicle.
     timestamp (int): The timestamp associated with the OTP.
     verification_result (bool): The result of RSU verification (True if authenticated).
+    event_log (AuthEventLog, optional): Buffered ledger to queue the event on instead of printing it.
+    pseudonyms (PseudonymService, optional): Source of per-epoch pseudonyms used in place of the vehicle hash.
     
 Returns:
     bool: The outcome of the simulated blockchain verification (same as input verification_result).
     
 Steps:
-1. Hash the vehicle_id to anonymize it for blockchain logging
-2. Print a message simulating the smart contract call with anonymized vehicle ID
-3. Create a log entry dictionary with anonymized vehicle hash, timestamp, and authentication status
-4. Print the simulated blockchain event log
+1. Anonymize the vehicle_id: look up its epoch pseudonym if a service is given, else hash it once
+2. Create a log entry dictionary with anonymized vehicle hash, timestamp, and authentication status
+3. If an event log is given, queue the entry on it and return without printing
+4. Otherwise print the simulated smart contract call and event log
 5. Return the outcome to simulate the infrastructure's access decision
 """
-def simulate_blockchain_verification(vehicle_id, zkp_proof, timestamp, verification_result):
-    # Hash the vehicle_id to anonymize it for blockchain logging
-    anonymized_id = hashlib.sha256(vehicle_id.encode()).hexdigest()[:10]
-    # Print a message simulating the smart contract call with anonymized vehicle ID
-    print(f"[Blockchain] Verifying ZKP-OTP proof for anonymized vehicle ID: {anonymized_id}...\n")
-    
+def simulate_blockchain_verification(vehicle_id, zkp_proof, timestamp, verification_result, event_log=None,
+                                     pseudonyms=None):
+    # Anonymize the vehicle_id for blockchain logging: a rotating pseudonym lookup, or a one-off hash
+    if pseudonyms is not None:
+        vehicle_hash = pseudonyms.pseudonym(vehicle_id, timestamp)
+    else:
+        vehicle_hash = hashlib.sha256(vehicle_id.encode()).hexdigest()
+
     # Create a log entry dictionary with anonymized vehicle hash, timestamp, and authentication status
     log_entry = {
-        "vehicle_hash": hashlib.sha256(vehicle_id.encode()).hexdigest(),    # Full hash for record
+        "vehicle_hash": vehicle_hash,                                       # Full hash for record
         "timestamp": timestamp,                                             # Timestamp of the authentication attempt
         "authenticated": verification_result                                # Whether authentication succeeded
     }
-    
+
+    # Queue the event for the background ledger writer; the decision does not wait on I/O
+    if event_log is not None:
+        event_log.log(log_entry)
+        return verification_result
+
+    # Print a message simulating the smart contract call with anonymized vehicle ID
+    print(f"[Blockchain] Verifying ZKP-OTP proof for anonymized vehicle ID: {vehicle_hash[:10]}...\n")
     # Print the simulated blockchain event log
     print(f"[Blockchain] Event logged: {log_entry}\n")
     # Return the outcome to simulate the infrastructure's access decision
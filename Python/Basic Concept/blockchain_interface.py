@@ -9,10 +9,129 @@ Methodology:
     - Initializes a Web3 connection and contract instance using provided ABI and address.
     - Provides a method to log authentication attempts by calling the smart contract's logAuth function.
     - Handles transaction signing and sending using a provided private key.
+    - Allocates nonces locally (one RPC to initialize, resynchronized from the node after a nonce error), and caches
+      chain ID, gas price and gas limit, so building a transaction needs no RPC round-trips. Nonces of failed sends
+      are handed out again, and a resync never moves below nonces still reserved by sends in flight.
+    - TransactionPipeline keeps many signed transactions in flight and tracks their receipts in the background.
+      Events whose send still hits a nonce error after the interface's retries are requeued rather than failed,
+      and reverted transactions (receipt status 0) count as failures.
+    - mock_rpc.py provides a local JSON-RPC stand-in for exercising the nonce allocator and pipeline.
+    - anchor_batch anchors the Merkle root of a batch of auth events (see merkle_batch.py) with one logAuthBatch call.
 """
 
 from web3 import Web3
-import json
+from web3.exceptions import TransactionNotFound
+import heapq
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+GAS_HEADROOM = 1.2              # Multiplier on the first gas estimate, reused as the gas limit for later transactions
+DEFAULT_MAX_IN_FLIGHT = 64      # Unconfirmed transactions a pipeline allows before submit() waits
+DEFAULT_SEND_WORKERS = 4        # Threads signing and sending transactions
+DEFAULT_POLL_INTERVAL = 0.5     # Seconds between receipt checks
+DEFAULT_SEND_RETRIES = 3        # Pipeline resends after a nonce error (concurrent sends can collide after a resync)
+DEFAULT_MAX_REQUEUES = 20       # Times the pipeline requeues an event whose sends keep hitting nonce errors
+
+
+"""
+Function: is_nonce_error
+
+Return True if a send error means the local nonce is out of step with the node.
+"""
+def is_nonce_error(error):
+    message = str(error).lower()
+    return "nonce" in message or "already known" in message or "replacement transaction underpriced" in message
+
+
+"""
+NonceAllocator Class
+
+Hands out consecutive nonces for one account without an RPC per transaction.
+
+Functionality:
+    - The first allocate() reads the account's pending transaction count from the node.
+    - Later calls increment a local counter under a lock, so concurrent callers never receive the same nonce.
+    - An allocated nonce stays reserved until the caller reports it sent (sent()) or not accepted (release());
+      released nonces are handed out again first, so a failed send does not leave a gap.
+    - resync() re-reads the pending count after a nonce error (e.g. another process used the same key). The
+      counter becomes max(pending, highest reserved nonce + 1), so it never goes below a nonce another thread is
+      still sending, and released nonces the node has since seen used are dropped.
+
+Args:
+    web3 (Web3): Connected Web3 instance.
+    address (str): Account the nonces are for.
+"""
+class NonceAllocator:
+
+    def __init__(self, web3, address):
+        self.web3 = web3
+        self.address = address
+        self._lock = threading.Lock()
+        self._next = None
+        self._reserved = set()          # Allocated, send outcome not yet reported
+        self._released = []             # Min-heap of nonces whose send was not accepted, handed out again first
+        self.resyncs = 0
+
+
+    def allocate(self):
+        with self._lock:
+            if self._next is None:
+                self._next = self.web3.eth.get_transaction_count(self.address, "pending")
+            if self._released:
+                nonce = heapq.heappop(self._released)
+            else:
+                nonce = self._next
+                self._next += 1
+            self._reserved.add(nonce)
+            return nonce
+
+
+    """
+    Function: sent
+
+    Mark a nonce as accepted by the node.
+    """
+    def sent(self, nonce):
+        with self._lock:
+            self._reserved.discard(nonce)
+
+
+    """
+    Function: release
+
+    Return a nonce whose transaction the node did not accept, so it is reused instead of leaving a gap.
+    """
+    def release(self, nonce):
+        with self._lock:
+            if nonce in self._reserved:
+                self._reserved.discard(nonce)
+                heapq.heappush(self._released, nonce)
+
+
+    def resync(self):
+        with self._lock:
+            pending = self.web3.eth.get_transaction_count(self.address, "pending")
+            self._next = max([pending] + [nonce + 1 for nonce in self._reserved])
+            self._released = [nonce for nonce in self._released if pending <= nonce < self._next]
+            heapq.heapify(self._released)
+            self.resyncs += 1
+
+
+"""
+TransactionReverted
+
+Raised through a pipeline Future when the transaction was mined but reverted (receipt status 0).
+
+Args:
+    receipt (dict): The pipeline's receipt summary ({"tx_hash", "block_number", "status", "latency"}).
+"""
+class TransactionReverted(Exception):
+
+    def __init__(self, receipt):
+        super().__init__(f"Transaction {receipt['tx_hash']} reverted in block {receipt['block_number']}")
+        self.receipt = receipt
+
 
 class BlockchainInterface:
     """
@@ -21,10 +140,77 @@ class BlockchainInterface:
         provider_url (str): The HTTP provider URL for the blockchain node.
         contract_address (str): The deployed contract address.
         abi (list): The contract ABI.
+        gas_limit (int, optional): Gas limit for logAuth transactions (default: first estimate plus headroom).
     """
-    def __init__(self, provider_url, contract_address, abi):
+    def __init__(self, provider_url, contract_address, abi, gas_limit=None):
         self.web3 = Web3(Web3.HTTPProvider(provider_url))
         self.contract = self.web3.eth.contract(address=contract_address, abi=abi)
+        self.gas_limits = {} if gas_limit is None else {"logAuth": gas_limit}    # Contract function -> gas limit
+        self._chain_id = None
+        self._gas_price = None
+        self._nonces = {}               # address -> NonceAllocator
+        self._lock = threading.Lock()
+
+    """
+    Return the nonce allocator for an address, creating it on first use.
+    """
+    def nonce_allocator(self, address):
+        with self._lock:
+            if address not in self._nonces:
+                self._nonces[address] = NonceAllocator(self.web3, address)
+            return self._nonces[address]
+
+    """
+    Build and sign a contract call with an explicit nonce.
+    Chain ID, gas price and each function's gas limit are fetched once and cached, so this makes no RPC calls
+    after the first call of each function.
+    Args:
+        function_name (str): Contract function, e.g. "logAuth".
+        args (tuple): Function arguments.
+        from_address (str): The sender's blockchain address.
+        private_key (str): The sender's private key for signing.
+        nonce (int): Transaction nonce.
+    Returns:
+        bytes: The signed raw transaction.
+    """
+    def sign_call(self, function_name, args, from_address, private_key, nonce):
+        if self._chain_id is None:
+            self._chain_id = self.web3.eth.chain_id
+            self._gas_price = self.web3.eth.gas_price
+        call = getattr(self.contract.functions, function_name)(*args)
+        if function_name not in self.gas_limits:
+            self.gas_limits[function_name] = int(call.estimate_gas({'from': from_address}) * GAS_HEADROOM)
+        tx = call.build_transaction({
+            'from': from_address,
+            'nonce': nonce,
+            'chainId': self._chain_id,
+            'gas': self.gas_limits[function_name],
+            'gasPrice': self._gas_price,
+        })
+        signed = self.web3.eth.account.sign_transaction(tx, private_key)
+        return getattr(signed, "raw_transaction", None) or signed.rawTransaction
+
+    """
+    Sign and send a contract call using the local nonce allocator, resending after a nonce error.
+    Returns:
+        str: The transaction hash.
+    """
+    def send_call(self, function_name, args, from_address, private_key, retries=1):
+        nonces = self.nonce_allocator(from_address)
+        for attempt in range(retries + 1):
+            nonce = nonces.allocate()
+            try:
+                raw = self.sign_call(function_name, args, from_address, private_key, nonce)
+                tx_hash = self.web3.eth.send_raw_transaction(raw)
+            except Exception as e:
+                # Hand the nonce back, then re-read the node's view (drops it again if the node saw it used)
+                nonces.release(nonce)
+                nonces.resync()
+                if not is_nonce_error(e) or attempt == retries:
+                    raise
+                continue
+            nonces.sent(nonce)
+            return Web3.to_hex(tx_hash)
 
     """
     Log an authentication attempt by calling the smart contract's logAuth function.
@@ -34,23 +220,294 @@ class BlockchainInterface:
         authenticated (bool): Whether authentication succeeded.
         from_address (str): The sender's blockchain address.
         private_key (str): The sender's private key for signing.
+        retries (int): Resend attempts with a resynchronized nonce after a nonce error (default 1).
     Returns:
         str: The transaction hash.
     """
-    def log_auth(self, vehicle_hash, timestamp, authenticated, from_address, private_key):
-        tx = self.contract.functions.logAuth(vehicle_hash, timestamp, authenticated).build_transaction({
-            'from': from_address,
-            'nonce': self.web3.eth.get_transaction_count(from_address)
-        })
-        signed = self.web3.eth.account.sign_transaction(tx, private_key)
-        tx_hash = self.web3.eth.send_raw_transaction(signed.rawTransaction)
-        return tx_hash.hex()
+    def log_auth(self, vehicle_hash, timestamp, authenticated, from_address, private_key, retries=1):
+        return self.send_call("logAuth", (vehicle_hash, timestamp, authenticated), from_address, private_key, retries)
+
+    """
+    Anchor a batch of authentication events by logging only its Merkle root (see merkle_batch.py).
+    Args:
+        merkle_root (bytes): Root of the batch's Merkle tree.
+        count (int): Number of events in the batch.
+        from_timestamp (int): Earliest event timestamp in the batch.
+        to_timestamp (int): Latest event timestamp in the batch.
+        from_address (str): The sender's blockchain address.
+        private_key (str): The sender's private key for signing.
+    Returns:
+        str: The transaction hash.
+    """
+    def anchor_batch(self, merkle_root, count, from_timestamp, to_timestamp, from_address, private_key, retries=1):
+        return self.send_call("logAuthBatch", (merkle_root, count, from_timestamp, to_timestamp),
+                              from_address, private_key, retries)
+
+
+"""
+TransactionPipeline Class
+
+Keeps many logAuth transactions in flight for one account and tracks their receipts asynchronously.
+
+Functionality:
+    - submit() returns immediately with a Future; a small thread pool signs and sends the transaction
+      (nonces come from the interface's NonceAllocator, so concurrent sends never collide).
+    - At most max_in_flight transactions may be unconfirmed; submit() waits for a slot beyond that.
+    - A receipt thread checks outstanding transactions whenever a new block appears and resolves each Future
+      with {"tx_hash", "block_number", "status", "latency"}, or with TransactionReverted if the status is 0.
+    - An event whose send keeps failing with nonce errors is requeued (up to max_requeues times) instead of failed.
+    - flush() waits until everything submitted is confirmed or failed; stats() reports counts and latencies.
+
+Usage:
+    with TransactionPipeline(interface, from_address, private_key) as pipeline:
+        future = pipeline.submit(vehicle_hash, timestamp, True)
+
+Args:
+    interface (BlockchainInterface): Connected interface.
+    from_address (str): Sender address.
+    private_key (str): Sender private key.
+    max_in_flight (int): Maximum unconfirmed transactions (default DEFAULT_MAX_IN_FLIGHT).
+    send_workers (int): Threads signing and sending (default DEFAULT_SEND_WORKERS).
+    poll_interval (float): Seconds between receipt checks (default DEFAULT_POLL_INTERVAL).
+    retries (int): Resends per transaction after a nonce error (default DEFAULT_SEND_RETRIES).
+    max_requeues (int): Times an event is requeued after its resends are used up (default DEFAULT_MAX_REQUEUES).
+"""
+class TransactionPipeline:
+
+    def __init__(self, interface, from_address, private_key, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 send_workers=DEFAULT_SEND_WORKERS, poll_interval=DEFAULT_POLL_INTERVAL,
+                 retries=DEFAULT_SEND_RETRIES, max_requeues=DEFAULT_MAX_REQUEUES):
+        self.interface = interface
+        self.from_address = from_address
+        self.private_key = private_key
+        self.poll_interval = poll_interval
+        self.retries = retries
+        self.max_requeues = max_requeues
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=send_workers, thread_name_prefix="tx-send")
+        self._pending = {}              # tx_hash -> (Future, submitted_at)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0           # Submitted but not yet resolved
+        self._stop = threading.Event()
+        self.submitted = 0
+        self.confirmed = 0
+        self.failed = 0
+        self.reverted = 0
+        self.requeued = 0
+        self.receipt_errors = 0
+        self.max_in_flight_seen = 0
+        self.latencies = []
+        self._receipt_thread = threading.Thread(target=self._track_receipts, name="tx-receipts", daemon=True)
+        self._receipt_thread.start()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+    """
+    Function: submit
+
+    Queue a logAuth transaction.
+
+    Returns:
+        Future: Resolves to the receipt summary, or raises the send error.
+    """
+    def submit(self, vehicle_hash, timestamp, authenticated):
+        self._slots.acquire()
+        future = Future()
+        with self._lock:
+            self.submitted += 1
+            self._outstanding += 1
+            self.max_in_flight_seen = max(self.max_in_flight_seen, self._outstanding)
+        self._executor.submit(self._send, future, vehicle_hash, timestamp, authenticated)
+        return future
+
+
+    """
+    Function: _send
+
+    Send worker: sign and send one event, requeueing it if it still hits a nonce error after the retries.
+    """
+    def _send(self, future, vehicle_hash, timestamp, authenticated, requeues=0, submitted_at=None):
+        submitted_at = submitted_at or time.monotonic()
+        try:
+            tx_hash = self.interface.log_auth(vehicle_hash, timestamp, authenticated,
+                                              self.from_address, self.private_key, self.retries)
+        except Exception as e:
+            if is_nonce_error(e) and requeues < self.max_requeues:
+                try:
+                    self._executor.submit(self._send, future, vehicle_hash, timestamp, authenticated,
+                                          requeues + 1, submitted_at)
+                except RuntimeError:
+                    pass                    # Executor shut down (close() timed out): fail the event below
+                else:
+                    with self._lock:
+                        self.requeued += 1
+                    return
+            self._resolve(future, error=e)
+            return
+        with self._lock:
+            self._pending[tx_hash] = (future, submitted_at)
+
+
+    """
+    Function: _resolve
+
+    Settle an event's Future; a receipt with status 0 (reverted) counts as a failure.
+    """
+    def _resolve(self, future, result=None, error=None):
+        if error is None and not result["status"]:
+            error = TransactionReverted(result)
+        with self._lock:
+            if error is None:
+                self.confirmed += 1
+                self.latencies.append(result["latency"])
+            else:
+                self.failed += 1
+                if isinstance(error, TransactionReverted):
+                    self.reverted += 1
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._idle.notify_all()
+        self._slots.release()
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+
+    """
+    Function: _track_receipts
+
+    Receipt thread: when the block number changes, fetch receipts for every pending transaction.
+    An unexpected error in one pass is counted and the next pass retries, so the thread never dies.
+    """
+    def _track_receipts(self):
+        last_block = [None]
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._check_receipts(last_block)
+            except Exception:
+                with self._lock:
+                    self.receipt_errors += 1
+
+
+    """
+    Function: _check_receipts
+
+    One receipt-thread pass; last_block is a one-element list holding the block number seen by the previous pass.
+    """
+    def _check_receipts(self, last_block):
+        web3 = self.interface.web3
+        with self._lock:
+            if not self._pending:
+                return
+            pending = list(self._pending.items())
+        try:
+            block = web3.eth.block_number
+        except Exception:
+            return                          # Node unreachable; try again next interval
+        if block == last_block[0]:
+            return
+        last_block[0] = block
+        for tx_hash, (future, submitted_at) in pending:
+            try:
+                receipt = web3.eth.get_transaction_receipt(tx_hash)
+            except (TransactionNotFound, ValueError, OSError):
+                continue                    # Not mined yet, or a transient RPC failure
+            with self._lock:
+                self._pending.pop(tx_hash, None)
+            self._resolve(future, {
+                "tx_hash": tx_hash,
+                "block_number": receipt["blockNumber"],
+                "status": receipt["status"],
+                "latency": time.monotonic() - submitted_at,
+            })
+
+
+    """
+    Function: flush
+
+    Wait until every submitted transaction is confirmed or has failed.
+
+    Returns:
+        bool: True if the pipeline drained before the timeout.
+
+    Raises:
+        RuntimeError: If the receipt thread is no longer running while transactions are outstanding.
+    """
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._outstanding:
+                if not self._receipt_thread.is_alive():
+                    raise RuntimeError(f"Receipt thread stopped with {self._outstanding} transactions outstanding")
+                wait = self.poll_interval if deadline is None else min(self.poll_interval, deadline - time.monotonic())
+                if wait <= 0:
+                    return False
+                self._idle.wait(wait)
+            return True
+
+
+    """
+    Function: close
+
+    Flush, then stop the send and receipt threads.
+    """
+    def close(self, timeout=None):
+        self.flush(timeout)
+        self._stop.set()
+        self._executor.shutdown(wait=True)
+        self._receipt_thread.join()
+
+
+    """
+    Function: stats
+
+    Return submission counts (failed includes reverted), requeues, receipt-thread errors, nonce resyncs and
+    confirmation latency summary (seconds).
+    """
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+            return {
+                "submitted": self.submitted,
+                "confirmed": self.confirmed,
+                "failed": self.failed,
+                "reverted": self.reverted,
+                "requeued": self.requeued,
+                "receipt_errors": self.receipt_errors,
+                "in_flight": self._outstanding,
+                "max_in_flight": self.max_in_flight_seen,
+                "nonce_resyncs": self.interface.nonce_allocator(self.from_address).resyncs,
+                "mean_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+                "p95_latency": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            }
+
 
 if __name__ == "__main__":
-    # After deploying, update these:
-    provider_url = "http://127.0.0.1:8545"
-    contract_address = "0x..."  # Use the address from deployment output
-    with open("path/to/AuthLogger.json") as f:
-        abi = json.load(f)["abi"]
-    interface = BlockchainInterface(provider_url, contract_address, abi)
-    print("[BlockchainInterface] Instantiated successfully (no real call made).")
\ No newline at end of file
+    # Simple test against the local mock JSON-RPC node: pipeline 200 auth events, with another sender
+    # using the same key part-way through to force a nonce resync
+    from mock_rpc import MockRPCServer
+    abi = [{
+        "type": "function", "name": "logAuth", "stateMutability": "nonpayable", "outputs": [],
+        "inputs": [{"name": "vehicleHash", "type": "bytes32"}, {"name": "timestamp", "type": "uint256"},
+                   {"name": "authenticated", "type": "bool"}],
+    }]
+    account = Web3().eth.account.create()
+    with MockRPCServer(block_time=0.1) as server:
+        interface = BlockchainInterface(server.url, "0x" + "11" * 20, abi, gas_limit=60_000)
+        start = time.perf_counter()
+        with TransactionPipeline(interface, account.address, account.key, poll_interval=0.05) as pipeline:
+            futures = []
+            for i in range(200):
+                if i == 100:
+                    server.chain.bump_nonce()
+                futures.append(pipeline.submit(Web3.keccak(text=f"VEH{i:03d}"), 1234567890 + i, True))
+        print(f"[BlockchainInterface] {pipeline.stats()} in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,368 @@
+"""
+bt_replay.py
+
+Purpose:
+    Replays SUMO Bluetooth encounter traces (bt-output, e.g. out/bt_out.xml from circlebt.sumocfg) as a
+    time-ordered stream of authentication requests against a set of RSUs, giving realistic, bursty load instead
+    of fixed vehicle loops, and reports whether vehicles get authenticated while they are still in range.
+
+Methodology:
+    - bt-output records are read with the streaming reader in "XML Output Tools/sumo_output.py". Devices whose ID
+      starts with the RSU prefix (default "rsu", like vehicle "rsu1" in circlebt.rou.xml) are RSUs; every sighting
+      between an RSU and a vehicle becomes one encounter (RSU, vehicle, enters range, leaves range). Sightings
+      reported by both sides' receivers are merged.
+    - On entering range a vehicle generates its OTP and simulated ZKP for that trace time and sends one request to
+      the RSU. Trace times map to Unix time as base_time + t, and each RSU's clock follows the replay, so the OTP
+      acceptance window and replay cache behave as on the road.
+    - Each RSU serves its requests one at a time, first in first out.
+    - "fast" mode runs every verification back to back as fast as possible and puts each RSU on a virtual
+      timeline: a request starts when it has arrived and the RSU is free, and takes the measured verification
+      time (or a fixed service_time, to model slower RSU hardware). This measures the queueing the trace would
+      cause, and how fast the host itself can verify.
+    - "simulated" mode releases requests in wall-clock time following the trace (speed x faster than real time)
+      to one worker thread per RSU, and measures queueing delay as it actually happens.
+    - Throughput is reported twice: auths_per_sec is the modeled rate, requests over the trace-time span from the
+      first arrival to the last completion; host_auths_per_sec is requests over the wall time the replay took.
+    - An encounter counts as authenticated in range if the proof verified and the response completed (in trace
+      time) before the vehicle left range.
+
+Usage:
+    python bt_replay.py "../../SUMO/Sims WIP/Circle Track BlueTooth/out/bt_out.xml" --mode simulated --speed 10
+"""
+
+import argparse
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+
+from benchmark import summarize_latencies
+from otp import generate_otp_at
+from rsu import RSU
+from zkp import generate_zkp_proof
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "XML Output Tools"))
+from sumo_output import read_bt                                     # noqa: E402
+
+DEFAULT_RSU_PREFIX = "rsu"
+DEFAULT_BASE_TIME = 1_700_000_000   # Unix time of trace time 0
+DEFAULT_SPEED = 1.0                 # Trace seconds per wall second in simulated mode
+
+Encounter = namedtuple("Encounter", ["rsu", "vehicle", "enter", "leave"])
+
+
+"""
+Function: encounters_from_bt
+
+Turn bt-output sightings into RSU-vehicle encounters.
+
+Args:
+    sightings (iterable of BtSighting): Records from sumo_output.read_bt.
+    rsu_prefix (str): ID prefix identifying RSUs.
+
+Returns:
+    list of Encounter: Sorted by time of entering range. Sightings of the same pair starting at the same time
+                       (one from each side's receiver) are merged, keeping the longer stay in range.
+"""
+def encounters_from_bt(sightings, rsu_prefix=DEFAULT_RSU_PREFIX):
+    merged = {}
+    for sighting in sightings:
+        observer_is_rsu = sighting.observer.startswith(rsu_prefix)
+        observed_is_rsu = sighting.observed.startswith(rsu_prefix)
+        if observer_is_rsu == observed_is_rsu:
+            continue                                                # Vehicle-vehicle or RSU-RSU
+        rsu, vehicle = ((sighting.observer, sighting.observed) if observer_is_rsu
+                        else (sighting.observed, sighting.observer))
+        key = (rsu, vehicle, sighting.t_begin)
+        leave = sighting.t_end if sighting.t_end is not None else sighting.t_begin
+        if key not in merged or leave > merged[key].leave:
+            merged[key] = Encounter(rsu, vehicle, sighting.t_begin, leave)
+    return sorted(merged.values(), key=lambda encounter: (encounter.enter, encounter.rsu, encounter.vehicle))
+
+
+"""
+ReplayEngine Class
+
+Replays encounters as authentication requests against one RSU per RSU ID.
+
+Functionality:
+    - run(mode) replays the trace in "fast" or "simulated" mode and returns a report.
+
+Usage:
+    engine = ReplayEngine(encounters_from_bt(read_bt("bt_out.xml")))
+    report = engine.run("fast")
+
+Args:
+    encounters (list of Encounter): Encounters to replay.
+    vehicle_secrets (dict, optional): vehicle_id -> secret (default: a fresh secret per vehicle in the trace).
+    base_time (int): Unix time corresponding to trace time 0.
+    service_time (float, optional): Fixed seconds per verification in fast mode, or extra seconds per
+                                    verification in simulated mode (models slower RSU hardware).
+    rsu_kwargs (dict, optional): Extra keyword arguments for every RSU. Window precomputation is off by default:
+                                 an RSU sees a trickle of vehicles, so computing the expected proof on demand is
+                                 cheaper than keeping the whole fleet's window precomputed.
+"""
+class ReplayEngine:
+
+    def __init__(self, encounters, vehicle_secrets=None, base_time=DEFAULT_BASE_TIME, service_time=None,
+                 rsu_kwargs=None):
+        self.encounters = list(encounters)
+        if vehicle_secrets is None:
+            vehicle_secrets = {encounter.vehicle: secrets.token_hex(16) for encounter in self.encounters}
+        self.vehicle_secrets = vehicle_secrets
+        self.base_time = base_time
+        self.service_time = service_time
+        self.rsu_kwargs = dict({"precompute": False}, **(rsu_kwargs or {}))
+
+
+    """
+    Function: _request
+
+    Build the request a vehicle sends when it enters an RSU's range.
+
+    Returns:
+        tuple: (vehicle_id, zkp_proof, timestamp)
+    """
+    def _request(self, encounter):
+        timestamp = self.base_time + int(encounter.enter)
+        otp = generate_otp_at(self.vehicle_secrets[encounter.vehicle], timestamp)
+        return encounter.vehicle, generate_zkp_proof(otp, timestamp), timestamp
+
+
+    """
+    Function: _build_rsus
+
+    Create one RSU per RSU ID, each reading the replay clock.
+    """
+    def _build_rsus(self, clock):
+        return {rsu_id: RSU(self.vehicle_secrets, clock=clock, **self.rsu_kwargs)
+                for rsu_id in sorted({encounter.rsu for encounter in self.encounters})}
+
+
+    """
+    Function: run
+
+    Replay the trace.
+
+    Args:
+        mode (str): "fast" or "simulated".
+        speed (float): Trace seconds per wall second in simulated mode.
+
+    Returns:
+        dict: Report (see _report).
+
+    Raises:
+        ValueError: For an unknown mode.
+    """
+    def run(self, mode="fast", speed=DEFAULT_SPEED):
+        if mode == "fast":
+            outcomes, wall_seconds, max_depths = self._run_fast()
+        elif mode == "simulated":
+            outcomes, wall_seconds, max_depths = self._run_simulated(speed)
+        else:
+            raise ValueError(f"Unknown replay mode: {mode} (expected 'fast' or 'simulated')")
+        return self._report(mode, outcomes, wall_seconds, max_depths)
+
+
+    """
+    Function: _run_fast
+
+    Verify every request back to back, placing each RSU's work on a virtual timeline.
+
+    Steps:
+    1. Take requests in arrival order; a request starts at max(arrival, RSU free time)
+    2. Set the replay clock to the start time and run the real verification, timing it (window precomputation,
+       if enabled, is done first and not counted as service time)
+    3. The RSU is busy for the measured time (or service_time); record the queueing delay and completion time
+    """
+    def _run_fast(self):
+        now = [0.0]
+        rsus = self._build_rsus(lambda: self.base_time + now[0])
+        free_at = dict.fromkeys(rsus, 0.0)
+        in_system = {rsu_id: deque() for rsu_id in rsus}             # Completion times of queued/served requests
+        max_depths = dict.fromkeys(rsus, 0)
+        outcomes = []
+        clock = time.perf_counter
+        wall_start = clock()
+        for encounter in self.encounters:
+            request = self._request(encounter)
+            start = max(encounter.enter, free_at[encounter.rsu])
+            now[0] = start
+            rsu = rsus[encounter.rsu]
+            if rsu.precompute:
+                rsu.tick(self.base_time + int(start))                  # Window upkeep is background work
+            t0 = clock()
+            valid = rsu.verify_zkp(*request)
+            measured = clock() - t0
+            finish = start + (self.service_time if self.service_time is not None else measured)
+            free_at[encounter.rsu] = finish
+            pending = in_system[encounter.rsu]
+            while pending and pending[0] <= encounter.enter:
+                pending.popleft()
+            pending.append(finish)
+            max_depths[encounter.rsu] = max(max_depths[encounter.rsu], len(pending))
+            outcomes.append((encounter, valid, start - encounter.enter, finish - start, finish))
+        return outcomes, clock() - wall_start, max_depths
+
+
+    """
+    Function: _run_simulated
+
+    Release requests in wall-clock time following the trace and serve them with one worker thread per RSU.
+
+    Steps:
+    1. The main thread sleeps until each request's release time ((enter - first enter) / speed) and queues it
+    2. Each RSU worker takes requests in order, verifies them (plus service_time, if set) and records timings
+    3. Wall-clock delays are converted back to trace seconds by multiplying by speed
+    """
+    def _run_simulated(self, speed):
+        if not self.encounters:
+            return [], 0.0, {}
+        first = self.encounters[0].enter
+        clock = time.perf_counter
+        wall_start = clock()
+        rsus = self._build_rsus(lambda: self.base_time + first + (clock() - wall_start) * speed)
+        queues = {rsu_id: queue.Queue() for rsu_id in rsus}
+        max_depths = dict.fromkeys(rsus, 0)
+        outcomes = []
+        lock = threading.Lock()
+
+        def serve(rsu_id):
+            rsu, requests = rsus[rsu_id], queues[rsu_id]
+            while True:
+                item = requests.get()
+                if item is None:
+                    return
+                encounter, request, released = item
+                started = clock()
+                valid = rsu.verify_zkp(*request)
+                if self.service_time:
+                    time.sleep(self.service_time / speed)
+                finished = clock()
+                with lock:
+                    outcomes.append((encounter, valid, (started - released) * speed, (finished - started) * speed,
+                                     encounter.enter + (finished - released) * speed))
+
+        workers = [threading.Thread(target=serve, args=(rsu_id,), daemon=True) for rsu_id in rsus]
+        for worker in workers:
+            worker.start()
+        for encounter in self.encounters:
+            delay = wall_start + (encounter.enter - first) / speed - clock()
+            if delay > 0:
+                time.sleep(delay)
+            requests = queues[encounter.rsu]
+            requests.put((encounter, self._request(encounter), clock()))
+            max_depths[encounter.rsu] = max(max_depths[encounter.rsu], requests.qsize())
+        for requests in queues.values():
+            requests.put(None)
+        for worker in workers:
+            worker.join()
+        return outcomes, clock() - wall_start, max_depths
+
+
+    """
+    Function: _report
+
+    Summarize a replay.
+
+    Returns:
+        dict: mode, requests, authenticated, auths_per_sec (requests per trace second between the first arrival
+              and the last completion), span_seconds (that trace-time span), host_auths_per_sec (requests per
+              wall second of the replay), wall_seconds, queueing_delay and service_time summaries (trace time,
+              ms), fraction of encounters and of vehicles authenticated before leaving range, and per-RSU
+              requests / max queue depth.
+    """
+    def _report(self, mode, outcomes, wall_seconds, max_depths):
+        in_range = [valid and finish <= encounter.leave for encounter, valid, _, _, finish in outcomes]
+        vehicles = {encounter.vehicle for encounter, *_ in outcomes}
+        vehicles_in_range = {outcome[0].vehicle for outcome, ok in zip(outcomes, in_range) if ok}
+        per_rsu = {rsu_id: {"requests": 0, "max_queue_depth": depth} for rsu_id, depth in max_depths.items()}
+        for encounter, *_ in outcomes:
+            per_rsu[encounter.rsu]["requests"] += 1
+        span = (max(outcome[4] for outcome in outcomes) - min(outcome[0].enter for outcome in outcomes)
+                if outcomes else 0.0)
+        return {
+            "mode": mode,
+            "requests": len(outcomes),
+            "authenticated": sum(valid for _, valid, _, _, _ in outcomes),
+            "auths_per_sec": len(outcomes) / span if span > 0 else 0.0,
+            "span_seconds": span,
+            "host_auths_per_sec": len(outcomes) / wall_seconds if wall_seconds > 0 else 0.0,
+            "wall_seconds": wall_seconds,
+            "queueing_delay": summarize_latencies([outcome[2] for outcome in outcomes]),
+            "service_time": summarize_latencies([outcome[3] for outcome in outcomes]),
+            "encounters_authenticated_in_range": sum(in_range) / len(outcomes) if outcomes else 0.0,
+            "vehicles_authenticated_in_range": len(vehicles_in_range) / len(vehicles) if vehicles else 0.0,
+            "rsus": per_rsu,
+        }
+
+
+"""
+Function: print_report
+
+Print a replay report in readable form.
+"""
+def print_report(report):
+    print(f"[BT Replay] {report['mode']}: {report['requests']} requests, {report['authenticated']} authenticated, "
+          f"{report['auths_per_sec']:,.2f} auths/sec over {report['span_seconds']:.1f}s of trace time")
+    print(f"[BT Replay] Host: {report['host_auths_per_sec']:,.0f} requests/sec over "
+          f"{report['wall_seconds']:.2f}s wall")
+    delay = report["queueing_delay"]
+    print(f"[BT Replay] Queueing delay: mean {delay['mean_ms']:.2f} ms, p95 {delay['p95_ms']:.2f} ms, "
+          f"p99 {delay['p99_ms']:.2f} ms")
+    print(f"[BT Replay] Authenticated before leaving range: "
+          f"{report['encounters_authenticated_in_range']:.1%} of encounters, "
+          f"{report['vehicles_authenticated_in_range']:.1%} of vehicles")
+    for rsu_id, stats in report["rsus"].items():
+        print(f"[BT Replay]   {rsu_id}: {stats['requests']} requests, max queue depth {stats['max_queue_depth']}")
+
+
+"""
+Function: main
+
+Command-line entry point.
+"""
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay SUMO bt-output encounters as RSU authentication load.")
+    parser.add_argument("bt_output", help="bt-output file (e.g. out/bt_out.xml)")
+    parser.add_argument("--mode", choices=("fast", "simulated"), default="fast")
+    parser.add_argument("--speed", type=float, default=DEFAULT_SPEED, help="Trace seconds per wall second (simulated)")
+    parser.add_argument("--rsu-prefix", default=DEFAULT_RSU_PREFIX, help="ID prefix of RSU devices (default rsu)")
+    parser.add_argument("--service-time", type=float, help="Seconds per verification to model slower RSU hardware")
+    args = parser.parse_args(argv)
+
+    encounters = encounters_from_bt(read_bt(args.bt_output), args.rsu_prefix)
+    if not encounters:
+        print(f"[BT Replay] No encounters with devices prefixed '{args.rsu_prefix}' in {args.bt_output}")
+        return 1
+    print_report(ReplayEngine(encounters, service_time=args.service_time).run(args.mode, args.speed))
+    return 0
+
+
+if __name__ == "__main__":
+    # Simple test: a synthetic bt trace with two RSUs and 2,000 vehicles arriving in platoons every 20 s,
+    # replayed as fast as possible, with slow (50 ms) RSU hardware, and paced at 50x real time
+    import tempfile
+
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bt_out.xml")
+        with open(path, "w") as f:
+            f.write("<bt-output>\n")
+            for rsu_id in ("rsu1", "rsu2"):
+                f.write(f'    <bt id="{rsu_id}">\n')
+                for vehicle in range(1000):
+                    enter = (vehicle // 100) * 20 + (vehicle % 100) * 0.02 + (3 if rsu_id == "rsu2" else 0)
+                    f.write(f'        <seen id="veh{vehicle}" tBeg="{enter:.2f}" tEnd="{enter + 2.5:.2f}" '
+                            f'observerPosBeg="0.00,0.00" observedPosBeg="0.00,0.00"/>\n')
+                f.write("    </bt>\n")
+            f.write("</bt-output>\n")
+        encounters = encounters_from_bt(read_bt(path))
+        print(f"[BT Replay] {len(encounters)} encounters from {path}")
+        print_report(ReplayEngine(encounters).run("fast"))
+        print_report(ReplayEngine(encounters, service_time=0.05).run("fast"))
+        print_report(ReplayEngine(encounters).run("simulated", speed=50))
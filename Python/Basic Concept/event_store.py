@@ -0,0 +1,354 @@
+"""
+event_store.py
+
+Purpose:
+    Provides AuthEventStore, an indexed SQLite store of past authentication events, so incident questions
+    ("every event for this vehicle hash", "failures between these times", "how many auths per RSU") are answered
+    with index lookups instead of grepping console output or rescanning chain logs.
+
+Methodology:
+    - One `events` table holds every event with its source, RSU, and (for chain events) block number,
+      transaction hash and log index. Indexes cover vehicle_hash + timestamp, rsu_id + timestamp (covering the
+      per-RSU counts), and a partial index on the timestamps of failed authentications only.
+    - A chain event is identified by (tx_hash, log_index), which is unique; rows are inserted with INSERT OR IGNORE,
+      so re-reading an overlapping block range (explicit from_block, a reorg re-scan) never duplicates events.
+      Transaction hashes are stored 0x-prefixed, as nodes and explorers print them.
+    - Ingestion is incremental and resumable: a `cursors` table remembers how far each source has been read
+      (byte offset for an AuthEventLog JSON-lines ledger, event index for a LedgerSimulator, block number for a
+      real chain), so re-running an ingest only picks up new events.
+    - A ledger line that is not a valid event (corrupt bytes, or a line truncated by a writer crash and then
+      appended to) is skipped and counted in malformed_lines, so one bad line never blocks later ingests.
+    - Chain logs are read in paginated block ranges (page_size blocks per eth_getLogs call) to stay under node
+      response limits. Rows are inserted with executemany inside one transaction per page / file chunk.
+    - The database runs in WAL mode so queries can run while another process ingests.
+
+Usage:
+    store = AuthEventStore("auth_events.db")
+    store.ingest_ledger("auth_events.jsonl", rsu_id="rsu1")
+    store.events_for_vehicle(vehicle_hash)
+"""
+
+import json
+import sqlite3
+
+DEFAULT_CHUNK_SIZE = 10_000         # Rows inserted per transaction when ingesting a ledger file
+DEFAULT_PAGE_SIZE = 2_000           # Blocks per eth_getLogs call when ingesting chain logs
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    vehicle_hash TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    authenticated INTEGER NOT NULL,
+    rsu_id TEXT,
+    source TEXT NOT NULL,
+    block_number INTEGER,
+    tx_hash TEXT,
+    log_index INTEGER
+);
+CREATE INDEX IF NOT EXISTS events_vehicle ON events (vehicle_hash, timestamp);
+CREATE INDEX IF NOT EXISTS events_rsu ON events (rsu_id, timestamp, authenticated);
+CREATE INDEX IF NOT EXISTS events_failures ON events (timestamp) WHERE authenticated = 0;
+CREATE TABLE IF NOT EXISTS cursors (
+    source TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+"""
+
+# Created after the log_index migration in AuthEventStore.__init__, so stores from before the column existed open
+CHAIN_LOG_INDEX = ("CREATE UNIQUE INDEX IF NOT EXISTS events_chain_log ON events (tx_hash, log_index) "
+                   "WHERE tx_hash IS NOT NULL")
+
+_INSERT = ("INSERT OR IGNORE INTO events "
+           "(vehicle_hash, timestamp, authenticated, rsu_id, source, block_number, tx_hash, log_index) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+_COLUMNS = ("vehicle_hash", "timestamp", "authenticated", "rsu_id", "source", "block_number", "tx_hash", "log_index")
+
+
+"""
+AuthEventStore Class
+
+Indexed, incrementally ingested store of authentication events.
+
+Functionality:
+    - ingest_ledger(path) reads new lines of an AuthEventLog JSON-lines ledger.
+    - ingest_simulator(ledger) reads new AuthEvents from a LedgerSimulator.
+    - ingest_chain(interface) reads new AuthEvent logs from the AuthLogger contract in block pages.
+    - events_for_vehicle, failures and rsu_counts answer the common incident queries.
+    - malformed_lines counts ledger lines skipped because they could not be parsed as events.
+
+Args:
+    path (str): SQLite database file (":memory:" for a throwaway store).
+"""
+class AuthEventStore:
+
+    def __init__(self, path):
+        self.path = path
+        self.malformed_lines = 0
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        columns = {row["name"] for row in self.db.execute("PRAGMA table_info(events)")}
+        if "log_index" not in columns:
+            self.db.execute("ALTER TABLE events ADD COLUMN log_index INTEGER")
+        self.db.execute(CHAIN_LOG_INDEX)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+    """
+    Function: close
+
+    Close the database connection.
+    """
+    def close(self):
+        self.db.close()
+
+
+    def _cursor(self, source):
+        row = self.db.execute("SELECT position FROM cursors WHERE source = ?", (source,)).fetchone()
+        return row["position"] if row else None
+
+
+    """
+    Function: _commit
+
+    Insert rows and advance a source's cursor in one transaction.
+
+    Returns:
+        int: Rows actually inserted (rows already stored are skipped).
+    """
+    def _commit(self, source, position, rows):
+        with self.db:
+            before = self.db.total_changes
+            self.db.executemany(_INSERT, rows)
+            inserted = self.db.total_changes - before
+            self.db.execute("INSERT OR REPLACE INTO cursors (source, position) VALUES (?, ?)", (source, position))
+        return inserted
+
+
+    """
+    Function: ingest_ledger
+
+    Ingest the events appended to a JSON-lines ledger since the last call.
+
+    Args:
+        path (str): Ledger written by AuthEventLog.
+        rsu_id (str, optional): RSU that wrote the ledger, used for events without an "rsu_id" field.
+        chunk_size (int): Rows per transaction.
+
+    Returns:
+        int: Number of events ingested (malformed lines are skipped and added to malformed_lines).
+
+    Steps:
+    1. Seek to the byte offset recorded for this file (0 the first time)
+    2. Read complete lines only, so a line the writer is still appending is picked up next time
+    3. Skip and count lines that are not valid JSON events; the cursor still moves past them
+    4. Insert in chunks, advancing the cursor in the same transaction as the rows
+    """
+    def ingest_ledger(self, path, rsu_id=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        source = f"ledger:{path}"
+        offset = self._cursor(source) or 0
+        count = 0
+        rows = []
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                    row = (event["vehicle_hash"], event["timestamp"], int(event["authenticated"]),
+                           event.get("rsu_id", rsu_id), source, None, None, None)
+                except (ValueError, KeyError, TypeError):
+                    self.malformed_lines += 1
+                    continue
+                rows.append(row)
+                if len(rows) >= chunk_size:
+                    count += self._commit(source, offset, rows)
+                    rows = []
+        return count + self._commit(source, offset, rows)
+
+
+    """
+    Function: ingest_simulator
+
+    Ingest the AuthEvents a LedgerSimulator has included in blocks since the last call. The sender address of
+    each transaction is used as the RSU ID.
+
+    Args:
+        ledger (LedgerSimulator): Simulated chain.
+        name (str): Source name distinguishing several simulators in one store.
+
+    Returns:
+        int: Number of events ingested.
+    """
+    def ingest_simulator(self, ledger, name="simulator"):
+        source = f"sim:{name}"
+        start = self._cursor(source) or 0
+        events = ledger.events[start:]
+        rows = [(args[0], args[1], int(args[2]), sender, source, block_number, None, None)
+                for event_name, args, block_number, sender in events if event_name == "AuthEvent"]
+        return self._commit(source, start + len(events), rows)
+
+
+    """
+    Function: ingest_chain
+
+    Ingest AuthEvent logs emitted by the AuthLogger contract, one page of blocks at a time.
+
+    Args:
+        interface (BlockchainInterface): Connected interface (its web3 instance and contract are used).
+        from_block (int, optional): First block to read (default: the block after the last ingested one, or 0).
+        to_block (int, optional): Last block to read (default: the current block number).
+        page_size (int): Blocks per eth_getLogs call.
+        resolve_senders (bool): Look up each transaction's sender to fill rsu_id (one extra RPC per transaction).
+
+    Returns:
+        int: Number of events ingested (logs already stored are skipped).
+    """
+    def ingest_chain(self, interface, from_block=None, to_block=None, page_size=DEFAULT_PAGE_SIZE,
+                     resolve_senders=False):
+        web3 = interface.web3
+        event = interface.contract.events.AuthEvent()
+        source = f"chain:{interface.contract.address}"
+        if from_block is None:
+            last = self._cursor(source)
+            from_block = 0 if last is None else last + 1
+        if to_block is None:
+            to_block = web3.eth.block_number
+        topic = web3.to_hex(web3.keccak(text="AuthEvent(bytes32,uint256,bool)"))
+        senders = {}
+        count = 0
+        for start in range(from_block, to_block + 1, page_size):
+            end = min(start + page_size - 1, to_block)
+            logs = web3.eth.get_logs({"address": interface.contract.address, "fromBlock": start, "toBlock": end,
+                                      "topics": [topic]})
+            rows = []
+            for log in logs:
+                args = event.process_log(log)["args"]
+                tx_hash = web3.to_hex(log["transactionHash"])
+                sender = None
+                if resolve_senders:
+                    if tx_hash not in senders:
+                        senders[tx_hash] = web3.eth.get_transaction(log["transactionHash"])["from"]
+                    sender = senders[tx_hash]
+                rows.append((bytes(args["vehicleHash"]).hex(), args["timestamp"], int(args["authenticated"]), sender,
+                             source, log["blockNumber"], tx_hash, log["logIndex"]))
+            count += self._commit(source, end, rows)
+        return count
+
+
+    """
+    Function: events_for_vehicle
+
+    All events for one vehicle hash (or a list of them, e.g. one pseudonym per epoch), oldest first.
+
+    Returns:
+        list of dict: Event rows.
+    """
+    def events_for_vehicle(self, vehicle_hash):
+        hashes = [vehicle_hash] if isinstance(vehicle_hash, str) else list(vehicle_hash)
+        placeholders = ",".join("?" * len(hashes))
+        rows = self.db.execute(f"SELECT {', '.join(_COLUMNS)} FROM events WHERE vehicle_hash IN ({placeholders}) "
+                               "ORDER BY timestamp", hashes)
+        return [dict(row) for row in rows]
+
+
+    """
+    Function: failures
+
+    Failed authentications with start <= timestamp < end, oldest first.
+
+    Args:
+        start (int): Range start (Unix time, inclusive).
+        end (int): Range end (Unix time, exclusive).
+        limit (int, optional): Maximum rows returned.
+
+    Returns:
+        list of dict: Event rows.
+    """
+    def failures(self, start, end, limit=None):
+        query = (f"SELECT {', '.join(_COLUMNS)} FROM events INDEXED BY events_failures "
+                 "WHERE authenticated = 0 AND timestamp >= ? AND timestamp < ? ORDER BY timestamp")
+        params = [start, end]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.db.execute(query, params)]
+
+
+    """
+    Function: rsu_counts
+
+    Event and failure counts per RSU, optionally restricted to start <= timestamp < end.
+
+    Returns:
+        dict: rsu_id -> {"total": int, "failed": int}.
+    """
+    def rsu_counts(self, start=None, end=None):
+        query = "SELECT rsu_id, COUNT(*) AS total, SUM(authenticated = 0) AS failed FROM events"
+        params = []
+        if start is not None and end is not None:
+            query += " WHERE timestamp >= ? AND timestamp < ?"
+            params = [start, end]
+        query += " GROUP BY rsu_id"
+        return {row["rsu_id"]: {"total": row["total"], "failed": row["failed"]}
+                for row in self.db.execute(query, params)}
+
+
+    """
+    Function: __len__
+
+    Number of stored events.
+    """
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+if __name__ == "__main__":
+    # Simple test: ingest a 200,000-event ledger and a simulated chain, then time the incident queries
+    import hashlib
+    import os
+    import tempfile
+    import time
+    from ledger_sim import LedgerSimulator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger_path = os.path.join(tmp, "auth_events.jsonl")
+        base = 1_700_000_000
+        with open(ledger_path, "w") as f:
+            for i in range(200_000):
+                event = {"vehicle_hash": hashlib.sha256(b"VEH%d" % (i % 5000)).hexdigest(),
+                         "timestamp": base + i // 10, "authenticated": i % 97 != 0, "rsu_id": f"rsu{i % 8}"}
+                f.write(json.dumps(event) + "\n")
+        ledger = LedgerSimulator(block_interval=2.0)
+        for i in range(2000):
+            ledger.log_auth(hashlib.sha256(b"VEH%d" % i).hexdigest(), base + i, i % 50 != 0, from_address="0xRSU9")
+        ledger.drain()
+
+        with AuthEventStore(os.path.join(tmp, "events.db")) as store:
+            start = time.perf_counter()
+            ingested = store.ingest_ledger(ledger_path) + store.ingest_simulator(ledger)
+            print(f"[Event Store] Ingested {ingested} events in {time.perf_counter() - start:.2f}s")
+            print(f"[Event Store] Re-ingest picks up {store.ingest_ledger(ledger_path) + store.ingest_simulator(ledger)} new events")
+
+            vehicle_hash = hashlib.sha256(b"VEH42").hexdigest()
+            for label, query in (("events for vehicle", lambda: store.events_for_vehicle(vehicle_hash)),
+                                 ("failures in 1h", lambda: store.failures(base, base + 3600)),
+                                 ("per-RSU counts", lambda: store.rsu_counts())):
+                start = time.perf_counter()
+                result = query()
+                print(f"[Event Store] {label}: {len(result)} rows in {(time.perf_counter() - start) * 1000:.2f} ms")
+            print(f"[Event Store] Counts: {store.rsu_counts()['0xRSU9']} from the simulated chain")
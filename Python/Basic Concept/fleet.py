@@ -0,0 +1,269 @@
+"""
+fleet.py
+
+Purpose:
+    Defines the Fleet class, an array-backed container for simulating very large numbers of vehicles (10^5 - 10^6)
+    without one Python Vehicle object per vehicle.
+
+Methodology:
+    - Vehicle IDs are stored in one contiguous bytes buffer with an offsets array; secrets are stored as raw 16-byte
+      values in one contiguous bytes buffer.
+    - OTPs and simulated ZKPs are produced in batches; the OTP for a vehicle is identical to Vehicle.generate_otp
+      (SHA-256 of the hex secret followed by the timestamp), so an RSU built from secrets_dict() verifies them.
+    - Large batches are sharded across worker processes.
+"""
+
+import hashlib
+import numbers
+import os
+import secrets
+from array import array
+from binascii import hexlify
+from concurrent.futures import ProcessPoolExecutor
+
+from vehicle import Vehicle
+
+SECRET_SIZE = 16                    # Bytes per vehicle secret (same entropy as secrets.token_hex(16))
+PARALLEL_THRESHOLD = 50_000         # Batches at least this large are sharded across worker processes
+
+
+"""
+Function: _otp_shard
+
+Compute OTPs for a contiguous run of secrets (runs in a worker process for large batches).
+
+Args:
+    secret_bytes (bytes): Concatenated raw secrets (SECRET_SIZE bytes each).
+    timestamps (list of int): One timestamp per secret.
+
+Returns:
+    list of str: Hex OTPs.
+"""
+def _otp_shard(secret_bytes, timestamps):
+    sha256 = hashlib.sha256
+    hex_secrets = hexlify(secret_bytes)
+    width = 2 * SECRET_SIZE
+    return [
+        sha256(hex_secrets[i * width:(i + 1) * width] + b"%d" % timestamp).hexdigest()
+        for i, timestamp in enumerate(timestamps)
+    ]
+
+
+"""
+Function: _zkp_shard
+
+Compute simulated ZKPs (SHA-256 of OTP followed by timestamp) for a run of OTPs.
+"""
+def _zkp_shard(otps, timestamps):
+    sha256 = hashlib.sha256
+    return [sha256(b"%s%d" % (otp.encode(), timestamp)).hexdigest() for otp, timestamp in zip(otps, timestamps)]
+
+
+"""
+Function: _run_sharded
+
+Run a shard function over aligned sequences, in worker processes when the batch is large.
+
+Args:
+    shard_fn (callable): Function taking (first_sequence_slice, timestamps_slice).
+    first (sequence): Per-vehicle inputs (bytes for secrets, list for OTPs).
+    item_size (int): Elements of `first` per vehicle (SECRET_SIZE for secret bytes, 1 for lists).
+    timestamps (list of int): One timestamp per vehicle.
+    workers (int, optional): Worker processes (default os.cpu_count()).
+
+Returns:
+    list: Concatenated shard results, in vehicle order.
+"""
+def _run_sharded(shard_fn, first, item_size, timestamps, workers=None):
+    count = len(timestamps)
+    workers = workers or os.cpu_count() or 1
+    if count < PARALLEL_THRESHOLD or workers == 1:
+        return shard_fn(first, timestamps)
+    shard_size = -(-count // workers)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(shard_fn, first[start * item_size:(start + shard_size) * item_size],
+                            timestamps[start:start + shard_size])
+            for start in range(0, count, shard_size)
+        ]
+        for future in futures:
+            results.extend(future.result())
+    return results
+
+
+"""
+Fleet Class
+
+Array-backed collection of simulated vehicles.
+
+Functionality:
+    - Stores vehicle IDs and raw secrets in contiguous buffers (no per-vehicle Python objects).
+    - generate_otp_batch / create_zkp_batch mirror Vehicle.generate_otp / Vehicle.create_zkp for the whole fleet.
+    - secrets_dict() builds the vehicle_id -> hex secret mapping an RSU is initialized with.
+
+Usage:
+    fleet = Fleet.random(100_000)
+    otps = fleet.generate_otp_batch(timestamp)
+    proofs = fleet.create_zkp_batch(otps, timestamp)
+
+Args:
+    vehicle_ids (list of str): Vehicle IDs.
+    secret_bytes (bytes): Concatenated raw secrets, SECRET_SIZE bytes per vehicle, in vehicle_ids order.
+"""
+class Fleet:
+
+    def __init__(self, vehicle_ids, secret_bytes):
+        encoded = [vehicle_id.encode() for vehicle_id in vehicle_ids]
+        if len(secret_bytes) != SECRET_SIZE * len(encoded):
+            raise ValueError(f"Expected {SECRET_SIZE * len(encoded)} secret bytes, got {len(secret_bytes)}")
+        self._id_buffer = b"".join(encoded)                     # All IDs back to back
+        self._id_offsets = array("Q", [0])                      # ID i is _id_buffer[offsets[i]:offsets[i + 1]]
+        for vehicle_id in encoded:
+            self._id_offsets.append(self._id_offsets[-1] + len(vehicle_id))
+        self._secrets = bytes(secret_bytes)                     # All secrets back to back
+
+
+    """
+    Function: random
+
+    Create a fleet of `size` vehicles with sequential IDs and random secrets.
+
+    Args:
+        size (int): Number of vehicles.
+        id_prefix (str): Prefix for generated IDs (default "VEH", giving VEH001, VEH002, ...).
+    """
+    @classmethod
+    def random(cls, size, id_prefix="VEH"):
+        width = max(3, len(str(size)))
+        vehicle_ids = [f"{id_prefix}{i + 1:0{width}d}" for i in range(size)]
+        return cls(vehicle_ids, secrets.token_bytes(SECRET_SIZE * size))
+
+
+    def __len__(self):
+        return len(self._id_offsets) - 1
+
+
+    """
+    Function: vehicle_id
+
+    Return the ID of vehicle `index`.
+    """
+    def vehicle_id(self, index):
+        return self._id_buffer[self._id_offsets[index]:self._id_offsets[index + 1]].decode()
+
+
+    """
+    Function: vehicle_ids
+
+    Return all vehicle IDs as a list.
+    """
+    def vehicle_ids(self):
+        return [self.vehicle_id(i) for i in range(len(self))]
+
+
+    """
+    Function: secret_hex
+
+    Return the secret of vehicle `index` as the hex string a Vehicle/RSU uses.
+    """
+    def secret_hex(self, index):
+        return self._secrets[index * SECRET_SIZE:(index + 1) * SECRET_SIZE].hex()
+
+
+    """
+    Function: secrets_dict
+
+    Build the vehicle_id -> hex secret mapping used to initialize an RSU.
+    """
+    def secrets_dict(self):
+        return {self.vehicle_id(i): self.secret_hex(i) for i in range(len(self))}
+
+
+    """
+    Function: vehicle
+
+    Materialize vehicle `index` as a Vehicle object (for code paths that need one).
+    """
+    def vehicle(self, index):
+        return Vehicle(self.vehicle_id(index), self.secret_hex(index))
+
+
+    """
+    Function: _timestamp_list
+
+    Expand a single timestamp (any integral type, e.g. a numpy integer) to one per vehicle, or validate a
+    per-vehicle sequence.
+    """
+    def _timestamp_list(self, timestamps):
+        if isinstance(timestamps, numbers.Integral):
+            return [int(timestamps)] * len(self)
+        timestamps = list(timestamps)
+        if len(timestamps) != len(self):
+            raise ValueError(f"Expected {len(self)} timestamps, got {len(timestamps)}")
+        return timestamps
+
+
+    """
+    Function: generate_otp_batch
+
+    Generate an OTP for every vehicle in the fleet.
+
+    Args:
+        timestamps (int or sequence of int): One timestamp for the whole fleet, or one per vehicle.
+        workers (int, optional): Worker processes for large fleets (default os.cpu_count()).
+
+    Returns:
+        list of str: OTPs in vehicle order (same values Vehicle.generate_otp would produce).
+    """
+    def generate_otp_batch(self, timestamps, workers=None):
+        return _run_sharded(_otp_shard, self._secrets, SECRET_SIZE, self._timestamp_list(timestamps), workers)
+
+
+    """
+    Function: create_zkp_batch
+
+    Create a simulated ZKP for every vehicle's OTP.
+
+    Args:
+        otps (list of str): OTPs from generate_otp_batch.
+        timestamps (int or sequence of int): The timestamps the OTPs were generated for.
+        workers (int, optional): Worker processes for large fleets (default os.cpu_count()).
+
+    Returns:
+        list of str: Simulated proofs in vehicle order (same values Vehicle.create_zkp would produce).
+    """
+    def create_zkp_batch(self, otps, timestamps, workers=None):
+        return _run_sharded(_zkp_shard, list(otps), 1, self._timestamp_list(timestamps), workers)
+
+
+    """
+    Function: auth_requests
+
+    Build the (vehicle_id, zkp_proof, timestamp) tuples for RSU.verify_batch.
+
+    Args:
+        timestamps (int or sequence of int): One timestamp for the whole fleet, or one per vehicle.
+        workers (int, optional): Worker processes for large fleets.
+
+    Returns:
+        list of tuple: One authentication request per vehicle.
+    """
+    def auth_requests(self, timestamps, workers=None):
+        timestamps = self._timestamp_list(timestamps)
+        proofs = self.create_zkp_batch(self.generate_otp_batch(timestamps, workers), timestamps, workers)
+        return list(zip(self.vehicle_ids(), proofs, timestamps))
+
+
+if __name__ == "__main__":
+    # Simple test: a batch-generated fleet verifies against an RSU and matches the per-Vehicle path
+    import time
+    from rsu import RSU
+    fleet = Fleet.random(1000)
+    timestamp = int(time.time())
+    requests = fleet.auth_requests(timestamp)
+    rsu = RSU(fleet.secrets_dict(), precompute=False)
+    print(f"[Fleet] {len(fleet)} vehicles, all verified: {all(rsu.verify_batch(requests))}")
+    vehicle = fleet.vehicle(0)
+    otp = fleet.generate_otp_batch(timestamp)[0]
+    print(f"[Fleet] Matches Vehicle path: {vehicle.create_zkp(otp, timestamp) == requests[0][1]}")
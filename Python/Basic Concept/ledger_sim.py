@@ -0,0 +1,300 @@
+"""
+ledger_sim.py
+
+Purpose:
+    An in-process stand-in for the AuthLogger ledger with the same log_auth / anchor_batch interface as
+    BlockchainInterface, so the ledger path can be load-tested offline with a configurable block-time model.
+
+Methodology:
+    - Transactions enter a bounded mempool in arrival order; a full mempool rejects new transactions.
+    - Blocks are produced every block_interval seconds (fixed, or exponentially distributed for PoW-like chains);
+      each block takes transactions first-in first-out until the block gas limit is reached.
+    - A transaction counts as confirmed once `confirmations` blocks (its own included) have been produced.
+    - Time is virtual by default: advance()/drain() move the clock and produce the blocks that fall due, so hours
+      of chain time simulate in milliseconds. Passing clock=time.monotonic runs against wall-clock time instead.
+    - stats() reports throughput, mempool pressure, block utilization and the confirmation-time distribution.
+"""
+
+import hashlib
+import random
+from collections import deque
+
+DEFAULT_BLOCK_INTERVAL = 12.0           # Seconds between blocks (Ethereum mainnet slot time)
+DEFAULT_BLOCK_GAS_LIMIT = 30_000_000
+DEFAULT_MEMPOOL_CAPACITY = 10_000
+DEFAULT_CONFIRMATIONS = 1
+GAS_LOG_AUTH = 26_000                   # Approximate gas of one logAuth call (21k base + event)
+GAS_LOG_AUTH_BATCH = 29_000             # Approximate gas of one logAuthBatch call
+
+
+"""
+MempoolFullError
+
+Raised when a transaction arrives while the mempool is at capacity.
+"""
+class MempoolFullError(Exception):
+    pass
+
+
+"""
+LedgerSimulator Class
+
+Simulated chain with a mempool, block production and confirmation tracking.
+
+Functionality:
+    - log_auth(...) / anchor_batch(...) accept the same arguments as BlockchainInterface and return a tx hash.
+    - get_transaction_receipt(tx_hash) returns the receipt once the transaction is in a block, else None.
+    - advance(seconds) / drain() move virtual time forward; stats() summarizes the run.
+
+Usage:
+    ledger = LedgerSimulator(block_interval=2.0, block_gas_limit=1_000_000)
+    tx_hash = ledger.log_auth(vehicle_hash, timestamp, True, from_address, private_key)
+    ledger.drain()
+    print(ledger.stats())
+
+Args:
+    block_interval (float): Mean seconds between blocks.
+    block_gas_limit (int): Gas available per block.
+    mempool_capacity (int): Maximum pending transactions.
+    confirmations (int): Blocks required (including the including block) before a transaction is confirmed.
+    interval_distribution (str): "fixed" or "exponential" block intervals.
+    clock (callable, optional): Wall-clock time source (e.g. time.monotonic); default is virtual time.
+    seed (int, optional): Seed for exponential block intervals.
+"""
+class LedgerSimulator:
+
+    def __init__(self, block_interval=DEFAULT_BLOCK_INTERVAL, block_gas_limit=DEFAULT_BLOCK_GAS_LIMIT,
+                 mempool_capacity=DEFAULT_MEMPOOL_CAPACITY, confirmations=DEFAULT_CONFIRMATIONS,
+                 interval_distribution="fixed", clock=None, seed=None):
+        if interval_distribution not in ("fixed", "exponential"):
+            raise ValueError(f"Unknown interval distribution: {interval_distribution}")
+        self.block_interval = block_interval
+        self.block_gas_limit = block_gas_limit
+        self.mempool_capacity = mempool_capacity
+        self.confirmations = confirmations
+        self.interval_distribution = interval_distribution
+        self._clock = clock
+        self._start = clock() if clock else 0.0
+        self._virtual_now = 0.0
+        self._random = random.Random(seed)
+        self._mempool = deque()                 # (tx_hash, gas, submitted_at)
+        self._receipts = {}                     # tx_hash -> receipt dict
+        self._awaiting_confirmation = deque()   # (tx_hash, block_number) included but not yet confirmed
+        self._next_block_time = self._next_interval()
+        self.block_number = 0
+        self.events = []                        # Emitted (event name, args, block number, sender) in block order
+        self.submitted = 0
+        self.rejected = 0
+        self.confirmation_times = []            # Seconds from submission to confirmation
+        self.block_gas_used = []
+        self.max_mempool_depth = 0
+        self._tx_counter = 0
+
+
+    def _next_interval(self):
+        if self.interval_distribution == "exponential":
+            return self._random.expovariate(1.0 / self.block_interval)
+        return self.block_interval
+
+
+    """
+    Function: now
+
+    Current simulated time in seconds since the simulator started.
+    """
+    @property
+    def now(self):
+        return self._clock() - self._start if self._clock else self._virtual_now
+
+
+    """
+    Function: _produce_due_blocks
+
+    Produce every block whose time has come.
+    """
+    def _produce_due_blocks(self):
+        now = self.now
+        while self._next_block_time <= now:
+            self._produce_block(self._next_block_time)
+            self._next_block_time += self._next_interval()
+
+
+    """
+    Function: _produce_block
+
+    Seal one block at `block_time`: include mempool transactions FIFO up to the gas limit, then confirm
+    transactions that now have enough blocks on top of them.
+    """
+    def _produce_block(self, block_time):
+        self.block_number += 1
+        gas_used = 0
+        while self._mempool and gas_used + self._mempool[0][1] <= self.block_gas_limit:
+            tx_hash, gas, submitted_at = self._mempool.popleft()
+            gas_used += gas
+            receipt = self._receipts[tx_hash]
+            receipt.update(blockNumber=self.block_number, included_at=block_time, status=1)
+            self.events.append(receipt["event"] + (self.block_number, receipt["from"]))
+            self._awaiting_confirmation.append(tx_hash)
+        self.block_gas_used.append(gas_used)
+        confirmed_below = self.block_number - self.confirmations + 1
+        while self._awaiting_confirmation:
+            receipt = self._receipts[self._awaiting_confirmation[0]]
+            if receipt["blockNumber"] > confirmed_below:
+                break
+            self._awaiting_confirmation.popleft()
+            receipt["confirmed_at"] = block_time
+            self.confirmation_times.append(block_time - receipt["submitted_at"])
+
+
+    """
+    Function: _submit
+
+    Put one transaction in the mempool.
+
+    Raises:
+        ValueError: If the transaction needs more gas than a block holds (a node rejects it outright).
+        MempoolFullError: If the mempool is at capacity.
+    """
+    def _submit(self, gas, event, from_address=None):
+        if gas > self.block_gas_limit:
+            raise ValueError(f"Transaction gas {gas} exceeds block gas limit {self.block_gas_limit}")
+        self._produce_due_blocks()
+        if len(self._mempool) >= self.mempool_capacity:
+            self.rejected += 1
+            raise MempoolFullError(f"Mempool full ({self.mempool_capacity} pending transactions)")
+        self._tx_counter += 1
+        tx_hash = "0x" + hashlib.sha256(b"%d:%s" % (self._tx_counter, repr(event).encode())).hexdigest()
+        submitted_at = self.now
+        self._receipts[tx_hash] = {"transactionHash": tx_hash, "blockNumber": None, "status": None,
+                                   "submitted_at": submitted_at, "event": event, "from": from_address}
+        self._mempool.append((tx_hash, gas, submitted_at))
+        self.submitted += 1
+        self.max_mempool_depth = max(self.max_mempool_depth, len(self._mempool))
+        return tx_hash
+
+
+    """
+    Function: log_auth
+
+    Same interface as BlockchainInterface.log_auth; the sender address is recorded with the event, the key is unused.
+
+    Returns:
+        str: Transaction hash.
+    """
+    def log_auth(self, vehicle_hash, timestamp, authenticated, from_address=None, private_key=None, retries=1):
+        return self._submit(GAS_LOG_AUTH, ("AuthEvent", (vehicle_hash, timestamp, authenticated)), from_address)
+
+
+    """
+    Function: anchor_batch
+
+    Same interface as BlockchainInterface.anchor_batch.
+    """
+    def anchor_batch(self, merkle_root, count, from_timestamp, to_timestamp, from_address=None, private_key=None,
+                     retries=1):
+        return self._submit(GAS_LOG_AUTH_BATCH, ("AuthBatch", (merkle_root, count, from_timestamp, to_timestamp)),
+                            from_address)
+
+
+    """
+    Function: get_transaction_receipt
+
+    Return the receipt of a transaction once it is in a block (None while pending or unknown).
+    """
+    def get_transaction_receipt(self, tx_hash):
+        self._produce_due_blocks()
+        receipt = self._receipts.get(tx_hash)
+        if receipt is None or receipt["blockNumber"] is None:
+            return None
+        return receipt
+
+
+    """
+    Function: advance
+
+    Move virtual time forward, producing the blocks that fall due.
+    """
+    def advance(self, seconds):
+        if self._clock:
+            raise RuntimeError("advance() is only available with virtual time")
+        self._virtual_now += seconds
+        self._produce_due_blocks()
+
+
+    """
+    Function: drain
+
+    Advance virtual time until every submitted transaction is confirmed.
+
+    Args:
+        max_blocks (int): Safety limit on blocks produced (default 1,000,000).
+    """
+    def drain(self, max_blocks=1_000_000):
+        for _ in range(max_blocks):
+            if not self._mempool and not self._awaiting_confirmation:
+                return
+            self.advance(max(self._next_block_time - self.now, 0.0))
+
+
+    """
+    Function: stats
+
+    Summarize the run.
+
+    Returns:
+        dict: submitted, rejected, confirmed, pending, blocks, max_mempool_depth, mean block utilization,
+              and confirmation-time mean/p50/p95/p99/max in seconds.
+    """
+    def stats(self):
+        times = sorted(self.confirmation_times)
+
+        def pct(fraction):
+            return times[min(len(times) - 1, int(fraction * len(times)))] if times else 0.0
+
+        return {
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "confirmed": len(times),
+            "pending": len(self._mempool),
+            "blocks": self.block_number,
+            "max_mempool_depth": self.max_mempool_depth,
+            "block_utilization": (sum(self.block_gas_used) / (len(self.block_gas_used) * self.block_gas_limit)
+                                  if self.block_gas_used else 0.0),
+            "confirmation_mean": sum(times) / len(times) if times else 0.0,
+            "confirmation_p50": pct(0.50),
+            "confirmation_p95": pct(0.95),
+            "confirmation_p99": pct(0.99),
+            "confirmation_max": times[-1] if times else 0.0,
+        }
+
+
+if __name__ == "__main__":
+    # Simple test: 300 auths/sec for 2 minutes against a 2 s, 5M-gas chain (room for ~96 logAuth per second),
+    # once logging every event and once anchoring one Merkle root per 1,000 events
+    from merkle_batch import MerkleBatcher
+
+    def run(batched):
+        ledger = LedgerSimulator(block_interval=2.0, block_gas_limit=5_000_000, mempool_capacity=20_000,
+                                 confirmations=2, interval_distribution="exponential", seed=1)
+        batcher = MerkleBatcher(batch_size=1000, anchor=ledger.anchor_batch)
+        for second in range(120):
+            for i in range(300):
+                vehicle_hash = hashlib.sha256(b"VEH%d" % i).hexdigest()
+                try:
+                    if batched:
+                        batcher.add({"vehicle_hash": vehicle_hash, "timestamp": second, "authenticated": True})
+                    else:
+                        ledger.log_auth(vehicle_hash, second, True)
+                except MempoolFullError:
+                    pass
+            ledger.advance(1.0)
+        batcher.flush()
+        ledger.drain()
+        return ledger.stats()
+
+    for batched in (False, True):
+        stats = run(batched)
+        print(f"[Ledger Sim] {'Merkle-batched' if batched else 'per-event'}: {stats['confirmed']} confirmed, "
+              f"{stats['rejected']} rejected, max mempool {stats['max_mempool_depth']}, "
+              f"confirmation p50 {stats['confirmation_p50']:.1f}s p95 {stats['confirmation_p95']:.1f}s "
+              f"p99 {stats['confirmation_p99']:.1f}s")
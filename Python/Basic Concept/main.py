@@ -5,10 +5,29 @@ Purpose:
     Orchestrates the simulation of a privacy-preserving vehicle authentication protocol using Zero-Knowledge Proofs (ZKP) and blockchain logging.
     Demonstrates both a simulated and (eventually) real ZoKrates-based ZKP workflow, as well as simulated and (eventually) real blockchain 
     verification and event logging.
+
+Usage:
+    python main.py                      Interactive menu.
+    python main.py --backend simulated --fleet-size 10 100 1000 --workers 4 --output results.jsonl
+                                        Headless run: one JSON line per scenario (and per fleet size in a sweep),
+                                        then a summary line. Exit status is 0 if every scenario passed, 1 if any
+                                        failed and 2 for invalid arguments.
 """
 
+import argparse
+import json
+import sys
+import time
+
 import preliminary_tests
 
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+# Tags selecting the scenarios for each --backend choice (None selects everything)
+BACKEND_TAGS = {"simulated": ["simulated"], "zokrates": ["zokrates"], "all": None}
+
 
 def cli_menu_loop():
     while True:
@@ -69,5 +88,93 @@ def cli_menu_loop():
             case _:
                 print("Invalid choice. Please try again.")
 
+
+"""
+Function: parse_args
+
+Parse the headless command-line arguments.
+"""
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Run authentication scenarios without the interactive menu.")
+    parser.add_argument("--scenarios", nargs="+", metavar="NAME", help="Scenario names to run (see --list)")
+    parser.add_argument("--tags", nargs="+", metavar="TAG", help="Run scenarios carrying any of these tags")
+    parser.add_argument("--backend", choices=sorted(BACKEND_TAGS), default="all",
+                        help="Proof backend to exercise when no scenarios/tags are given (default all)")
+    parser.add_argument("--fleet-size", type=int, nargs="+", default=[None], metavar="N",
+                        help="Vehicles per multi-vehicle scenario; several values run a sweep")
+    parser.add_argument("--workers", type=int, help="Worker processes for simulated scenarios (default: CPU count)")
+    parser.add_argument("--output", default="-", help="JSON lines output file (default: stdout)")
+    parser.add_argument("--include-output", action="store_true", help="Include each scenario's printed output")
+    parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument("--list", action="store_true", help="List scenario names and tags, then exit")
+    args = parser.parse_args(argv)
+    if any(size is not None and size < 1 for size in args.fleet_size):
+        parser.error("--fleet-size values must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    args.error = parser.error
+    return args
+
+
+"""
+Function: run_headless
+
+Run the selected scenarios for every requested fleet size, streaming one JSON object per line.
+
+Args:
+    argv (list of str): Command-line arguments (without the program name).
+
+Returns:
+    int: EXIT_OK if every scenario passed, EXIT_FAILED otherwise (argument errors exit with EXIT_USAGE).
+"""
+def run_headless(argv):
+    args = parse_args(argv)
+    if args.list:
+        for scenario in preliminary_tests.SCENARIOS:
+            print(f"{scenario.name:<26} {', '.join(scenario.tags)}")
+        return EXIT_OK
+    tags = args.tags if args.scenarios or args.tags else BACKEND_TAGS[args.backend]
+    try:
+        preliminary_tests.select_scenarios(args.scenarios, tags)
+    except ValueError as e:
+        args.error(str(e))
+    preliminary_tests.set_debug_mode(args.debug)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w")
+    counts = {"run": 0, "passed": 0}
+    start = time.perf_counter()
+
+    def emit(record):
+        out.write(json.dumps(record) + "\n")
+        out.flush()                                 # Stream: every line is visible as soon as it is known
+
+    try:
+        for fleet_size in args.fleet_size:
+            def on_result(result):
+                record = result.as_dict()
+                if not args.include_output:
+                    del record["output"]
+                record.update(type="scenario", fleet_size=fleet_size, workers=args.workers, backend=args.backend)
+                counts["run"] += 1
+                counts["passed"] += result.passed
+                emit(record)
+
+            # Scenario printouts are captured in each result, so stdout carries only the JSON lines
+            preliminary_tests.run_scenarios(args.scenarios, tags, args.workers, on_result, fleet_size)
+        emit({
+            "type": "summary",
+            "run": counts["run"],
+            "passed": counts["passed"],
+            "failed": counts["run"] - counts["passed"],
+            "elapsed": time.perf_counter() - start,
+        })
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return EXIT_OK if counts["passed"] == counts["run"] else EXIT_FAILED
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(run_headless(sys.argv[1:]))
     cli_menu_loop()
@@ -0,0 +1,311 @@
+"""
+merkle_batch.py
+
+Purpose:
+    Batches authentication events into Merkle trees so only one root per batch (plus event count and time range)
+    is anchored on chain through AuthLogger.logAuthBatch, while every individual event stays provable through a
+    local index of inclusion proofs.
+
+Methodology:
+    - Each event is encoded canonically (JSON with sorted keys, no whitespace) and hashed with SHA-256.
+    - Hashes are domain-separated: leaves are SHA-256(0x00 || event), interior nodes SHA-256(0x01 || left || right),
+      so an interior node can never be passed off as a leaf. An odd node at the end of a level is carried up
+      unchanged rather than duplicated.
+    - MerkleBatcher collects events, seals a batch every batch_size events (or on flush), calls an anchor function
+      with (root, count, from_timestamp, to_timestamp) and records the batch in a BatchIndex.
+    - BatchIndex keeps each batch's leaf hashes (in memory and, optionally, in a JSON-lines file) and answers
+      "prove this event" with the batch root, leaf position and sibling path.
+"""
+
+import hashlib
+import json
+import os
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+DEFAULT_BATCH_SIZE = 1024
+
+
+"""
+Function: encode_event
+
+Canonical byte encoding of an event dict (the same event always encodes to the same bytes).
+"""
+def encode_event(event):
+    return json.dumps(event, sort_keys=True, separators=(",", ":")).encode()
+
+
+"""
+Function: leaf_hash
+
+Domain-separated leaf hash of an event dict.
+"""
+def leaf_hash(event):
+    return hashlib.sha256(LEAF_PREFIX + encode_event(event)).digest()
+
+
+"""
+Function: node_hash
+
+Domain-separated hash of two child nodes.
+"""
+def node_hash(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+"""
+Function: build_levels
+
+Build every level of the Merkle tree over a list of leaf hashes.
+
+Returns:
+    list of list of bytes: levels[0] are the leaves, levels[-1] == [root].
+
+Raises:
+    ValueError: If there are no leaves.
+"""
+def build_levels(leaves):
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree with no leaves")
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])           # Carry the odd node up unchanged
+        levels.append(parents)
+    return levels
+
+
+"""
+Function: inclusion_proof
+
+Sibling path from a leaf to the root.
+
+Args:
+    levels (list): Tree levels from build_levels.
+    index (int): Leaf position.
+
+Returns:
+    list of tuple: (sibling_hash, "L" or "R") pairs, bottom-up; "L" means the sibling is on the left.
+"""
+def inclusion_proof(levels, index):
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append((level[sibling], "L" if sibling < index else "R"))
+        index //= 2
+    return proof
+
+
+"""
+Function: verify_inclusion
+
+Check that an event is included under a Merkle root.
+
+Args:
+    event (dict): The event to check.
+    proof (list of tuple): (sibling_hash, side) pairs as returned by inclusion_proof (hashes as bytes or hex).
+    root (bytes or str): Expected Merkle root.
+
+Returns:
+    bool: True if the proof leads from the event to the root.
+"""
+def verify_inclusion(event, proof, root):
+    current = leaf_hash(event)
+    for sibling, side in proof:
+        sibling = bytes.fromhex(sibling) if isinstance(sibling, str) else sibling
+        current = node_hash(sibling, current) if side == "L" else node_hash(current, sibling)
+    root = bytes.fromhex(root) if isinstance(root, str) else root
+    return current == root
+
+
+"""
+BatchIndex Class
+
+Local index of sealed batches, answering inclusion-proof queries for single events.
+
+Args:
+    path (str, optional): JSON-lines file persisting the batches (loaded if it exists, appended to on add).
+"""
+class BatchIndex:
+
+    def __init__(self, path=None):
+        self.path = path
+        self.batches = []               # One dict per batch: batch_id, root, count, from/to timestamp, anchor, leaves
+        self._positions = {}            # leaf hash -> (batch_id, index)
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    batch = json.loads(line)
+                    batch["leaves"] = [bytes.fromhex(leaf) for leaf in batch["leaves"]]
+                    self._register(batch)
+
+
+    def _register(self, batch):
+        self.batches.append(batch)
+        for index, leaf in enumerate(batch["leaves"]):
+            self._positions.setdefault(leaf, (batch["batch_id"], index))
+
+
+    """
+    Function: add_batch
+
+    Record a sealed batch (and append it to the index file, if any).
+    """
+    def add_batch(self, root, leaves, from_timestamp, to_timestamp, anchor=None):
+        batch = {
+            "batch_id": len(self.batches),
+            "root": root.hex(),
+            "count": len(leaves),
+            "from_timestamp": from_timestamp,
+            "to_timestamp": to_timestamp,
+            "anchor": anchor,
+            "leaves": list(leaves),
+        }
+        if self.path:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(dict(batch, leaves=[leaf.hex() for leaf in leaves])) + "\n")
+        self._register(batch)
+        return batch
+
+
+    """
+    Function: prove
+
+    Return the inclusion proof for an event.
+
+    Args:
+        event (dict): An event previously added to a sealed batch.
+
+    Returns:
+        dict or None: {"batch_id", "root", "anchor", "index", "proof": [[sibling_hex, side], ...]},
+                      or None if the event is not in any sealed batch.
+    """
+    def prove(self, event):
+        position = self._positions.get(leaf_hash(event))
+        if position is None:
+            return None
+        batch_id, index = position
+        batch = self.batches[batch_id]
+        proof = inclusion_proof(build_levels(batch["leaves"]), index)
+        return {
+            "batch_id": batch_id,
+            "root": batch["root"],
+            "anchor": batch["anchor"],
+            "index": index,
+            "proof": [[sibling.hex(), side] for sibling, side in proof],
+        }
+
+
+"""
+MerkleBatcher Class
+
+Collects auth events and anchors one Merkle root per batch.
+
+Functionality:
+    - add(event) buffers an event; every batch_size events the batch is sealed.
+    - seal() / flush() build the tree, call anchor(root, count, from_timestamp, to_timestamp) and index the batch.
+    - add_from_ledger(path) batches every event in an AuthEventLog JSON-lines ledger.
+
+Usage:
+    batcher = MerkleBatcher(anchor=lambda root, count, lo, hi: interface.anchor_batch(root, count, lo, hi, addr, key))
+    batcher.add_from_ledger("auth_events.jsonl")
+    batcher.flush()
+    proof = batcher.index.prove(event)
+
+Args:
+    batch_size (int): Events per batch (default DEFAULT_BATCH_SIZE).
+    anchor (callable, optional): Called with (root bytes, count, from_timestamp, to_timestamp) for every sealed
+                                 batch; its return value (e.g. a transaction hash) is stored in the index.
+    index_path (str, optional): JSON-lines file for the batch index.
+"""
+class MerkleBatcher:
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, anchor=None, index_path=None):
+        self.batch_size = batch_size
+        self.anchor = anchor
+        self.index = BatchIndex(index_path)
+        self._leaves = []
+        self._from_timestamp = None
+        self._to_timestamp = None
+
+
+    """
+    Function: add
+
+    Buffer one event (a dict with a "timestamp" field), sealing the batch when it is full.
+
+    Returns:
+        dict or None: The sealed batch record if this event completed a batch.
+    """
+    def add(self, event):
+        timestamp = event["timestamp"]
+        self._leaves.append(leaf_hash(event))
+        self._from_timestamp = timestamp if self._from_timestamp is None else min(self._from_timestamp, timestamp)
+        self._to_timestamp = timestamp if self._to_timestamp is None else max(self._to_timestamp, timestamp)
+        if len(self._leaves) >= self.batch_size:
+            return self.seal()
+        return None
+
+
+    """
+    Function: add_from_ledger
+
+    Add every event in a JSON-lines ledger file (see auth_log.py).
+
+    Returns:
+        int: Number of events read.
+    """
+    def add_from_ledger(self, path):
+        count = 0
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    self.add(json.loads(line))
+                    count += 1
+        return count
+
+
+    """
+    Function: seal
+
+    Build the Merkle tree over the buffered events, anchor its root and index the batch.
+
+    Returns:
+        dict or None: The batch record, or None if nothing was buffered.
+    """
+    def seal(self):
+        if not self._leaves:
+            return None
+        root = build_levels(self._leaves)[-1][0]
+        anchor = None
+        if self.anchor is not None:
+            anchor = self.anchor(root, len(self._leaves), self._from_timestamp, self._to_timestamp)
+        batch = self.index.add_batch(root, self._leaves, self._from_timestamp, self._to_timestamp, anchor)
+        self._leaves = []
+        self._from_timestamp = self._to_timestamp = None
+        return batch
+
+
+    flush = seal
+
+
+if __name__ == "__main__":
+    # Simple test: batch 10,000 events, prove and verify a few, and show a tampered event fails
+    anchored = []
+    batcher = MerkleBatcher(batch_size=1000, anchor=lambda root, count, lo, hi: anchored.append(root.hex()) or len(anchored))
+    events = [{"vehicle_hash": hashlib.sha256(b"VEH%d" % i).hexdigest(), "timestamp": 1_700_000_000 + i,
+               "authenticated": i % 7 != 0} for i in range(10_001)]
+    for event in events:
+        batcher.add(event)
+    batcher.flush()
+    print(f"[Merkle] {len(events)} events anchored with {len(anchored)} on-chain writes")
+    for event in (events[0], events[4321], events[-1]):
+        proof = batcher.index.prove(event)
+        print(f"[Merkle] Event at {event['timestamp']}: batch {proof['batch_id']}, "
+              f"{len(proof['proof'])} siblings, valid={verify_inclusion(event, proof['proof'], proof['root'])}")
+    tampered = dict(events[4321], authenticated=not events[4321]["authenticated"])
+    proof = batcher.index.prove(events[4321])
+    print(f"[Merkle] Tampered event verifies: {verify_inclusion(tampered, proof['proof'], proof['root'])}")
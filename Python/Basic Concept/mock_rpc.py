@@ -0,0 +1,383 @@
+"""
+mock_rpc.py
+
+Purpose:
+    A small local stand-in for an Ethereum JSON-RPC node, used to exercise BlockchainInterface's nonce allocator and
+    transaction pipeline without a real chain.
+
+Methodology:
+    - Serves the handful of JSON-RPC methods the interface uses over HTTP (stdlib http.server, one thread per request).
+    - eth_sendRawTransaction decodes the nonce from the signed transaction's RLP (legacy and typed transactions) and
+      enforces nonce ordering like a node: nonces below the account's next nonce are rejected with "nonce too low",
+      nonces above it wait in a queue until the gap is filled.
+    - A miner thread seals a block every block_time seconds with all executable transactions; receipts become
+      available once a transaction is mined. Nonces added to MockChain.reverting are mined with status 0, to
+      simulate reverted transactions.
+    - With event_topic set, every mined call emits one log with that topic and the call's arguments (calldata after
+      the 4-byte selector) as data, which is exactly what AuthLogger.logAuth does for AuthEvent (no indexed
+      parameters). eth_getLogs filters these by address, block range and first topic.
+    - The mock does not recover signers: every transaction is treated as coming from one account, whose nonce can
+      be advanced externally with bump_nonce() to simulate another sender sharing the key.
+    - Transaction hashes are SHA3-256 of the raw transaction (the stdlib has no Keccak-256); they are only used as IDs.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CHAIN_ID = 1337
+DEFAULT_GAS_PRICE = 1_000_000_000
+DEFAULT_BLOCK_TIME = 0.2
+
+
+"""
+Function: _rlp_decode
+
+Decode one RLP item starting at `pos`.
+
+Returns:
+    tuple: (item, next_pos) where item is bytes or a list of items.
+"""
+def _rlp_decode(data, pos=0):
+    prefix = data[pos]
+    if prefix < 0x80:
+        return data[pos:pos + 1], pos + 1
+    if prefix < 0xb8:
+        length = prefix - 0x80
+        return data[pos + 1:pos + 1 + length], pos + 1 + length
+    if prefix < 0xc0:
+        size = prefix - 0xb7
+        length = int.from_bytes(data[pos + 1:pos + 1 + size], "big")
+        start = pos + 1 + size
+        return data[start:start + length], start + length
+    if prefix < 0xf8:
+        length = prefix - 0xc0
+        start = pos + 1
+    else:
+        size = prefix - 0xf7
+        length = int.from_bytes(data[pos + 1:pos + 1 + size], "big")
+        start = pos + 1 + size
+    items, cursor = [], start
+    while cursor < start + length:
+        item, cursor = _rlp_decode(data, cursor)
+        items.append(item)
+    return items, start + length
+
+
+"""
+Function: transaction_fields
+
+Extract the nonce, recipient and calldata from a signed raw transaction (legacy RLP list, or EIP-2718 typed
+envelope: type 1 [chainId, nonce, gasPrice, gas, to, value, data, ...], type 2 [chainId, nonce, maxPriorityFee,
+maxFee, gas, to, value, data, ...]).
+
+Returns:
+    tuple: (nonce, to as bytes, data as bytes)
+"""
+def transaction_fields(raw):
+    if raw[0] >= 0xc0:
+        fields, _ = _rlp_decode(raw)
+        nonce, to, data = fields[0], fields[3], fields[5]
+    else:
+        fields, _ = _rlp_decode(raw, 1)
+        offset = 1 if raw[0] == 0x01 else 2     # Type 2 has two fee fields where type 1 has gasPrice
+        nonce, to, data = fields[1], fields[3 + offset], fields[5 + offset]
+    return int.from_bytes(nonce, "big"), to, data
+
+
+"""
+Function: transaction_nonce
+
+Extract the nonce from a signed raw transaction.
+"""
+def transaction_nonce(raw):
+    return transaction_fields(raw)[0]
+
+
+"""
+RPCError
+
+JSON-RPC error returned to the client.
+"""
+class RPCError(Exception):
+
+    def __init__(self, message, code=-32000):
+        super().__init__(message)
+        self.code = code
+
+
+"""
+MockChain Class
+
+In-memory chain state behind the mock RPC server.
+
+Args:
+    chain_id (int): Chain ID reported by eth_chainId.
+    block_time (float): Seconds between mined blocks.
+    gas_price (int): Gas price reported by eth_gasPrice.
+    event_topic (str, optional): 0x-prefixed topic of the log each mined call emits (default: no logs).
+"""
+class MockChain:
+
+    def __init__(self, chain_id=DEFAULT_CHAIN_ID, block_time=DEFAULT_BLOCK_TIME, gas_price=DEFAULT_GAS_PRICE,
+                 event_topic=None):
+        self.chain_id = chain_id
+        self.event_topic = event_topic
+        self.block_time = block_time
+        self.gas_price = gas_price
+        self.block_number = 0
+        self.mined_nonce = 0            # Next nonce to be mined
+        self.pending_nonce = 0          # Next nonce the account may submit
+        self._queued = {}               # nonce -> (tx_hash, submitted_at, to, data) waiting to be mined
+        self._receipts = {}             # tx_hash -> receipt
+        self._logs = []                 # Every emitted log, in block order
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.reverting = set()          # Nonces whose transactions are mined as reverted (status 0)
+
+
+    """
+    Function: bump_nonce
+
+    Advance the account nonce as if `count` transactions were sent by someone else with the same key.
+    """
+    def bump_nonce(self, count=1):
+        with self._lock:
+            for _ in range(count):
+                self._queued[self.pending_nonce] = (f"external-{self.pending_nonce}", time.time(), b"", b"")
+                self.pending_nonce += 1
+            while self.pending_nonce in self._queued:
+                self.pending_nonce += 1
+
+
+    """
+    Function: send_raw_transaction
+
+    Accept a signed transaction, enforcing nonce ordering.
+
+    Returns:
+        str: Transaction hash (hex).
+
+    Raises:
+        RPCError: If the nonce was already used or the transaction is already known.
+    """
+    def send_raw_transaction(self, raw):
+        nonce, to, data = transaction_fields(raw)
+        tx_hash = "0x" + hashlib.sha3_256(raw).hexdigest()
+        with self._lock:
+            if tx_hash in self._receipts or any(queued[0] == tx_hash for queued in self._queued.values()):
+                self.rejected += 1
+                raise RPCError("already known")
+            if nonce < self.mined_nonce or (nonce < self.pending_nonce and nonce not in self._queued):
+                self.rejected += 1
+                raise RPCError(f"nonce too low: next nonce {self.pending_nonce}, tx nonce {nonce}")
+            if nonce in self._queued:
+                self.rejected += 1
+                raise RPCError("replacement transaction underpriced")
+            self._queued[nonce] = (tx_hash, time.time(), to, data)
+            while self.pending_nonce in self._queued:
+                self.pending_nonce += 1
+        return tx_hash
+
+
+    """
+    Function: mine_block
+
+    Seal one block containing every queued transaction whose nonce is executable.
+    """
+    def mine_block(self):
+        with self._lock:
+            self.block_number += 1
+            block_hash = "0x" + hashlib.sha3_256(b"block%d" % self.block_number).hexdigest()
+            index = 0
+            while self.mined_nonce in self._queued:
+                tx_hash, _submitted, to, data = self._queued.pop(self.mined_nonce)
+                reverted = self.mined_nonce in self.reverting
+                logs = []
+                if self.event_topic and len(data) >= 4 and len(to) == 20 and not reverted:
+                    logs.append({
+                        "address": "0x" + to.hex(),
+                        "topics": [self.event_topic],
+                        "data": "0x" + data[4:].hex(),
+                        "blockNumber": hex(self.block_number),
+                        "blockHash": block_hash,
+                        "transactionHash": tx_hash,
+                        "transactionIndex": hex(index),
+                        "logIndex": hex(index),       # One log per transaction
+                        "removed": False,
+                    })
+                    self._logs.extend(logs)
+                self._receipts[tx_hash] = {
+                    "transactionHash": tx_hash,
+                    "transactionIndex": hex(index),
+                    "blockHash": block_hash,
+                    "blockNumber": hex(self.block_number),
+                    "from": "0x" + "00" * 20,
+                    "to": "0x" + (to.hex() if to else "00" * 20),
+                    "cumulativeGasUsed": hex(25_000 * (index + 1)),
+                    "gasUsed": hex(25_000),
+                    "effectiveGasPrice": hex(self.gas_price),
+                    "contractAddress": None,
+                    "logs": logs,
+                    "logsBloom": "0x" + "00" * 256,
+                    "status": "0x0" if reverted else "0x1",
+                    "type": "0x0",
+                }
+                self.mined_nonce += 1
+                index += 1
+
+
+    """
+    Function: get_logs
+
+    Return emitted logs matching an eth_getLogs filter (address, fromBlock, toBlock, first topic).
+    """
+    def get_logs(self, log_filter):
+        def block(value, default):
+            if value is None or value == "latest" or value == "pending":
+                return default
+            return value if isinstance(value, int) else (0 if value == "earliest" else int(value, 16))
+
+        with self._lock:
+            first = block(log_filter.get("fromBlock"), self.block_number)
+            last = block(log_filter.get("toBlock"), self.block_number)
+            address = log_filter.get("address")
+            addresses = {a.lower() for a in ([address] if isinstance(address, str) else address or [])}
+            topics = log_filter.get("topics") or [None]
+            wanted = topics[0]
+            wanted = {wanted} if isinstance(wanted, str) else set(wanted or [])
+            return [log for log in self._logs
+                    if first <= int(log["blockNumber"], 16) <= last
+                    and (not addresses or log["address"] in addresses)
+                    and (not wanted or log["topics"][0] in wanted)]
+
+
+    """
+    Function: handle
+
+    Dispatch one JSON-RPC method call.
+    """
+    def handle(self, method, params):
+        if method == "eth_chainId":
+            return hex(self.chain_id)
+        if method == "net_version":
+            return str(self.chain_id)
+        if method == "eth_blockNumber":
+            return hex(self.block_number)
+        if method == "eth_gasPrice":
+            return hex(self.gas_price)
+        if method == "eth_estimateGas":
+            return hex(30_000)
+        if method == "eth_getTransactionCount":
+            block = params[1] if len(params) > 1 else "latest"
+            return hex(self.pending_nonce if block == "pending" else self.mined_nonce)
+        if method == "eth_sendRawTransaction":
+            return self.send_raw_transaction(bytes.fromhex(params[0].removeprefix("0x")))
+        if method == "eth_getTransactionReceipt":
+            return self._receipts.get(params[0])
+        if method == "eth_getLogs":
+            return self.get_logs(params[0])
+        raise RPCError(f"Method {method} not supported by the mock", code=-32601)
+
+
+"""
+MockRPCServer Class
+
+Runs a MockChain behind a local HTTP JSON-RPC endpoint, with a background miner.
+
+Usage:
+    with MockRPCServer() as server:
+        interface = BlockchainInterface(server.url, contract_address, abi)
+
+Args:
+    port (int): TCP port (0 picks a free port).
+    **chain_kwargs: Passed to MockChain.
+"""
+class MockRPCServer:
+
+    def __init__(self, port=0, **chain_kwargs):
+        self.chain = MockChain(**chain_kwargs)
+        chain = self.chain
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                batch = request if isinstance(request, list) else [request]
+                responses = []
+                for call in batch:
+                    response = {"jsonrpc": "2.0", "id": call.get("id")}
+                    try:
+                        response["result"] = chain.handle(call["method"], call.get("params", []))
+                    except RPCError as e:
+                        response["error"] = {"code": e.code, "message": str(e)}
+                    responses.append(response)
+                body = json.dumps(responses if isinstance(request, list) else responses[0]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass                        # Keep the console quiet
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._mine, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+
+    def _mine(self):
+        while not self._stop.wait(self.chain.block_time):
+            self.chain.mine_block()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+    """
+    Function: close
+
+    Stop the miner and the HTTP server.
+    """
+    def close(self):
+        self._stop.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    # Simple test: submit hand-built legacy transactions out of order and watch them get mined in nonce order
+    import urllib.request
+
+    def rpc(url, method, *params):
+        body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": list(params)}).encode()
+        request = urllib.request.Request(url, body, {"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+
+    def legacy_tx(nonce):
+        nonce_bytes = nonce.to_bytes((nonce.bit_length() + 7) // 8, "big")
+        fields = [nonce_bytes if nonce else b"", b"\x01", b"\x75\x30", b"\x00" * 20, b"", b"", b"\x1b", b"\x01", b"\x02"]
+        payload = b"".join((bytes([0x80 + len(f)]) + f) if len(f) != 1 or f[0] >= 0x80 else f for f in fields)
+        return "0x" + (bytes([0xc0 + len(payload)]) + payload).hex()
+
+    with MockRPCServer(block_time=0.05) as server:
+        hashes = [rpc(server.url, "eth_sendRawTransaction", legacy_tx(n))["result"] for n in (1, 0, 2)]
+        print(f"[Mock RPC] Replayed nonce 0: {rpc(server.url, 'eth_sendRawTransaction', legacy_tx(0))['error']['message']}")
+        time.sleep(0.2)
+        blocks = [rpc(server.url, "eth_getTransactionReceipt", h)["result"]["blockNumber"] for h in hashes]
+        print(f"[Mock RPC] Pending nonce: {int(rpc(server.url, 'eth_getTransactionCount', '0x0', 'pending')['result'], 16)}, "
+              f"mined in blocks {blocks}")
@@ -9,6 +9,7 @@ Methodology:
     - Concatenates the provided secret with the current Unix timestamp.
     - Hashes the result using SHA-256 to produce a unique OTP for each time interval.
     - Returns both the OTP and the timestamp used for generation.
+    - generate_otp_at recomputes the OTP for an explicit timestamp (used by the RSU during verification).
 """
 
 import time
@@ -24,10 +25,22 @@ Returns:
 def generate_otp(secret):
 
     timestamp = int(time.time())                    # Get current Unix timestamp as an integer (seconds since epoch)
-    otp_input = f"{secret}{timestamp}".encode()     # Concatenate secret and timestamp, then encode as bytes
-    otp = hashlib.sha256(otp_input).hexdigest()     # Hash the bytes using SHA-256 and get the hex digest as OTP
+    otp = generate_otp_at(secret, timestamp)        # Derive the OTP for that timestamp
     return otp, timestamp                           # Return the OTP and the timestamp used
 
+"""
+Generate the one-time password (OTP) for a given secret and timestamp.
+Used by verifiers, which must recompute the OTP for the timestamp the vehicle supplied rather than the current time.
+Args:
+    secret (str): Secret key unique to the vehicle.
+    timestamp (int): Unix timestamp (seconds) the OTP is bound to.
+Returns:
+    str: The OTP (hex SHA-256 digest).
+"""
+def generate_otp_at(secret, timestamp):
+    otp_input = f"{secret}{timestamp}".encode()     # Concatenate secret and timestamp, then encode as bytes
+    return hashlib.sha256(otp_input).hexdigest()    # Hash the bytes using SHA-256 and get the hex digest as OTP
+
 if __name__ == "__main__":
     # Simple test for OTP generation
     secret = "mysecret"
@@ -14,17 +14,23 @@ Methodology:
     - Provides functions for each workflow, which can be run directly for demonstration and prototyping.
 
 Usage:
-    Run this script directly to execute the included test scenarios.
+    Run this script directly to execute the included test scenarios. Each test returns True when it passes;
+    run_scenarios runs a selection of them (by name or tag) concurrently and returns a ScenarioResult per test.
     Requires: vehicle.py, rsu.py, zokrates_interface.py, blockchain.py
 """
 
 import secrets                                              # For generating random secrets for vehicles
 import os
+import io
 import time
 import random
+import contextlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from vehicle import Vehicle                                 # Vehicle entity: generates OTPs and ZKPs
 from rsu import RSU                                         # RSU entity: verifies ZKPs from vehicles
+from fleet import Fleet                                     # Array-backed fleet: batch OTP and ZKP generation
 from zokrates_interface import (
     run_zokrates_compile,
     run_zokrates_setup,
@@ -34,14 +40,57 @@ from zokrates_interface import (
     cleanup_zokrates_files,
     set_debug_mode as set_zokrates_debug_mode
 )
+from zokrates_pool import prove_many                        # Prove many vehicles in isolated workspaces, in parallel
 from blockchain import simulate_blockchain_verification     # Simulate blockchain-based verification and logging
 
-# Track number of tests run and passed
-tested = 0
-passed = 0
-
 DEBUG_MODE = False
 
+# Seconds a single vehicle's witness/proof/verify job may take before it is abandoned
+ZOKRATES_JOB_DEADLINE = 60.0
+
+# A runnable test/scenario: a function returning True on success, with a short name and selection tags
+Scenario = namedtuple("Scenario", ["name", "function", "tags"])
+
+
+"""
+ScenarioResult Class
+
+Outcome of one scenario run.
+
+Args:
+    name (str): Scenario name.
+    tags (tuple of str): Scenario tags.
+    passed (bool): Whether the scenario passed.
+    elapsed (float): Wall-clock seconds the scenario took.
+    output (str): Everything the scenario printed.
+    error (str, optional): Exception raised by the scenario, if any.
+"""
+class ScenarioResult:
+
+    def __init__(self, name, tags, passed, elapsed, output="", error=None):
+        self.name = name
+        self.tags = tuple(tags)
+        self.passed = passed
+        self.elapsed = elapsed
+        self.output = output
+        self.error = error
+
+
+    """
+    Function: as_dict
+
+    Return the result as a JSON-serializable dict.
+    """
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "tags": list(self.tags),
+            "passed": self.passed,
+            "elapsed": self.elapsed,
+            "output": self.output,
+            "error": self.error,
+        }
+
 def set_debug_mode(enabled: bool):
     """Enable or disable debug mode for detailed output."""
     global DEBUG_MODE
@@ -67,8 +116,6 @@ Steps:
 """
 def test_vehicle_rsu_interaction_simulated():
     print("\n=== Simulated ZKP Test ===")
-    global tested, passed
-    tested += 1
     # Generate entities
     vehicle_id = "VEH123"
     vehicle_secret = secrets.token_hex(16)
@@ -91,10 +138,10 @@ def test_vehicle_rsu_interaction_simulated():
 
     # Output authentication result
     if verification_result:
-        passed += 1
         print("[Simulated] Vehicle authenticated. Session started.\n")
     else:
         print("[Simulated] Authentication failed.\n")
+    return verification_result
 
 
 """
@@ -112,8 +159,6 @@ Steps:
 """
 def test_vehicle_rsu_blockchain_simulated():
     print("\n=== Simulated Blockchain ZKP Test ===")
-    global tested, passed
-    tested += 1
     # Generate entities
     vehicle_id = "VEH123"
     vehicle_secret = secrets.token_hex(16)
@@ -138,10 +183,10 @@ def test_vehicle_rsu_blockchain_simulated():
     outcome = simulate_blockchain_verification(vehicle_id, zkp_proof, timestamp, verification_result) if DEBUG_MODE else verification_result
     # Output infrastructure access result
     if outcome:
-        passed += 1
         print("[Simulated] Access granted by infrastructure.\n")
     else:
         print("[Simulated] Access denied by infrastructure.\n")
+    return outcome
 
 
 """
@@ -149,8 +194,6 @@ End-to-end scenario: Vehicle authenticates successfully and is granted access.
 """
 def scenario_successful_authentication():
     print("\n=== End-to-End Scenario: Successful Authentication ===")
-    global tested, passed
-    tested += 1
     vehicle_id = "VEH001"
     vehicle_secret = secrets.token_hex(16)
     vehicle = Vehicle(vehicle_id, vehicle_secret)
@@ -173,10 +216,10 @@ def scenario_successful_authentication():
     # Blockchain verification and access outcome
     outcome = simulate_blockchain_verification(vehicle_id, zkp_proof, timestamp, verification_result) if DEBUG_MODE else verification_result
     if outcome:
-        passed += 1
         print("Access granted by infrastructure.\n")
     else:
         print("Access denied by infrastructure.\n")
+    return outcome
 
 
 """
@@ -184,8 +227,6 @@ End-to-end scenario: Vehicle fails authentication due to wrong secret.
 """
 def scenario_failed_authentication():
     print("\n=== End-to-End Scenario: Failed Authentication ===")
-    global tested, passed
-    tested += 1
     vehicle_id = "VEH001"
     correct_secret = secrets.token_hex(16)
     wrong_secret = secrets.token_hex(16)
@@ -211,8 +252,8 @@ def scenario_failed_authentication():
     if outcome:
         print("Access granted by infrastructure (unexpected).\n")
     else:
-        passed += 1
         print("Access denied by infrastructure (expected).\n")
+    return not outcome
 
 
 """
@@ -229,40 +270,38 @@ Steps:
 """
 def test_zokrates_connection():
     print("\n=== ZoKrates CLI Connection Test ===")
-    global tested, passed
-    tested += 1
     circuit_path = "dummy.zok"
     # Compile circuit
     if not run_zokrates_compile(circuit_path):
         print("[ZoKrates Test] Compilation failed.")
-        return
+        return False
     # Setup
     if not run_zokrates_setup():
         print("[ZoKrates Test] Setup failed.")
         cleanup_zokrates_files()
-        return
+        return False
     # Compute witness (inputs: a=3, b=4)
     args = ["3", "4"]
     if not run_zokrates_compute_witness(args):
         print("[ZoKrates Test] Compute witness failed.")
         cleanup_zokrates_files()
-        return
+        return False
     # Generate proof
     if not run_zokrates_generate_proof():
         print("[ZoKrates Test] Proof generation failed.")
         cleanup_zokrates_files()
-        return
+        return False
     # Verify proof
     verification_result = run_zokrates_verify()
     if DEBUG_MODE:
         print(f"[ZoKrates Test] Verification result: {verification_result}\n")
     if verification_result:
-        passed += 1
         print("[ZoKrates Test] ZoKrates connection and workflow succeeded!\n")
     else:
         print("[ZoKrates Test] ZoKrates connection or workflow failed.\n")
     # Always clean up ZoKrates artifacts after test
     cleanup_zokrates_files()
+    return bool(verification_result)
 
 
 """
@@ -271,8 +310,6 @@ This simulates a real ZKP workflow using the ZoKrates CLI on Linux.
 """
 def test_vehicle_rsu_interaction_real_zokrates_dummy():
     print("\n=== Real ZoKrates End-to-End Test with dummy.zok ===")
-    global tested, passed
-    tested += 1
     circuit_path = "dummy.zok"
     # Generate random field inputs for dummy.zok
     a = random.randint(1, 100)
@@ -282,68 +319,56 @@ def test_vehicle_rsu_interaction_real_zokrates_dummy():
     # Compile circuit
     if not run_zokrates_compile(circuit_path):
         print("[Real ZKP] Compilation failed.")
-        return
+        return False
     # Setup
     if not run_zokrates_setup():
         print("[Real ZKP] Setup failed.")
         cleanup_zokrates_files()
-        return
+        return False
     # Compute witness
     args = [str(a), str(b)]
     if not run_zokrates_compute_witness(args):
         print("[Real ZKP] Compute witness failed.")
         cleanup_zokrates_files()
-        return
+        return False
     # Generate proof
     if not run_zokrates_generate_proof():
         print("[Real ZKP] Proof generation failed.")
         cleanup_zokrates_files()
-        return
+        return False
     # Verify proof
     verification_result = run_zokrates_verify()
     if DEBUG_MODE:
         print(f"[Real ZKP] Verification result: {verification_result}\n")
     if verification_result:
-        passed += 1
         print("[Real ZKP] End-to-end ZoKrates workflow succeeded!\n")
     else:
         print("[Real ZKP] End-to-end ZoKrates workflow failed.\n")
     cleanup_zokrates_files()
+    return bool(verification_result)
 
 """Simulated ZKP isolated test with multiple vehicles."""
-def test_simulated_isolated_multiple_vehicles():
-    global tested, passed
-    tested += 1
+def test_simulated_isolated_multiple_vehicles(num_vehicles=3):
     print("\n=== Simulated ZKP Isolated Test: Multiple Vehicles ===")
-    num_vehicles = 3
-    vehicles = {}
-    rsu_secrets = {}
-    for i in range(num_vehicles):
-        vid = f"VEH{i+1:03d}"
-        secret = secrets.token_hex(16)
-        vehicles[vid] = Vehicle(vid, secret)
-        rsu_secrets[vid] = secret
-    rsu = RSU(rsu_secrets)
-    all_passed = True
-    for vid, vehicle in vehicles.items():
-        otp, timestamp = vehicle.generate_otp()
-        zkp_proof = vehicle.create_zkp(otp, timestamp)
-        result = rsu.verify_zkp(vid, zkp_proof, timestamp)
-        if DEBUG_MODE:
+    # Array-backed fleet: IDs and secrets in contiguous buffers, OTPs and proofs generated in one batch
+    fleet = Fleet.random(num_vehicles)
+    rsu = RSU(fleet.secrets_dict())
+    requests = fleet.auth_requests(int(time.time()))
+    # RSU verifies the whole burst of arrivals in one batch
+    results = rsu.verify_batch(requests)
+    if DEBUG_MODE:
+        for (vid, _proof, _timestamp), result in zip(requests, results):
             print(f"Vehicle {vid}: Verification result: {result}")
-        all_passed = all_passed and result
+    all_passed = all(results)
     if all_passed:
-        passed += 1
         print("[Simulated] All vehicles authenticated successfully.\n")
     else:
         print("[Simulated] Some vehicles failed authentication.\n")
+    return all_passed
 
 """Simulated end-to-end test with multiple vehicles (RSU + blockchain)."""
-def test_simulated_end_to_end_multiple_vehicles():
-    global tested, passed
-    tested += 1
+def test_simulated_end_to_end_multiple_vehicles(num_vehicles=3):
     print("\n=== Simulated End-to-End Test: Multiple Vehicles ===")
-    num_vehicles = 3
     vehicles = {}
     rsu_secrets = {}
     for i in range(num_vehicles):
@@ -362,91 +387,59 @@ def test_simulated_end_to_end_multiple_vehicles():
             print(f"Vehicle {vid}: RSU result: {verification_result}, Blockchain outcome: {outcome}")
         all_passed = all_passed and outcome
     if all_passed:
-        passed += 1
         print("[Simulated] All vehicles granted access by infrastructure.\n")
     else:
         print("[Simulated] Some vehicles denied access.\n")
+    return all_passed
 
 """ZoKrates-integrated isolated test with multiple vehicles (dummy.zok)."""
-def test_zokrates_isolated_multiple_vehicles():
-    global tested, passed
-    tested += 1
+def test_zokrates_isolated_multiple_vehicles(num_vehicles=2):
     print("\n=== ZoKrates-Integrated Isolated Test: Multiple Vehicles ===")
     circuit_path = "dummy.zok"
-    num_vehicles = 2
-    all_passed = True
-    for i in range(num_vehicles):
-        a = random.randint(1, 100)
-        b = random.randint(1, 100)
-        if DEBUG_MODE:
+    inputs = [(random.randint(1, 100), random.randint(1, 100)) for _ in range(num_vehicles)]
+    if DEBUG_MODE:
+        for i, (a, b) in enumerate(inputs):
             print(f"Vehicle {i+1}: Inputs a={a}, b={b}")
-        if not run_zokrates_compile(circuit_path):
-            print("[ZoKrates] Compilation failed.")
-            all_passed = False
-            continue
-        if not run_zokrates_setup():
-            print("[ZoKrates] Setup failed.")
-            cleanup_zokrates_files()
-            all_passed = False
-            continue
-        args = [str(a), str(b)]
-        if not run_zokrates_compute_witness(args):
-            print("[ZoKrates] Compute witness failed.")
-            cleanup_zokrates_files()
-            all_passed = False
-            continue
-        if not run_zokrates_generate_proof():
-            print("[ZoKrates] Proof generation failed.")
-            cleanup_zokrates_files()
-            all_passed = False
-            continue
-        verification_result = run_zokrates_verify()
+    # Compile and setup once (cached), then prove every vehicle in its own workspace in parallel
+    results = prove_many(circuit_path, [[a, b] for a, b in inputs], deadline_seconds=ZOKRATES_JOB_DEADLINE)
+    if results is None:
+        print("[ZoKrates] Compilation or setup failed.")
+        print("[ZoKrates] Some vehicles' proofs failed verification.\n")
+        return False
+    all_passed = True
+    for i, result in enumerate(results):
+        if result["error"]:
+            print(f"[ZoKrates] Vehicle {i+1}: {result['error']['summary']}")
         if DEBUG_MODE:
-            print(f"Vehicle {i+1}: ZoKrates verification result: {verification_result}")
-        if not verification_result:
+            print(f"Vehicle {i+1}: ZoKrates verification result: {result['verified']}")
+        if not result["verified"]:
             all_passed = False
-        cleanup_zokrates_files()
     if all_passed:
-        passed += 1
         print("[ZoKrates] All vehicles' proofs verified successfully.\n")
     else:
         print("[ZoKrates] Some vehicles' proofs failed verification.\n")
+    return all_passed
 
 """ZoKrates-integrated end-to-end test with multiple vehicles (dummy.zok + simulated blockchain)."""
-def test_zokrates_end_to_end_multiple_vehicles():
-    global tested, passed
-    tested += 1
+def test_zokrates_end_to_end_multiple_vehicles(num_vehicles=2):
     print("\n=== ZoKrates-Integrated End-to-End Test: Multiple Vehicles ===")
     circuit_path = "dummy.zok"
-    num_vehicles = 2
-    all_passed = True
-    for i in range(num_vehicles):
-        vid = f"ZOKR_VEH{i+1:03d}"
-        a = random.randint(1, 100)
-        b = random.randint(1, 100)
-        if DEBUG_MODE:
+    vids = [f"ZOKR_VEH{i+1:03d}" for i in range(num_vehicles)]
+    inputs = [(random.randint(1, 100), random.randint(1, 100)) for _ in range(num_vehicles)]
+    if DEBUG_MODE:
+        for vid, (a, b) in zip(vids, inputs):
             print(f"Vehicle {vid}: Inputs a={a}, b={b}")
-        if not run_zokrates_compile(circuit_path):
-            print("[ZoKrates] Compilation failed.")
-            all_passed = False
-            continue
-        if not run_zokrates_setup():
-            print("[ZoKrates] Setup failed.")
-            cleanup_zokrates_files()
-            all_passed = False
-            continue
-        args = [str(a), str(b)]
-        if not run_zokrates_compute_witness(args):
-            print("[ZoKrates] Compute witness failed.")
-            cleanup_zokrates_files()
-            all_passed = False
-            continue
-        if not run_zokrates_generate_proof():
-            print("[ZoKrates] Proof generation failed.")
-            cleanup_zokrates_files()
-            all_passed = False
-            continue
-        verification_result = run_zokrates_verify()
+    # Compile and setup once (cached), then prove every vehicle in its own workspace in parallel
+    results = prove_many(circuit_path, [[a, b] for a, b in inputs], deadline_seconds=ZOKRATES_JOB_DEADLINE)
+    if results is None:
+        print("[ZoKrates] Compilation or setup failed.")
+        print("[ZoKrates] Some vehicles failed end-to-end ZoKrates or blockchain verification.\n")
+        return False
+    all_passed = True
+    for vid, (a, b), result in zip(vids, inputs, results):
+        if result["error"]:
+            print(f"[ZoKrates] Vehicle {vid}: {result['error']['summary']}")
+        verification_result = bool(result["verified"])
         if DEBUG_MODE:
             print(f"Vehicle {vid}: ZoKrates verification result: {verification_result}")
         outcome = simulate_blockchain_verification(vid, f"proof_{a}_{b}", int(time.time()), verification_result) if DEBUG_MODE else verification_result
@@ -454,64 +447,165 @@ def test_zokrates_end_to_end_multiple_vehicles():
             print(f"Vehicle {vid}: Blockchain outcome: {outcome}")
         if not (verification_result and outcome):
             all_passed = False
-        cleanup_zokrates_files()
     if all_passed:
-        passed += 1
         print("[ZoKrates] All vehicles' end-to-end proofs and blockchain logs succeeded.\n")
     else:
         print("[ZoKrates] Some vehicles failed end-to-end ZoKrates or blockchain verification.\n")
+    return all_passed
+
+
+"""
+Scenario registry
+
+Every test/scenario above returns True when it passes. SCENARIOS lists them with a short name and tags, in the
+order the full run reports them; tags are used to select groups of scenarios (e.g. "simulated", "zokrates").
+Scenarios tagged "multi" take the number of vehicles as their num_vehicles argument.
+Scenarios tagged "zokrates" shell out to the ZoKrates CLI and are run one at a time; the rest are independent
+and run concurrently in a process pool.
+"""
+SCENARIOS = [
+    Scenario("simulated-multi-isolated", test_simulated_isolated_multiple_vehicles, ("simulated", "multi")),
+    Scenario("simulated-multi-e2e", test_simulated_end_to_end_multiple_vehicles, ("simulated", "multi", "blockchain")),
+    Scenario("zokrates-multi-isolated", test_zokrates_isolated_multiple_vehicles, ("zokrates", "multi")),
+    Scenario("zokrates-multi-e2e", test_zokrates_end_to_end_multiple_vehicles, ("zokrates", "multi", "blockchain")),
+    Scenario("zokrates-connection", test_zokrates_connection, ("zokrates",)),
+    Scenario("zokrates-dummy-e2e", test_vehicle_rsu_interaction_real_zokrates_dummy, ("zokrates",)),
+    Scenario("simulated-zkp", test_vehicle_rsu_interaction_simulated, ("simulated",)),
+    Scenario("simulated-blockchain", test_vehicle_rsu_blockchain_simulated, ("simulated", "blockchain")),
+    Scenario("scenario-success", scenario_successful_authentication, ("simulated", "scenario", "blockchain")),
+    Scenario("scenario-failure", scenario_failed_authentication, ("simulated", "scenario", "blockchain")),
+]
+SCENARIOS_BY_NAME = {scenario.name: scenario for scenario in SCENARIOS}
+
+
+"""
+Function: select_scenarios
 
+Pick scenarios by name and/or tag, keeping registry order.
 
+Args:
+    names (list of str, optional): Scenario names to include.
+    tags (list of str, optional): Include scenarios carrying any of these tags.
+    If neither is given, every scenario is selected.
+
+Returns:
+    list of Scenario
+
+Raises:
+    ValueError: If a name or tag matches nothing.
 """
-Run all test and scenario functions and print summary statistics.
+def select_scenarios(names=None, tags=None):
+    if not names and not tags:
+        return list(SCENARIOS)
+    unknown = [name for name in names or [] if name not in SCENARIOS_BY_NAME]
+    unknown += [tag for tag in tags or [] if not any(tag in scenario.tags for scenario in SCENARIOS)]
+    if unknown:
+        raise ValueError(f"Unknown scenario name(s) or tag(s): {', '.join(unknown)}")
+    return [
+        scenario for scenario in SCENARIOS
+        if scenario.name in (names or []) or any(tag in scenario.tags for tag in tags or [])
+    ]
+
+
 """
-def testAndScenarioRunner():
+Function: run_scenario
 
-    test_simulated_isolated_multiple_vehicles()
-    time.sleep(1)
-    # clear_console()
+Run one scenario by name, capturing its output and timing it. Top-level so it can run in a worker process.
 
-    test_simulated_end_to_end_multiple_vehicles()
-    time.sleep(1)
-    # clear_console()
+Args:
+    name (str): Scenario name from SCENARIOS.
+    debug (bool): Debug mode for this run (passed explicitly so worker processes match the parent).
+    fleet_size (int, optional): Number of vehicles for "multi" scenarios (default: the scenario's own default).
 
-    test_zokrates_isolated_multiple_vehicles()
-    time.sleep(1)
-    # clear_console()
+Returns:
+    ScenarioResult: Outcome, elapsed time, captured output and any exception raised.
+"""
+def run_scenario(name, debug=False, fleet_size=None):
+    scenario = SCENARIOS_BY_NAME[name]
+    kwargs = {"num_vehicles": fleet_size} if fleet_size and "multi" in scenario.tags else {}
+    set_debug_mode(debug)
+    output = io.StringIO()
+    error = None
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        try:
+            ok = bool(scenario.function(**kwargs))
+        except Exception as e:
+            ok = False
+            error = f"{type(e).__name__}: {e}"
+    return ScenarioResult(name, scenario.tags, ok, time.perf_counter() - start, output.getvalue(), error)
+
+
+"""
+Function: run_scenarios
 
-    test_zokrates_end_to_end_multiple_vehicles()
-    time.sleep(1)
-    # clear_console()
+Run the selected scenarios: simulated ones concurrently in a process pool, ZoKrates ones one at a time in this
+process while the pool works.
 
-    test_zokrates_connection()
-    time.sleep(1)
-    # clear_console()
+Args:
+    names (list of str, optional): Scenario names to run.
+    tags (list of str, optional): Tags selecting scenarios to run.
+    max_workers (int, optional): Worker processes for simulated scenarios (default os.cpu_count()).
+    fleet_size (int, optional): Number of vehicles for "multi" scenarios.
+    on_result (callable, optional): Called with each ScenarioResult as soon as it is available.
 
-    test_vehicle_rsu_interaction_real_zokrates_dummy()
-    time.sleep(1)
-    # clear_console()
+Returns:
+    list of ScenarioResult: In registry order.
+"""
+def run_scenarios(names=None, tags=None, max_workers=None, on_result=None, fleet_size=None):
+    selected = select_scenarios(names, tags)
+    isolated = [scenario.name for scenario in selected if "zokrates" in scenario.tags]
+    concurrent = [scenario.name for scenario in selected if "zokrates" not in scenario.tags]
+    results = {}
+
+    def record(result):
+        results[result.name] = result
+        if on_result:
+            on_result(result)
+
+    workers = min(max_workers or os.cpu_count() or 1, len(concurrent))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_scenario, name, DEBUG_MODE, fleet_size) for name in concurrent]
+            for name in isolated:
+                record(run_scenario(name, DEBUG_MODE, fleet_size))
+            for future in as_completed(futures):
+                record(future.result())
+    else:
+        for name in isolated + concurrent:
+            record(run_scenario(name, DEBUG_MODE, fleet_size))
+    set_debug_mode(DEBUG_MODE)      # run_scenario may have been called in this process
+    return [results[scenario.name] for scenario in selected]
 
-    test_vehicle_rsu_interaction_simulated()
-    time.sleep(1)
-    # clear_console()
 
-    test_vehicle_rsu_blockchain_simulated()
-    time.sleep(1)
-    # clear_console()
+"""
+Run the selected tests and scenarios (all by default) and print each one's output, timing and a summary.
 
-    scenario_successful_authentication()
-    time.sleep(1)
-    # clear_console()
+Args:
+    names (list of str, optional): Scenario names to run.
+    tags (list of str, optional): Tags selecting scenarios to run.
+    max_workers (int, optional): Worker processes for simulated scenarios.
 
-    scenario_failed_authentication()
-    time.sleep(1)
-    # clear_console()
-    
-    print(f"\nTotal tests run: {tested}")
+Returns:
+    list of ScenarioResult
+"""
+def testAndScenarioRunner(names=None, tags=None, max_workers=None):
+    start = time.perf_counter()
+    results = run_scenarios(names, tags, max_workers)
+    for result in results:
+        print(result.output, end="")
+        if result.error:
+            print(f"[{result.name}] Raised {result.error}")
+    print("\nScenario timings:")
+    for result in results:
+        print(f"  {'PASS' if result.passed else 'FAIL'}  {result.name:<26} {result.elapsed:7.2f}s")
+    passed = sum(result.passed for result in results)
+    print(f"\nTotal tests run: {len(results)}")
     print(f"Total tests passed: {passed}")
-    print(f"Total tests failed: {tested - passed}")
+    print(f"Total tests failed: {len(results) - passed}")
+    print(f"Total time: {time.perf_counter() - start:.2f}s")
     print()
-    time.sleep(3)
+    return results
 
 if __name__ == "__main__":
-    testAndScenarioRunner()
\ No newline at end of file
+    testAndScenarioRunner()
@@ -0,0 +1,216 @@
+"""
+pseudonyms.py
+
+Purpose:
+    Provides PseudonymService, which replaces the fixed sha256(vehicle_id) used in ledger events with keyed
+    pseudonyms that rotate every epoch, so events from different epochs cannot be linked by anyone without the
+    master key, and logging an event costs a table lookup instead of a hash.
+
+Methodology:
+    - Each epoch (timestamp // epoch_length) gets its own key, HMAC-SHA256(master_key, "epoch" || epoch).
+    - A vehicle's pseudonym for an epoch is HMAC-SHA256(epoch_key, vehicle_id), hex-encoded (64 chars, the same
+      shape as the old vehicle hash, so it still fits the contract's bytes32).
+    - At epoch start the whole registry's pseudonyms are derived in one batch (the keyed HMAC state is computed
+      once and copied per vehicle) into a dictionary table.
+    - Only the most recent max_epochs tables are kept (current plus previous by default, for events that straddle
+      a boundary), so memory is bounded by max_epochs x registry size. The next epoch's table can be prepared
+      ahead of the boundary by tick().
+    - Tables are only built for epochs within one of the service clock's epoch, so an event with a far-future
+      timestamp cannot evict the live tables. Anything else (other epochs, vehicles missing from a table) is
+      derived on demand from an LRU cache of keyed epoch states and never added to the tables.
+"""
+
+import hashlib
+import hmac
+import secrets
+import time
+from collections import OrderedDict
+
+DEFAULT_EPOCH_LENGTH = 3600         # Seconds per pseudonym epoch
+DEFAULT_MAX_EPOCHS = 2              # Tables kept in memory (current + previous)
+DEFAULT_LEAD_TIME = 60              # Seconds before an epoch boundary to prepare the next table
+EPOCH_KEY_CACHE_SIZE = 16           # Keyed epoch HMAC states kept for on-demand derivation
+
+
+"""
+PseudonymService Class
+
+Per-epoch keyed pseudonyms for every registered vehicle, served from precomputed tables.
+
+Functionality:
+    - pseudonym(vehicle_id, timestamp) returns the vehicle's pseudonym for the timestamp's epoch.
+    - tick(now) builds the current epoch's table (and the next one shortly before the boundary) and evicts old ones.
+    - Vehicles missing from a table (enrolled mid-epoch) and timestamps from other epochs are derived on demand.
+
+Usage:
+    pseudonyms = PseudonymService(vehicle_secrets)
+    simulate_blockchain_verification(vehicle_id, zkp_proof, timestamp, result, pseudonyms=pseudonyms)
+
+Args:
+    vehicle_ids (iterable or mapping): Registered vehicle IDs, or a vehicle_id -> secret mapping
+                                       (dict or VehicleRegistry); re-read whenever an epoch table is built.
+    master_key (bytes, optional): Secret the epoch keys are derived from (default: random per service).
+    epoch_length (int): Seconds per epoch (default DEFAULT_EPOCH_LENGTH).
+    max_epochs (int): Epoch tables kept in memory (default DEFAULT_MAX_EPOCHS).
+    lead_time (int): Seconds before a boundary at which tick() prepares the next epoch (default DEFAULT_LEAD_TIME).
+    clock (callable): Time source deciding which epochs may get a table (default time.time).
+"""
+class PseudonymService:
+
+    def __init__(self, vehicle_ids, master_key=None, epoch_length=DEFAULT_EPOCH_LENGTH,
+                 max_epochs=DEFAULT_MAX_EPOCHS, lead_time=DEFAULT_LEAD_TIME, clock=time.time):
+        if max_epochs < 1:
+            raise ValueError("max_epochs must be at least 1")
+        self.vehicle_ids = vehicle_ids
+        self.master_key = master_key or secrets.token_bytes(32)
+        self.epoch_length = epoch_length
+        self.max_epochs = max_epochs
+        self.lead_time = lead_time
+        self.clock = clock
+        self._tables = OrderedDict()        # epoch -> {vehicle_id: pseudonym}, oldest first
+        self._epoch_keys = OrderedDict()    # epoch -> keyed HMAC state, least recently used first
+        self.tables_built = 0
+        self.misses = 0                     # Pseudonyms derived on demand instead of looked up
+
+
+    """
+    Function: epoch_of
+
+    Epoch number of a Unix timestamp.
+    """
+    def epoch_of(self, timestamp):
+        return int(timestamp) // self.epoch_length
+
+
+    """
+    Function: _keyed_hmac
+
+    HMAC-SHA256 state keyed with an epoch's key, ready to be copied per vehicle (callers must copy, not update it).
+    The last EPOCH_KEY_CACHE_SIZE states are cached, so deriving one pseudonym costs one HMAC, not two.
+    """
+    def _keyed_hmac(self, epoch):
+        keyed = self._epoch_keys.get(epoch)
+        if keyed is not None:
+            self._epoch_keys.move_to_end(epoch)
+            return keyed
+        epoch_key = hmac.new(self.master_key, b"epoch" + epoch.to_bytes(8, "big", signed=True), hashlib.sha256).digest()
+        keyed = self._epoch_keys[epoch] = hmac.new(epoch_key, digestmod=hashlib.sha256)
+        while len(self._epoch_keys) > EPOCH_KEY_CACHE_SIZE:
+            self._epoch_keys.popitem(last=False)
+        return keyed
+
+
+    """
+    Function: _registered_ids
+
+    Current list of registered vehicle IDs.
+    """
+    def _registered_ids(self):
+        source = self.vehicle_ids
+        return source.keys() if hasattr(source, "keys") else source
+
+
+    """
+    Function: build_epoch
+
+    Derive the pseudonym table for one epoch in a single batch and keep it, evicting the oldest beyond max_epochs.
+
+    Returns:
+        dict: vehicle_id -> pseudonym for the epoch.
+    """
+    def build_epoch(self, epoch):
+        keyed = self._keyed_hmac(epoch)
+        table = {}
+        for vehicle_id in self._registered_ids():
+            state = keyed.copy()
+            state.update(vehicle_id.encode())
+            table[vehicle_id] = state.hexdigest()
+        self._tables[epoch] = table
+        self._tables.move_to_end(epoch)
+        while len(self._tables) > self.max_epochs:
+            self._tables.popitem(last=False)
+        self.tables_built += 1
+        return table
+
+
+    """
+    Function: tick
+
+    Make sure the current epoch's table exists and, near the end of the epoch, prepare the next one.
+
+    Args:
+        now (float, optional): Current Unix time (default: the service clock).
+    """
+    def tick(self, now=None):
+        now = self.clock() if now is None else now
+        epoch = self.epoch_of(now)
+        if epoch not in self._tables:
+            self.build_epoch(epoch)
+        if (epoch + 1) * self.epoch_length - now <= self.lead_time and epoch + 1 not in self._tables:
+            self.build_epoch(epoch + 1)
+
+
+    """
+    Function: pseudonym
+
+    Return a vehicle's pseudonym for the epoch containing `timestamp`.
+
+    Steps:
+    1. Look the vehicle up in the epoch's table, building the table if this is a new epoch within one epoch of
+       the service clock
+    2. Otherwise (any other epoch, or a vehicle enrolled after the table was built) derive the single pseudonym
+       from the cached epoch key, without adding it to a table
+    """
+    def pseudonym(self, vehicle_id, timestamp):
+        epoch = self.epoch_of(timestamp)
+        table = self._tables.get(epoch)
+        if (table is None and abs(epoch - self.epoch_of(self.clock())) <= 1
+                and (not self._tables or epoch > next(reversed(self._tables)))):
+            table = self.build_epoch(epoch)
+        if table is not None:
+            value = table.get(vehicle_id)
+            if value is not None:
+                return value
+        self.misses += 1
+        state = self._keyed_hmac(epoch).copy()
+        state.update(vehicle_id.encode())
+        return state.hexdigest()
+
+
+    """
+    Function: stats
+
+    Return the kept epochs and lookup counters.
+    """
+    def stats(self):
+        return {
+            "epochs": list(self._tables),
+            "entries": sum(len(table) for table in self._tables.values()),
+            "tables_built": self.tables_built,
+            "misses": self.misses,
+        }
+
+
+if __name__ == "__main__":
+    # Simple test: build an epoch table, compare lookups with per-event hashing, rotate, and check memory stays bounded
+    vehicle_ids = [f"VEH{i:06d}" for i in range(100_000)]
+    now = 1_700_000_000
+    service = PseudonymService(vehicle_ids, epoch_length=3600, clock=lambda: now)
+    start = time.perf_counter()
+    service.tick(now)
+    print(f"[Pseudonyms] Built table for {len(vehicle_ids)} vehicles in {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    for vehicle_id in vehicle_ids:
+        service.pseudonym(vehicle_id, now)
+    print(f"[Pseudonyms] {len(vehicle_ids)} lookups in {time.perf_counter() - start:.3f}s")
+    start = time.perf_counter()
+    for vehicle_id in vehicle_ids:
+        hashlib.sha256(vehicle_id.encode()).hexdigest()
+    print(f"[Pseudonyms] {len(vehicle_ids)} sha256 hashes in {time.perf_counter() - start:.3f}s")
+    print(f"[Pseudonyms] Same vehicle, next epoch differs: "
+          f"{service.pseudonym('VEH000001', now) != service.pseudonym('VEH000001', now + 3600)}")
+    service.pseudonym("VEH000001", now + 10 * 3600)
+    print(f"[Pseudonyms] Far-future lookup built no table: {service.stats()['epochs']}")
+    now += 7200
+    service.tick()
+    print(f"[Pseudonyms] Stats after rotating: {service.stats()}")
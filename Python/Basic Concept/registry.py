@@ -0,0 +1,381 @@
+"""
+registry.py
+
+Purpose:
+    Provides VehicleRegistry, a compact vehicle credential store for RSUs: vehicle IDs and secrets live in a sorted,
+    fixed-width binary file that is memory-mapped read-only, so every RSU process on a host shares one copy through
+    the OS page cache instead of each holding a dict of Python strings.
+
+Methodology:
+    - File layout: a 24-byte header (magic, ID width, secret size, record count) followed by records of
+      [vehicle ID, NUL-padded to the ID width][raw secret bytes], sorted by ID.
+    - Lookups binary-search the mapped records (O(log n), no per-vehicle Python objects).
+    - Newly enrolled vehicles are appended to an update log (<registry>.log): a 16-byte header (magic, generation)
+      followed by records in the same format. The log is loaded into a small in-memory overlay and can later be
+      merged into the main file with compact().
+    - Appends and compaction hold an exclusive flock on <registry>.lock, and refresh() a shared one, so a reader
+      never sees a half-compacted registry. compact() replaces the log with an empty one of the next generation;
+      a process whose refresh() sees a new generation remaps the main file and rebuilds its overlay instead of
+      reading the new log from a stale offset. (Without fcntl, e.g. on Windows, no locks are taken.)
+    - Implements the read side of the dict interface (get, [], in, len, items), so it can be passed to RSU in
+      place of a vehicle_secrets dict.
+"""
+
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:                     # Windows: no advisory locks
+    fcntl = None
+
+MAGIC = b"VREG1\0\0\0"
+HEADER = struct.Struct("<8sIIQ")        # magic, id_width, secret_size, count
+LOG_MAGIC = b"VREGLOG1"
+LOG_HEADER = struct.Struct("<8sQ")      # magic, generation
+DEFAULT_ID_WIDTH = 32
+DEFAULT_SECRET_SIZE = 16
+
+
+"""
+Function: _encode_record
+
+Pack one (vehicle_id, hex secret) pair into a fixed-width record.
+
+Raises:
+    ValueError: If the ID is too long or the secret has the wrong size.
+"""
+def _encode_record(vehicle_id, secret_hex, id_width, secret_size):
+    encoded_id = vehicle_id.encode()
+    secret = bytes.fromhex(secret_hex)
+    if len(encoded_id) > id_width or b"\0" in encoded_id:
+        raise ValueError(f"Vehicle ID {vehicle_id!r} does not fit in {id_width} bytes")
+    if len(secret) != secret_size:
+        raise ValueError(f"Secret for {vehicle_id!r} must be {secret_size} bytes")
+    return encoded_id.ljust(id_width, b"\0") + secret
+
+
+"""
+Function: build_registry
+
+Write a registry file from vehicle_id -> hex secret pairs.
+
+Args:
+    path (str): Output registry file path (written atomically).
+    items (iterable of tuple): (vehicle_id, hex secret) pairs, e.g. fleet.secrets_dict().items().
+    id_width (int): Fixed width of the ID field in bytes (default DEFAULT_ID_WIDTH).
+    secret_size (int): Secret size in bytes (default DEFAULT_SECRET_SIZE).
+
+Returns:
+    int: Number of records written.
+"""
+def build_registry(path, items, id_width=DEFAULT_ID_WIDTH, secret_size=DEFAULT_SECRET_SIZE):
+    records = sorted(_encode_record(vehicle_id, secret_hex, id_width, secret_size)
+                     for vehicle_id, secret_hex in items)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, id_width, secret_size, len(records)))
+        f.writelines(records)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return len(records)
+
+
+"""
+VehicleRegistry Class
+
+Read-only, memory-mapped vehicle credential registry with an append-only enrollment log.
+
+Functionality:
+    - get(vehicle_id) returns the hex secret (as the RSU expects) or None.
+    - enroll(vehicle_id, secret_hex) appends to the update log; refresh() picks up entries other processes appended
+      and remaps the main file after another process compacted it.
+    - compact() merges the log into a new sorted file and starts a new, empty log generation.
+
+Usage:
+    build_registry("vehicles.reg", fleet.secrets_dict().items())
+    registry = VehicleRegistry("vehicles.reg")
+    rsu = RSU(registry, precompute=False)
+
+Args:
+    path (str): Registry file path (created by build_registry).
+"""
+class VehicleRegistry:
+
+    def __init__(self, path):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self.lock_path = f"{path}.lock"
+        self._file = None
+        self._map = None
+        self._overlay = {}                  # vehicle_id -> hex secret from the update log
+        self._log_offset = LOG_HEADER.size  # Bytes of the update log already applied
+        self._log_generation = 0            # Generation of the log the overlay was read from
+        with self._locked(shared=True):
+            self._open_main()
+            self._refresh_locked()
+
+
+    """
+    Function: _locked
+
+    Context manager holding an flock on the registry's lock file (shared for readers, exclusive for writers).
+    """
+    @contextmanager
+    def _locked(self, shared=False):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)                    # Closing the descriptor releases the lock
+
+
+    """
+    Function: _open_main
+
+    Map the main registry file and read its header.
+    """
+    def _open_main(self):
+        self.close()
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.id_width, self.secret_size, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a vehicle registry file")
+        self._record_size = self.id_width + self.secret_size
+        expected_size = HEADER.size + self._count * self._record_size
+        if len(self._map) < expected_size:
+            raise ValueError(f"{self.path} is truncated")
+
+
+    """
+    Function: close
+
+    Release the memory map and file handle.
+    """
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+    """
+    Function: _id_at
+
+    Return the padded ID bytes of record `index` in the main file.
+    """
+    def _id_at(self, index):
+        start = HEADER.size + index * self._record_size
+        return self._map[start:start + self.id_width]
+
+
+    """
+    Function: _lookup_main
+
+    Binary-search the main file for a vehicle ID.
+
+    Returns:
+        str or None: Hex secret, or None if the ID is not in the main file.
+    """
+    def _lookup_main(self, vehicle_id):
+        key = vehicle_id.encode()
+        if len(key) > self.id_width:
+            return None
+        key = key.ljust(self.id_width, b"\0")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._id_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._id_at(low) == key:
+            start = HEADER.size + low * self._record_size + self.id_width
+            return self._map[start:start + self.secret_size].hex()
+        return None
+
+
+    """
+    Function: get
+
+    Return the hex secret for a vehicle, checking recent enrollments first.
+
+    Args:
+        vehicle_id (str): The vehicle's unique identifier.
+        default: Value returned for unknown vehicles (default None).
+    """
+    def get(self, vehicle_id, default=None):
+        secret = self._overlay.get(vehicle_id)
+        if secret is None:
+            secret = self._lookup_main(vehicle_id)
+        return default if secret is None else secret
+
+
+    def __getitem__(self, vehicle_id):
+        secret = self.get(vehicle_id)
+        if secret is None:
+            raise KeyError(vehicle_id)
+        return secret
+
+
+    def __setitem__(self, vehicle_id, secret_hex):
+        self.enroll(vehicle_id, secret_hex)
+
+
+    def __contains__(self, vehicle_id):
+        return self.get(vehicle_id) is not None
+
+
+    def __len__(self):
+        return self._count + sum(1 for vehicle_id in self._overlay if self._lookup_main(vehicle_id) is None)
+
+
+    """
+    Function: items
+
+    Iterate over (vehicle_id, hex secret) pairs, with update-log entries overriding the main file.
+    """
+    def items(self):
+        for index in range(self._count):
+            vehicle_id = self._id_at(index).rstrip(b"\0").decode()
+            if vehicle_id not in self._overlay:
+                start = HEADER.size + index * self._record_size + self.id_width
+                yield vehicle_id, self._map[start:start + self.secret_size].hex()
+        yield from self._overlay.items()
+
+
+    def keys(self):
+        return (vehicle_id for vehicle_id, _secret in self.items())
+
+
+    """
+    Function: enroll
+
+    Register a new vehicle (or re-key an existing one) by appending to the update log.
+
+    Args:
+        vehicle_id (str): The vehicle's unique identifier.
+        secret_hex (str): The vehicle's secret as a hex string.
+        sync (bool): fsync the log after writing (default True) so the enrollment survives a crash.
+    """
+    def enroll(self, vehicle_id, secret_hex, sync=True):
+        record = _encode_record(vehicle_id, secret_hex, self.id_width, self.secret_size)
+        with self._locked():
+            self._refresh_locked()          # Remap first if another process compacted since our last refresh
+            with open(self.log_path, "ab") as f:
+                if f.tell() == 0:
+                    f.write(LOG_HEADER.pack(LOG_MAGIC, self._log_generation))
+                f.write(record)
+                f.flush()
+                if sync:
+                    os.fsync(f.fileno())
+            self._refresh_locked()
+
+
+    """
+    Function: refresh
+
+    Apply update-log records appended since the last refresh (including those written by other processes),
+    remapping the main file first if the log belongs to a newer generation.
+    """
+    def refresh(self):
+        with self._locked(shared=True):
+            self._refresh_locked()
+
+
+    """
+    Function: _refresh_locked
+
+    refresh() body; the caller holds the registry lock.
+
+    Raises:
+        ValueError: If the update log has a bad header.
+    """
+    def _refresh_locked(self):
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, "rb") as f:
+            header = f.read(LOG_HEADER.size)
+            if not header:
+                return
+            magic, generation = LOG_HEADER.unpack(header)
+            if magic != LOG_MAGIC:
+                raise ValueError(f"{self.log_path} is not a vehicle registry update log")
+            if generation != self._log_generation:
+                self._open_main()           # Compacted by another process: the main file was replaced too
+                self._overlay = {}
+                self._log_offset = LOG_HEADER.size
+                self._log_generation = generation
+            f.seek(self._log_offset)
+            data = f.read()
+        complete = len(data) - len(data) % self._record_size      # Ignore a partially written trailing record
+        for start in range(0, complete, self._record_size):
+            record = data[start:start + self._record_size]
+            vehicle_id = record[:self.id_width].rstrip(b"\0").decode()
+            self._overlay[vehicle_id] = record[self.id_width:].hex()
+        self._log_offset += complete
+
+
+    """
+    Function: compact
+
+    Merge the update log into a new sorted registry file, then start an empty log of the next generation and remap.
+    Other processes remap the new file on their next refresh() or enroll().
+
+    Steps:
+    1. Take the exclusive lock and apply any records other processes appended
+    2. Write the merged registry atomically
+    3. Atomically replace the log with an empty one carrying generation + 1
+    """
+    def compact(self):
+        with self._locked():
+            self._refresh_locked()
+            build_registry(self.path, list(self.items()), self.id_width, self.secret_size)
+            generation = self._log_generation + 1
+            temp_path = f"{self.log_path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(LOG_HEADER.pack(LOG_MAGIC, generation))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.log_path)
+            self._overlay = {}
+            self._log_offset = LOG_HEADER.size
+            self._log_generation = generation
+            self._open_main()
+
+
+if __name__ == "__main__":
+    # Simple test: build a registry from a fleet, verify through an RSU, enroll a new vehicle, compact
+    import tempfile
+    import time
+    from fleet import Fleet
+    from rsu import RSU
+
+    fleet = Fleet.random(10_000)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "vehicles.reg")
+        build_registry(path, fleet.secrets_dict().items())
+        registry = VehicleRegistry(path)
+        rsu = RSU(registry, precompute=False)
+        print(f"[Registry] {len(registry)} vehicles, file size {os.path.getsize(path)} bytes")
+        print(f"[Registry] Fleet verified: {all(rsu.verify_batch(fleet.auth_requests(int(time.time()))))}")
+        registry.enroll("NEWVEH", "00" * DEFAULT_SECRET_SIZE)
+        print(f"[Registry] Enrolled vehicle found: {'NEWVEH' in registry}, total {len(registry)}")
+        other = VehicleRegistry(path)       # Stands in for another RSU process mapping the same registry
+        registry.compact()
+        registry.enroll("NEWVEH2", "11" * DEFAULT_SECRET_SIZE)
+        print(f"[Registry] After compaction: {len(registry)} vehicles, NEWVEH -> {registry.get('NEWVEH')}")
+        other.refresh()
+        print(f"[Registry] Other process after refresh: {len(other)} vehicles, NEWVEH2 -> {other.get('NEWVEH2')}")
+        other.close()
+        registry.close()
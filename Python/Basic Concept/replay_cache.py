@@ -0,0 +1,129 @@
+"""
+replay_cache.py
+
+Purpose:
+    Provides ReplayCache, a bounded record of recently accepted authentications, so an RSU can reject a replayed
+    (vehicle_id, timestamp) proof with a single set lookup instead of re-hashing it.
+
+Methodology:
+    - Accepted entries are filed in one bucket per second of the OTP acceptance window, in a ring of
+      (2 * window + 1) buckets indexed by timestamp modulo the ring size.
+    - When the window moves forward, each bucket that falls out of it is replaced by an empty one, dropping that
+      whole second at once; memory therefore scales with arrivals per window, not with total history.
+    - Timestamps outside the current window are never stored (the RSU rejects them before they get here).
+    - Hit, insert and eviction counters are kept for monitoring replay floods.
+"""
+
+
+"""
+ReplayCache Class
+
+Time-bucketed ring of recently accepted authentication keys.
+
+Functionality:
+    - advance(now) moves the window to [now - window, now + window], dropping expired seconds.
+    - seen(timestamp, key) reports whether the key was already accepted for that second (counted as a hit).
+    - add(timestamp, key) records an accepted key; returns False if it was already present or out of window.
+    - stats() returns the counters and current size.
+
+Usage:
+    cache = ReplayCache(OTP_WINDOW)
+    cache.advance(now)
+    if not cache.seen(timestamp, vehicle_id) and proof_is_valid:
+        cache.add(timestamp, vehicle_id)
+
+Args:
+    window (int): OTP acceptance window in seconds on either side of the current time.
+"""
+class ReplayCache:
+
+    def __init__(self, window):
+        self.window = window
+        self.size = 2 * window + 1
+        self._buckets = [set() for _ in range(self.size)]      # Accepted keys, one set per second
+        self._bucket_times = [None] * self.size                 # Second each bucket currently holds
+        self._high = None                                       # Newest second in the window
+        self.hits = 0
+        self.inserts = 0
+        self.evictions = 0
+
+
+    """
+    Function: advance
+
+    Move the window forward so it ends at now + window, replacing every bucket that left it.
+
+    Args:
+        now (int): Current Unix time in whole seconds.
+    """
+    def advance(self, now):
+        high = now + self.window
+        if self._high is not None and high <= self._high:
+            return
+        first_new = high - self.size + 1 if self._high is None else max(self._high + 1, high - self.size + 1)
+        for timestamp in range(first_new, high + 1):
+            index = timestamp % self.size
+            self.evictions += len(self._buckets[index])
+            self._buckets[index] = set()                        # Drop the expired second in one step
+            self._bucket_times[index] = timestamp
+        self._high = high
+
+
+    """
+    Function: seen
+
+    Check whether a key was already accepted for a timestamp in the current window.
+
+    Args:
+        timestamp (int): The timestamp the authentication was made for.
+        key (hashable): Identity of the authentication (e.g. the vehicle ID).
+
+    Returns:
+        bool: True if this is a replay.
+    """
+    def seen(self, timestamp, key):
+        index = timestamp % self.size
+        if self._bucket_times[index] == timestamp and key in self._buckets[index]:
+            self.hits += 1
+            return True
+        return False
+
+
+    """
+    Function: add
+
+    Record an accepted key for a timestamp.
+
+    Returns:
+        bool: True if the key was recorded, False if it was already present or the timestamp is outside the window.
+    """
+    def add(self, timestamp, key):
+        index = timestamp % self.size
+        bucket = self._buckets[index]
+        if self._bucket_times[index] != timestamp or key in bucket:
+            return False
+        bucket.add(key)
+        self.inserts += 1
+        return True
+
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets)
+
+
+    """
+    Function: stats
+
+    Return the cache counters and current number of stored keys.
+    """
+    def stats(self):
+        return {"hits": self.hits, "inserts": self.inserts, "evictions": self.evictions, "size": len(self)}
+
+
+if __name__ == "__main__":
+    # Simple test: a repeated key is caught until its second leaves the window
+    cache = ReplayCache(window=2)
+    cache.advance(100)
+    print(f"[ReplayCache] First add: {cache.add(100, 'VEH001')}, replay seen: {cache.seen(100, 'VEH001')}")
+    cache.advance(103)
+    print(f"[ReplayCache] After window moved: seen={cache.seen(100, 'VEH001')} stats={cache.stats()}")
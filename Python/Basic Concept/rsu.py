@@ -8,10 +8,33 @@ Methodology:
     - The RSU is initialized with a mapping of vehicle IDs to their secrets.
     - Upon receiving a ZKP, the RSU reconstructs the expected OTP and ZKP using the stored secret and provided timestamp.
     - The RSU compares the received ZKP to the expected value to determine authentication success.
+    - Timestamps must fall inside a configurable acceptance window. Optionally, expected proofs for the window are
+      precomputed and rolled forward each second by a background ticker (or the caller's own loop), never on the
+      request path. Each tick builds the next window from a snapshot of the registry and swaps it in whole;
+      vehicles registered while it builds are patched in before the swap, so they are never missing or stale.
+    - Accepted authentications are remembered for the acceptance window, so a replayed proof is rejected with
+      a set lookup (see replay_cache.py).
+    - Bursts of requests can be verified together with verify_batch. Real Groth16 proofs are only checked when a
+      verifier is passed in; they share their pairing work through randomized batch verification. Use the
+      verifier's native backend on the request path (a few milliseconds per proof); the py_ecc backend costs
+      hundreds of milliseconds per proof (see groth16_verifier.py). A real proof is only checked if its public
+      inputs are the OTP and timestamp the RSU derives for the requesting vehicle, so a valid proof cannot be
+      replayed under another vehicle ID or timestamp.
 """
 
-from otp import generate_otp
-from zkp import generate_zkp_proof
+import hmac
+import threading
+import time
+
+from otp import generate_otp_at
+from replay_cache import ReplayCache
+from zkp import generate_zkp_proof, public_inputs_match
+
+
+# Accept OTP timestamps up to this many seconds before or after the RSU's clock
+OTP_WINDOW = 30
+# Seconds between window roll-forwards of the background ticker
+TICK_INTERVAL = 1.0
 
 
 """
@@ -24,14 +47,30 @@ Represents a roadside infrastructure unit responsible for authenticating vehicle
 Functionality:
     - Initialized with a mapping of vehicle IDs to their corresponding secrets.
     - Upon receiving a ZKP proof, reconstructs the expected OTP and ZKP using the stored secret and provided timestamp.
-    - Compares the received ZKP to the expected value to determine authentication success.
+    - Rejects timestamps outside the acceptance window around the RSU's clock.
+    - With precompute enabled, keeps the expected proofs for every registered vehicle and every second of the current
+      window, so verification is a dictionary lookup plus a constant-time compare. The window is rolled forward by
+      tick(), called from start_ticker()'s background thread or the caller's own loop; a request never pays for it
+      and falls back to computing its proof when the window has not caught up.
+    - Rejects replays: each vehicle authenticates at most once per timestamp within the window.
     
 Usage:
     rsu = RSU(vehicle_secrets)
     is_valid = rsu.verify_zkp(vehicle_id, zkp_proof, timestamp)
+
+    rsu = RSU(vehicle_secrets, precompute=True)
+    rsu.start_ticker()                  # Window upkeep in the background; rsu.stop_ticker() when done
     
 Args:
-    vehicle_secrets (dict): Mapping from vehicle_id (str) to secret (str).
+    vehicle_secrets (dict): Mapping from vehicle_id (str) to secret (str), or a registry.VehicleRegistry.
+    groth16_verifier (Groth16Verifier, optional): Verifier for real ZoKrates proofs passed to verify_batch (default
+                                                  None: real proofs are rejected). Use its native backend; the
+                                                  py_ecc one is slow (see groth16_verifier.py).
+    otp_window (int): Acceptance window in seconds on either side of the RSU's clock (default OTP_WINDOW).
+    precompute (bool): Keep expected proofs precomputed for the window (default False). Needs (2 * otp_window + 1)
+                       hashes per vehicle in memory and a tick() every second to stay current.
+    clock (callable): Returns the current Unix time (default time.time).
+    replay_protection (bool): Reject repeated (vehicle_id, timestamp) authentications (default True).
 """
 class RSU:
     
@@ -42,10 +81,135 @@ class RSU:
     
     Args:
         vehicle_secrets (dict): Mapping from vehicle_id to secret.
+        groth16_verifier (Groth16Verifier, optional): In-process verifier for proof.json-format proofs.
+        otp_window (int): Acceptance window in seconds on either side of the RSU's clock.
+        precompute (bool): Whether to precompute expected proofs for the window.
+        clock (callable): Returns the current Unix time.
+        replay_protection (bool): Whether to keep a replay cache for the window.
     """
-    def __init__(self, vehicle_secrets):
+    def __init__(self, vehicle_secrets, groth16_verifier=None, otp_window=OTP_WINDOW, precompute=False,
+                 clock=time.time, replay_protection=True):
         # vehicle_secrets: dict mapping vehicle_id to secret
         self.vehicle_secrets = vehicle_secrets      # Store the mapping
+        self.groth16_verifier = groth16_verifier    # Only needed for real (ZoKrates) proofs
+        self.otp_window = otp_window                # Seconds of clock skew/latency accepted either way
+        self.precompute = precompute
+        self.clock = clock
+        self._expected = {}                         # timestamp -> {vehicle_id: expected proof}; swapped by tick()
+        self._window_high = None                    # Newest precomputed second
+        self._window_lock = threading.Lock()        # Guards vehicle_secrets writes and the window swap
+        self._tick_lock = threading.Lock()          # One tick at a time (ticker thread or caller)
+        self._registered_during_tick = None         # vehicle_id -> secret registered while a tick builds
+        self.replay_cache = ReplayCache(otp_window) if replay_protection else None
+        self._ticker = None                         # Background window-upkeep thread (see start_ticker)
+        self._ticker_stop = threading.Event()
+
+
+    """
+    Function: _expected_proofs_at
+
+    Compute the expected proof of every vehicle in a (vehicle_id, secret) snapshot for one timestamp.
+    """
+    def _expected_proofs_at(self, timestamp, secrets):
+        return {
+            vehicle_id: generate_zkp_proof(generate_otp_at(secret, timestamp), timestamp)
+            for vehicle_id, secret in secrets
+        }
+
+
+    """
+    Function: tick
+
+    Roll the precomputed window forward to [now - otp_window, now + otp_window]. Safe to call while other threads
+    verify and register vehicles.
+
+    Args:
+        now (int): Current Unix time in whole seconds.
+
+    Steps:
+    1. Snapshot the registry and start recording registrations (under the window lock)
+    2. Precompute the seconds that entered the window (all of them if the window is empty or too far behind),
+       without holding the lock
+    3. Under the lock, patch in vehicles registered meanwhile, keep the still-current seconds, drop the rest
+       and swap the new window in
+    """
+    def tick(self, now):
+        low, high = now - self.otp_window, now + self.otp_window
+        with self._tick_lock:
+            if self._window_high == high:
+                return
+            with self._window_lock:
+                if self._window_high is None or high - self._window_high > high - low:
+                    first_new = low
+                else:
+                    first_new = self._window_high + 1
+                secrets = list(self.vehicle_secrets.items())
+                self._registered_during_tick = {}
+            fresh = {timestamp: self._expected_proofs_at(timestamp, secrets)
+                     for timestamp in range(first_new, high + 1)}
+            with self._window_lock:
+                for timestamp, expected in fresh.items():
+                    expected.update(self._expected_proofs_at(timestamp, self._registered_during_tick.items()))
+                self._registered_during_tick = None
+                window = {timestamp: self._expected[timestamp]
+                          for timestamp in range(low, first_new) if timestamp in self._expected}
+                window.update(fresh)
+                self._expected = window
+                self._window_high = high
+
+
+    """
+    Function: start_ticker
+
+    Start a daemon thread that calls tick() with the RSU's clock every `interval` seconds, keeping the precomputed
+    window current off the request path. Does nothing if precompute is disabled or the ticker is already running.
+
+    Args:
+        interval (float): Seconds between ticks (default TICK_INTERVAL).
+    """
+    def start_ticker(self, interval=TICK_INTERVAL):
+        if not self.precompute or self._ticker is not None:
+            return
+        self.tick(int(self.clock()))
+        self._ticker_stop.clear()
+
+        def run():
+            while not self._ticker_stop.wait(interval):
+                self.tick(int(self.clock()))
+
+        self._ticker = threading.Thread(target=run, name="rsu-ticker", daemon=True)
+        self._ticker.start()
+
+
+    """
+    Function: stop_ticker
+
+    Stop the background ticker started by start_ticker().
+    """
+    def stop_ticker(self):
+        if self._ticker is not None:
+            self._ticker_stop.set()
+            self._ticker.join()
+            self._ticker = None
+
+
+    """
+    Function: register_vehicle
+
+    Add (or re-key) a vehicle and update its precomputed proofs for the current window, and for the window a
+    running tick is building. Safe to call while the ticker runs.
+
+    Args:
+        vehicle_id (str): The vehicle's unique identifier.
+        secret (str): The vehicle's secret.
+    """
+    def register_vehicle(self, vehicle_id, secret):
+        with self._window_lock:
+            self.vehicle_secrets[vehicle_id] = secret
+            if self._registered_during_tick is not None:
+                self._registered_during_tick[vehicle_id] = secret
+            for timestamp, expected in self._expected.items():
+                expected[vehicle_id] = generate_zkp_proof(generate_otp_at(secret, timestamp), timestamp)
 
 
     """
@@ -63,18 +227,93 @@ class RSU:
     Steps:
     1. Retrieve the secret for the vehicle
     2. Return False if vehicle_id is unknown
-    3. Recreate the OTP input
-    4. Hash to get the OTP
-    5. Simulate expected ZKP
-    6. Return True if proof matches expected
+    3. Return False if the timestamp is outside the acceptance window
+    4. Return False if this vehicle already authenticated for this timestamp (replay)
+    5. Look up the expected ZKP for (timestamp, vehicle_id) in the precomputed window, computing it from the
+       supplied timestamp on a miss (or when precompute is off)
+    6. Return True if proof matches expected (constant-time comparison), remembering it for replay detection
     """
     def verify_zkp(self, vehicle_id, zkp_proof, timestamp):
         secret = self.vehicle_secrets.get(vehicle_id)
         if not secret:
             return False
-        otp, _unused_timestamp = generate_otp(secret)
-        expected_zkp = generate_zkp_proof(otp, timestamp)
-        return zkp_proof == expected_zkp
+        now = int(self.clock())
+        if abs(now - timestamp) > self.otp_window:
+            return False
+        if self.replay_cache is not None:
+            self.replay_cache.advance(now)
+            if self.replay_cache.seen(timestamp, vehicle_id):
+                return False
+        expected_zkp = None
+        if self.precompute:
+            expected_zkp = self._expected.get(timestamp, {}).get(vehicle_id)
+        if expected_zkp is None:
+            expected_zkp = generate_zkp_proof(generate_otp_at(secret, timestamp), timestamp)
+        if not isinstance(zkp_proof, str) or not zkp_proof.isascii():
+            return False
+        if not hmac.compare_digest(zkp_proof, expected_zkp):
+            return False
+        if self.replay_cache is not None:
+            self.replay_cache.add(timestamp, vehicle_id)
+        return True
+
+
+    """
+    Function: verify_batch
+
+    Verify a burst of authentication requests in one call.
+
+    Args:
+        requests (list of tuple): (vehicle_id, zkp_proof, timestamp) tuples. zkp_proof is either a simulated proof
+                                  string or, when the RSU has a groth16_verifier, a proof.json-format dict.
+
+    Returns:
+        list of bool: Per-request results, in input order.
+
+    Steps:
+    1. Reject requests from unknown vehicles
+    2. Verify simulated (string) proofs individually with verify_zkp
+    3. Reject real (dict) proofs with an out-of-window or already used timestamp, or whose public inputs are not
+       the OTP and timestamp derived from the requesting vehicle's secret
+    4. Verify the remaining real proofs together with randomized Groth16 batch verification,
+       which bisects the batch to find invalid proofs if the combined check fails
+    """
+    def verify_batch(self, requests):
+        results = [False] * len(requests)
+        groth16_indices = []
+        for index, (vehicle_id, zkp_proof, timestamp) in enumerate(requests):
+            secret = self.vehicle_secrets.get(vehicle_id)
+            if not secret:
+                continue
+            if isinstance(zkp_proof, dict):
+                if (self.groth16_verifier is not None and not self._is_replay(vehicle_id, timestamp)
+                        and public_inputs_match(zkp_proof, generate_otp_at(secret, timestamp), timestamp)):
+                    groth16_indices.append(index)
+            else:
+                results[index] = self.verify_zkp(vehicle_id, zkp_proof, timestamp)
+        if groth16_indices:
+            batch_results = self.groth16_verifier.verify_batch([requests[i][1] for i in groth16_indices])
+            for index, valid in zip(groth16_indices, batch_results):
+                vehicle_id, _, timestamp = requests[index]
+                if valid and self.replay_cache is not None:
+                    valid = self.replay_cache.add(timestamp, vehicle_id)     # Rejects duplicates within the batch
+                results[index] = valid
+        return results
+
+
+    """
+    Function: _is_replay
+
+    Check a real-proof request against the acceptance window and (with replay protection) the replay cache.
+    """
+    def _is_replay(self, vehicle_id, timestamp):
+        now = int(self.clock())
+        if abs(now - timestamp) > self.otp_window:
+            return True
+        if self.replay_cache is None:
+            return False
+        self.replay_cache.advance(now)
+        return self.replay_cache.seen(timestamp, vehicle_id)
 
 if __name__ == "__main__":
     # Simple test for RSU class
@@ -87,4 +326,5 @@ if __name__ == "__main__":
     rsu = RSU({vehicle_id: secret})
     result = rsu.verify_zkp(vehicle_id, zkp, timestamp)
     print(f"[RSU] Verification result: {result}")
+    print(f"[RSU] Replayed proof accepted: {rsu.verify_zkp(vehicle_id, zkp, timestamp)}")
 
@@ -0,0 +1,273 @@
+"""
+rsu_cluster.py
+
+Purpose:
+    Simulates a sharded RSU deployment: a pool of RSU worker processes, each owning a hash partition of the vehicle
+    registry, behind a router that dispatches authentication requests by vehicle ID. Used to measure how
+    authentication capacity scales with cores and to spot hot-shard imbalance.
+
+Methodology:
+    - A vehicle belongs to shard crc32(vehicle_id) % num_shards (stable across processes and runs, unlike hash()).
+    - Each worker builds its own RSU from its partition of the secrets, or opens a shared memory-mapped
+      VehicleRegistry file (see registry.py) and serves only the IDs routed to it.
+    - The router splits incoming requests into per-shard batches, sends them over per-shard queues and
+      reassembles the results in input order.
+    - Per shard it records requests served, busy time (throughput) and outstanding batches (queue depth).
+    - A batch that raises in the worker is retried request by request, so one malformed request fails alone and
+      is counted as an error. The router waits in short polls and raises if a worker process has died, instead
+      of blocking forever on a result that will never come.
+    - After a timeout the workers keep serving the abandoned batches; their late results are dropped (but still
+      retire the batch from the queue depth), so the next call starts clean. A dead worker leaves the cluster
+      broken: every later call raises at once rather than waiting on a shard that cannot answer.
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+
+from rsu import RSU
+
+DEFAULT_BATCH_SIZE = 1000       # Requests per message sent to a worker
+RESPONSE_POLL_INTERVAL = 1.0    # Seconds between worker liveness checks while waiting for results
+
+
+"""
+Function: shard_for
+
+Return the shard that owns a vehicle ID.
+
+Args:
+    vehicle_id (str): The vehicle's unique identifier.
+    num_shards (int): Number of RSU shards.
+"""
+def shard_for(vehicle_id, num_shards):
+    return zlib.crc32(vehicle_id.encode()) % num_shards
+
+
+"""
+Function: _rsu_worker
+
+Worker process loop: build this shard's RSU, then verify request batches until told to stop.
+
+Args:
+    shard_id (int): This worker's shard.
+    vehicle_secrets (dict or str): This shard's vehicle_id -> secret mapping, or a registry file path.
+    rsu_kwargs (dict): Extra keyword arguments for RSU.
+    request_queue (Queue): Receives (batch_id, requests) messages, or None to stop.
+    response_queue (Queue): Receives (shard_id, batch_id, results, busy_seconds, errors) messages.
+"""
+def _rsu_worker(shard_id, vehicle_secrets, rsu_kwargs, request_queue, response_queue):
+    if isinstance(vehicle_secrets, str):
+        from registry import VehicleRegistry
+        vehicle_secrets = VehicleRegistry(vehicle_secrets)
+    rsu = RSU(vehicle_secrets, **rsu_kwargs)
+    while True:
+        message = request_queue.get()
+        if message is None:
+            break
+        batch_id, requests = message
+        start = time.perf_counter()
+        errors = 0
+        try:
+            results = rsu.verify_batch(requests)
+        except Exception:
+            results = []
+            for request in requests:                # Isolate the bad request(s); they fail, the rest are served
+                try:
+                    results += rsu.verify_batch([request])
+                except Exception:
+                    results.append(False)
+                    errors += 1
+        response_queue.put((shard_id, batch_id, results, time.perf_counter() - start, errors))
+
+
+"""
+RSUCluster Class
+
+Router plus a pool of sharded RSU worker processes.
+
+Functionality:
+    - authenticate(requests) routes (vehicle_id, zkp_proof, timestamp) requests to the owning shards and returns
+      the results in input order.
+    - stats() reports per-shard requests, busy time, throughput, maximum queue depth and request errors.
+
+Usage:
+    with RSUCluster(fleet.secrets_dict(), num_shards=4) as cluster:
+        results = cluster.authenticate(fleet.auth_requests(timestamp))
+        print(cluster.stats())
+
+Args:
+    vehicle_secrets (dict or str): vehicle_id -> secret mapping (partitioned across shards), or the path of a
+                                   VehicleRegistry file that every worker maps.
+    num_shards (int, optional): Number of RSU worker processes (default os.cpu_count()).
+    rsu_kwargs (dict, optional): Extra keyword arguments for each worker's RSU (e.g. {"precompute": False}).
+"""
+class RSUCluster:
+
+    def __init__(self, vehicle_secrets, num_shards=None, rsu_kwargs=None):
+        self.num_shards = num_shards or os.cpu_count() or 1
+        if isinstance(vehicle_secrets, str):
+            partitions = [vehicle_secrets] * self.num_shards
+        else:
+            partitions = [{} for _ in range(self.num_shards)]
+            for vehicle_id, secret in vehicle_secrets.items():
+                partitions[shard_for(vehicle_id, self.num_shards)][vehicle_id] = secret
+        self._request_queues = [multiprocessing.Queue() for _ in range(self.num_shards)]
+        self._response_queue = multiprocessing.Queue()
+        self._workers = [
+            multiprocessing.Process(
+                target=_rsu_worker,
+                args=(shard_id, partitions[shard_id], rsu_kwargs or {},
+                      self._request_queues[shard_id], self._response_queue),
+                daemon=True,
+            )
+            for shard_id in range(self.num_shards)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._next_batch_id = 0
+        self._outstanding = [0] * self.num_shards
+        self._broken = None                         # Why the cluster can no longer serve requests, if it can't
+        self._shard_stats = [
+            {"shard": shard_id, "requests": 0, "batches": 0, "busy_seconds": 0.0, "max_queue_depth": 0, "errors": 0}
+            for shard_id in range(self.num_shards)
+        ]
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+    """
+    Function: close
+
+    Stop all worker processes. Batches a dead worker never read are discarded, so exiting does not hang on them.
+    """
+    def close(self):
+        for request_queue in self._request_queues:
+            request_queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        for request_queue in self._request_queues:
+            request_queue.cancel_join_thread()      # Nobody is left to read what is still buffered
+        self._workers = []
+
+
+    """
+    Function: authenticate
+
+    Route a burst of authentication requests to their shards and collect the results.
+
+    Args:
+        requests (list of tuple): (vehicle_id, zkp_proof, timestamp) tuples.
+        batch_size (int): Maximum requests per message sent to a worker (default DEFAULT_BATCH_SIZE).
+        timeout (float, optional): Maximum seconds to wait for all results (default: no limit while workers live).
+
+    Returns:
+        list of bool: Per-request results, in input order (False for requests that raised in the worker).
+
+    Raises:
+        RuntimeError: If a worker process died with batches outstanding, now or in an earlier call.
+        TimeoutError: If the results did not all arrive within `timeout` seconds (the cluster stays usable).
+
+    Steps:
+    1. Group request indices by owning shard
+    2. Send each shard its requests in batches, tracking outstanding batches per shard
+    3. Collect batch results as workers finish and place them at their original indices, checking every
+       RESPONSE_POLL_INTERVAL seconds that the workers are still alive
+    4. Drop results of batches abandoned by an earlier timed-out call, counting them only as served work
+    """
+    def authenticate(self, requests, batch_size=DEFAULT_BATCH_SIZE, timeout=None):
+        if self._broken is not None:
+            raise RuntimeError(f"RSU cluster is unusable: {self._broken}")
+        indices_by_shard = [[] for _ in range(self.num_shards)]
+        for index, request in enumerate(requests):
+            indices_by_shard[shard_for(request[0], self.num_shards)].append(index)
+        pending = {}                                # batch_id -> request indices
+        for shard_id, indices in enumerate(indices_by_shard):
+            for start in range(0, len(indices), batch_size):
+                batch_indices = indices[start:start + batch_size]
+                batch_id = self._next_batch_id
+                self._next_batch_id += 1
+                pending[batch_id] = batch_indices
+                self._request_queues[shard_id].put((batch_id, [requests[i] for i in batch_indices]))
+                self._outstanding[shard_id] += 1
+                stats = self._shard_stats[shard_id]
+                stats["max_queue_depth"] = max(stats["max_queue_depth"], self._outstanding[shard_id])
+        results = [False] * len(requests)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while pending:
+            wait = RESPONSE_POLL_INTERVAL
+            if deadline is not None:
+                wait = max(min(wait, deadline - time.monotonic()), 0)
+            try:
+                shard_id, batch_id, batch_results, busy_seconds, errors = self._response_queue.get(timeout=wait)
+            except queue.Empty:
+                dead = [shard_id for shard_id, worker in enumerate(self._workers)
+                        if self._outstanding[shard_id] and not worker.is_alive()]
+                if dead:
+                    self._broken = (f"RSU worker(s) for shard(s) {dead} exited (exit codes "
+                                    f"{[self._workers[shard_id].exitcode for shard_id in dead]})")
+                    raise RuntimeError(f"{self._broken} with {len(pending)} batches outstanding")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"{len(pending)} batches still outstanding after {timeout}s")
+                continue
+            self._outstanding[shard_id] -= 1
+            stats = self._shard_stats[shard_id]
+            stats["requests"] += len(batch_results)
+            stats["batches"] += 1
+            stats["busy_seconds"] += busy_seconds
+            stats["errors"] += errors
+            batch_indices = pending.pop(batch_id, None)
+            if batch_indices is None:
+                continue                            # Late result of a batch a timed-out call gave up on
+            for index, valid in zip(batch_indices, batch_results):
+                results[index] = valid
+        return results
+
+
+    """
+    Function: stats
+
+    Per-shard load report.
+
+    Returns:
+        list of dict: One entry per shard with requests, batches, busy_seconds, throughput (requests per busy second),
+                      max_queue_depth, current queue_depth, errors (requests that raised) and load_share
+                      (fraction of all requests served).
+    """
+    def stats(self):
+        total = sum(stats["requests"] for stats in self._shard_stats) or 1
+        report = []
+        for shard_id, stats in enumerate(self._shard_stats):
+            entry = dict(stats)
+            entry["throughput"] = stats["requests"] / stats["busy_seconds"] if stats["busy_seconds"] else 0.0
+            entry["queue_depth"] = self._outstanding[shard_id]
+            entry["load_share"] = stats["requests"] / total
+            report.append(entry)
+        return report
+
+
+if __name__ == "__main__":
+    # Simple test: authenticate a fleet through four shards and print the per-shard report
+    from fleet import Fleet
+    fleet = Fleet.random(20_000)
+    requests = fleet.auth_requests(int(time.time()))
+    with RSUCluster(fleet.secrets_dict(), num_shards=4, rsu_kwargs={"precompute": False}) as cluster:
+        start = time.perf_counter()
+        results = cluster.authenticate(requests)
+        elapsed = time.perf_counter() - start
+        print(f"[RSU Cluster] {sum(results)}/{len(results)} authenticated in {elapsed:.2f}s "
+              f"({len(results) / elapsed:.0f} auths/sec)")
+        for entry in cluster.stats():
+            print(f"[RSU Cluster] shard {entry['shard']}: {entry['requests']} requests, "
+                  f"{entry['throughput']:.0f} req/s busy, max queue depth {entry['max_queue_depth']}, "
+                  f"share {entry['load_share']:.1%}")
@@ -0,0 +1,105 @@
+"""
+test_blockchain_interface.py
+
+Purpose:
+    Exercises NonceAllocator and TransactionPipeline against the local mock JSON-RPC node (mock_rpc.py).
+
+Usage:
+    python -m pytest test_blockchain_interface.py
+"""
+
+import pytest
+
+pytest.importorskip("web3")
+pytest.importorskip("eth_account")
+
+from web3 import Web3
+
+from blockchain_interface import BlockchainInterface, TransactionPipeline, TransactionReverted
+from mock_rpc import MockRPCServer
+
+CONTRACT_ADDRESS = "0x" + "11" * 20
+ABI = [{
+    "type": "function", "name": "logAuth", "stateMutability": "nonpayable", "outputs": [],
+    "inputs": [{"name": "vehicleHash", "type": "bytes32"}, {"name": "timestamp", "type": "uint256"},
+               {"name": "authenticated", "type": "bool"}],
+}]
+
+
+@pytest.fixture
+def server():
+    with MockRPCServer(block_time=0.05) as server:
+        yield server
+
+
+@pytest.fixture
+def account():
+    return Web3().eth.account.create()
+
+
+def _interface(server):
+    return BlockchainInterface(server.url, CONTRACT_ADDRESS, ABI, gas_limit=60_000)
+
+
+def test_resync_keeps_reserved_nonces(server, account):
+    nonces = _interface(server).nonce_allocator(account.address)
+    assert [nonces.allocate() for _ in range(3)] == [0, 1, 2]          # Reserved, not sent yet
+    nonces.resync()                                                     # Node still reports pending 0
+    assert nonces.allocate() == 3
+
+
+def test_released_nonce_is_reused(server, account):
+    nonces = _interface(server).nonce_allocator(account.address)
+    first, second = nonces.allocate(), nonces.allocate()
+    nonces.sent(second)
+    nonces.release(first)                                               # Send of nonce 0 failed
+    nonces.resync()
+    assert nonces.allocate() == first
+
+
+def test_pipeline_survives_external_sender(server, account):
+    interface = _interface(server)
+    with TransactionPipeline(interface, account.address, account.key, poll_interval=0.02) as pipeline:
+        futures = []
+        for i in range(60):
+            if i == 30:
+                server.chain.bump_nonce(3)                              # Another sender uses the same key
+            futures.append(pipeline.submit(Web3.keccak(text=f"VEH{i:03d}"), 1234567890 + i, True))
+        assert pipeline.flush(timeout=30)
+    stats = pipeline.stats()
+    assert stats["confirmed"] == 60 and stats["failed"] == 0
+    assert all(future.result()["status"] == 1 for future in futures)
+
+
+def test_reverted_transaction_fails(server, account):
+    server.chain.reverting.add(0)
+    interface = _interface(server)
+    with TransactionPipeline(interface, account.address, account.key, send_workers=1,
+                             poll_interval=0.02) as pipeline:
+        reverted = pipeline.submit(Web3.keccak(text="VEH000"), 1234567890, True)
+        confirmed = pipeline.submit(Web3.keccak(text="VEH001"), 1234567891, True)
+        assert pipeline.flush(timeout=30)
+    with pytest.raises(TransactionReverted):
+        reverted.result()
+    assert confirmed.result()["status"] == 1
+    stats = pipeline.stats()
+    assert (stats["confirmed"], stats["failed"], stats["reverted"]) == (1, 1, 1)
+
+
+def test_receipt_thread_survives_errors(server, account, monkeypatch):
+    interface = _interface(server)
+    with TransactionPipeline(interface, account.address, account.key, poll_interval=0.02) as pipeline:
+        check_receipts = pipeline._check_receipts
+        calls = []
+
+        def flaky(last_block):
+            calls.append(last_block)
+            if len(calls) == 1:
+                raise RuntimeError("unexpected RPC payload")
+            return check_receipts(last_block)
+
+        monkeypatch.setattr(pipeline, "_check_receipts", flaky)
+        future = pipeline.submit(Web3.keccak(text="VEH000"), 1234567890, True)
+        assert pipeline.flush(timeout=30)
+    assert future.result()["status"] == 1
+    assert pipeline.stats()["receipt_errors"] >= 1
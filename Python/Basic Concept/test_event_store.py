@@ -0,0 +1,88 @@
+"""
+test_event_store.py
+
+Purpose:
+    Checks AuthEventStore ingestion: incremental ledger reads that skip malformed lines, and chain logs read from
+    the mock JSON-RPC node (mock_rpc.py) with 0x-prefixed hashes and no duplicates when a block range is read twice.
+
+Usage:
+    python -m pytest test_event_store.py
+"""
+
+import json
+
+import pytest
+
+from event_store import AuthEventStore
+
+CONTRACT_ADDRESS = "0x" + "22" * 20
+ABI = [
+    {"type": "function", "name": "logAuth", "stateMutability": "nonpayable", "outputs": [],
+     "inputs": [{"name": "vehicleHash", "type": "bytes32"}, {"name": "timestamp", "type": "uint256"},
+                {"name": "authenticated", "type": "bool"}]},
+    {"type": "event", "name": "AuthEvent", "anonymous": False,
+     "inputs": [{"name": "vehicleHash", "type": "bytes32", "indexed": False},
+                {"name": "timestamp", "type": "uint256", "indexed": False},
+                {"name": "authenticated", "type": "bool", "indexed": False}]},
+]
+
+
+def test_ledger_ingest_is_incremental(tmp_path):
+    ledger = tmp_path / "auth_events.jsonl"
+    events = [{"vehicle_hash": f"{i:064x}", "timestamp": 1_700_000_000 + i, "authenticated": i != 2}
+              for i in range(5)]
+    ledger.write_text("".join(json.dumps(event) + "\n" for event in events[:3]))
+    with AuthEventStore(":memory:") as store:
+        assert store.ingest_ledger(str(ledger), rsu_id="rsu1") == 3
+        with open(ledger, "a") as f:
+            f.write("".join(json.dumps(event) + "\n" for event in events[3:]))
+            f.write('{"vehicle_hash": "partial')                     # Line still being written
+        assert store.ingest_ledger(str(ledger), rsu_id="rsu1") == 2
+        assert store.rsu_counts() == {"rsu1": {"total": 5, "failed": 1}}
+
+
+def test_malformed_ledger_lines_are_skipped(tmp_path):
+    ledger = tmp_path / "auth_events.jsonl"
+    good = [json.dumps({"vehicle_hash": f"{i:064x}", "timestamp": 1_700_000_000 + i, "authenticated": True})
+            for i in range(3)]
+    ledger.write_text(good[0] + "\n" + '{"vehicle_hash": "trunc' + good[1] + "\n"   # Writer crashed mid-line
+                      + "\x00\x00garbage\n" + '["not", "an", "event"]\n' + good[2] + "\n")
+    with AuthEventStore(":memory:") as store:
+        assert store.ingest_ledger(str(ledger), rsu_id="rsu1") == 2
+        assert store.malformed_lines == 3
+        with open(ledger, "a") as f:
+            f.write(good[1] + "\n")
+        assert store.ingest_ledger(str(ledger), rsu_id="rsu1") == 1      # Later lines still ingested
+        assert len(store) == 3
+
+
+def test_chain_ingest_against_mock_node():
+    pytest.importorskip("web3")
+    pytest.importorskip("eth_account")
+    from web3 import Web3
+    from blockchain_interface import BlockchainInterface, TransactionPipeline
+    from mock_rpc import MockRPCServer
+
+    topic = Web3.to_hex(Web3.keccak(text="AuthEvent(bytes32,uint256,bool)"))
+    account = Web3().eth.account.create()
+    vehicle_hashes = [Web3.keccak(text=f"VEH{i:03d}") for i in range(5)]
+    with MockRPCServer(block_time=0.05, event_topic=topic) as server:
+        interface = BlockchainInterface(server.url, CONTRACT_ADDRESS, ABI, gas_limit=60_000)
+        with TransactionPipeline(interface, account.address, account.key, poll_interval=0.02) as pipeline:
+            for i, vehicle_hash in enumerate(vehicle_hashes):
+                pipeline.submit(vehicle_hash, 1_700_000_000 + i, i != 4)
+            assert pipeline.flush(timeout=30)
+
+        with AuthEventStore(":memory:") as store:
+            assert store.ingest_chain(interface, page_size=2) == 5
+            rows = store.events_for_vehicle(vehicle_hashes[4].hex().removeprefix("0x"))
+            assert len(rows) == 1
+            row = rows[0]
+            assert row["tx_hash"].startswith("0x") and len(row["tx_hash"]) == 66
+            assert (row["timestamp"], row["authenticated"]) == (1_700_000_004, 0)
+            assert isinstance(row["log_index"], int)
+            receipt = interface.web3.eth.get_transaction_receipt(row["tx_hash"])
+            assert receipt["blockNumber"] == row["block_number"]
+
+            assert store.ingest_chain(interface, from_block=0) == 0      # Overlapping re-read adds nothing
+            assert len(store) == 5
@@ -0,0 +1,117 @@
+"""
+test_rsu.py
+
+Purpose:
+    Checks that RSU.verify_batch binds real Groth16 proofs to the requesting vehicle and timestamp, and that the
+    native and py_ecc Groth16 backends agree.
+
+Methodology:
+    - Builds a Groth16 verification key with a known trapdoor, so a proof that satisfies the verification equation
+      for any chosen public inputs can be made without ZoKrates.
+    - The public inputs mimic dummy.zok: [OTP field element, timestamp, OTP + timestamp].
+
+Usage:
+    python -m pytest test_rsu.py
+"""
+
+import pickle
+
+import pytest
+
+pytest.importorskip("py_ecc")
+
+from py_ecc.optimized_bn128 import G1, G2, curve_order, multiply, normalize
+
+from groth16_verifier import Groth16Verifier
+from otp import generate_otp_at
+from rsu import RSU
+from zkp import otp_public_inputs
+
+NOW = 1_700_000_000
+SECRETS = {"V1": "secret-one", "V2": "secret-two"}
+TRAPDOOR = {"alpha": 5, "beta": 7, "gamma_abc": [11, 13, 17, 19]}   # gamma = delta = generator
+# On the twisted curve but outside the order-r subgroup
+OFF_SUBGROUP_G2 = [["0x2", "0x1"], ["0x101f7278419308b95099eca02dcee0c5381f4d26d1d62313f057167f064101ce",
+                                    "0x2b76c179599bb92a963dac85546a005a777f7c13f6a7b75d5918b6b5808f5fde"]]
+
+
+def _g1(point):
+    x, y = normalize(point)
+    return [hex(x.n), hex(y.n)]
+
+
+def _g2(point):
+    x, y = normalize(point)
+    return [[hex(c) for c in x.coeffs], [hex(c) for c in y.coeffs]]
+
+
+def _verification_key():
+    return {
+        "scheme": "g16",
+        "curve": "bn128",
+        "alpha": _g1(multiply(G1, TRAPDOOR["alpha"])),
+        "beta": _g2(multiply(G2, TRAPDOOR["beta"])),
+        "gamma": _g2(G2),
+        "delta": _g2(G2),
+        "gamma_abc": [_g1(multiply(G1, k)) for k in TRAPDOOR["gamma_abc"]],
+    }
+
+
+def _proof_for(inputs):
+    # With gamma = delta = B = generator, e(A, B) = e(alpha, beta) e(vk_x, gamma) e(C, delta) reduces to
+    # a = alpha * beta + x + c, where x is the discrete log of vk_x
+    k0, *ks = TRAPDOOR["gamma_abc"]
+    x = (k0 + sum(value * k for value, k in zip(inputs, ks))) % curve_order
+    c = 23
+    a = (TRAPDOOR["alpha"] * TRAPDOOR["beta"] + x + c) % curve_order
+    return {"proof": {"a": _g1(multiply(G1, a)), "b": _g2(G2), "c": _g1(multiply(G1, c))},
+            "inputs": [hex(value) for value in inputs]}
+
+
+def _proof_for_vehicle(vehicle_id, timestamp):
+    otp_field, ts = otp_public_inputs(generate_otp_at(SECRETS[vehicle_id], timestamp), timestamp)
+    return _proof_for([otp_field, ts, (otp_field + ts) % curve_order])
+
+
+@pytest.fixture(scope="module")
+def verifier():
+    return Groth16Verifier(_verification_key())
+
+
+def test_valid_proof_accepted_once(verifier):
+    rsu = RSU(SECRETS, groth16_verifier=verifier, clock=lambda: NOW)
+    proof = _proof_for_vehicle("V1", NOW)
+    assert rsu.verify_batch([("V1", proof, NOW)]) == [True]
+    assert rsu.verify_batch([("V1", proof, NOW)]) == [False]          # Replay
+
+
+def test_proof_rejected_under_other_vehicle(verifier):
+    rsu = RSU(SECRETS, groth16_verifier=verifier, clock=lambda: NOW)
+    proof = _proof_for_vehicle("V1", NOW)
+    assert verifier.verify(proof)                                      # Valid proof, just not V2's
+    assert rsu.verify_batch([("V2", proof, NOW)]) == [False]
+
+
+def test_proof_rejected_under_other_timestamp(verifier):
+    rsu = RSU(SECRETS, groth16_verifier=verifier, clock=lambda: NOW)
+    proof = _proof_for_vehicle("V1", NOW)
+    assert rsu.verify_batch([("V1", proof, NOW + 1)]) == [False]
+
+
+def test_out_of_window_rejected_without_replay_protection(verifier):
+    rsu = RSU(SECRETS, groth16_verifier=verifier, clock=lambda: NOW, replay_protection=False)
+    timestamp = NOW - rsu.otp_window - 1
+    assert rsu.verify_batch([("V1", _proof_for_vehicle("V1", timestamp), timestamp)]) == [False]
+
+
+def test_backends_agree():
+    pytest.importorskip("zksnake")
+    native = Groth16Verifier(_verification_key(), backend="native")
+    reference = Groth16Verifier(_verification_key(), backend="py_ecc")
+    valid = _proof_for_vehicle("V1", NOW)
+    wrong_input = {**valid, "inputs": valid["inputs"][:2] + [hex(1)]}
+    off_subgroup = {**valid, "proof": {**valid["proof"], "b": OFF_SUBGROUP_G2}}
+    proofs = [valid, wrong_input, off_subgroup, _proof_for_vehicle("V2", NOW)]
+    assert native.verify_batch(proofs) == reference.verify_batch(proofs) == [True, False, False, True]
+    assert [native.verify(proof) for proof in proofs] == [True, False, False, True]
+    assert pickle.loads(pickle.dumps(native)).verify(valid)             # Handed to RSU worker processes
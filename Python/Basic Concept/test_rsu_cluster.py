@@ -0,0 +1,51 @@
+"""
+test_rsu_cluster.py
+
+Purpose:
+    Checks that RSUCluster recovers cleanly from a timed-out call and fails fast once a worker process has died.
+
+Usage:
+    python -m pytest test_rsu_cluster.py
+"""
+
+import time
+
+import pytest
+
+import rsu_cluster
+from fleet import Fleet
+from rsu_cluster import RSUCluster
+
+NUM_VEHICLES = 20_000
+
+
+@pytest.fixture(scope="module")
+def fleet():
+    return Fleet.random(NUM_VEHICLES)
+
+
+def test_call_after_timeout_gets_its_own_results(fleet):
+    timestamp = int(time.time())
+    with RSUCluster(fleet.secrets_dict(), num_shards=2, rsu_kwargs={"precompute": False}) as cluster:
+        with pytest.raises(TimeoutError):
+            cluster.authenticate(fleet.auth_requests(timestamp), timeout=0.001)
+        requests = fleet.auth_requests(timestamp + 1)                   # Fresh proofs: the first ones were served
+        forged = [(vehicle_id, "0" * 64, ts) for vehicle_id, _, ts in requests[:100]]
+        assert cluster.authenticate(forged + requests[100:]) == [False] * 100 + [True] * (NUM_VEHICLES - 100)
+        stats = cluster.stats()
+    assert all(entry["queue_depth"] == 0 for entry in stats)            # Abandoned batches retired too
+    assert sum(entry["requests"] for entry in stats) == 2 * NUM_VEHICLES
+
+
+def test_dead_worker_breaks_cluster(fleet, monkeypatch):
+    monkeypatch.setattr(rsu_cluster, "RESPONSE_POLL_INTERVAL", 0.05)
+    requests = fleet.auth_requests(int(time.time()))
+    with RSUCluster(fleet.secrets_dict(), num_shards=2, rsu_kwargs={"precompute": False}) as cluster:
+        cluster._workers[0].terminate()
+        cluster._workers[0].join()
+        with pytest.raises(RuntimeError, match="exited"):
+            cluster.authenticate(requests, timeout=30)
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="unusable"):
+            cluster.authenticate(requests[:10])
+        assert time.monotonic() - start < 1
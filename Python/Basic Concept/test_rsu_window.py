@@ -0,0 +1,49 @@
+"""
+test_rsu_window.py
+
+Purpose:
+    Checks that the RSU's precomputed proof window stays consistent while vehicles are registered (and re-keyed)
+    concurrently with the background ticker rolling it forward.
+
+Usage:
+    python -m pytest test_rsu_window.py
+"""
+
+import threading
+
+from otp import generate_otp_at
+from rsu import RSU
+from zkp import generate_zkp_proof
+
+NOW = 1_700_000_000
+NUM_INITIAL = 500
+NUM_REGISTERED = 3000
+
+
+def _proof(secret, timestamp):
+    return generate_zkp_proof(generate_otp_at(secret, timestamp), timestamp)
+
+
+def test_register_while_ticker_runs(monkeypatch):
+    errors = []
+    monkeypatch.setattr(threading, "excepthook", lambda args: errors.append(args.exc_value))
+    secrets = {f"V{i}": f"secret-{i}" for i in range(NUM_INITIAL)}
+    clock = {"now": NOW}
+    rsu = RSU(dict(secrets), otp_window=5, precompute=True, clock=lambda: clock["now"])
+    rsu.start_ticker(interval=0.0005)
+    try:
+        for i in range(NUM_REGISTERED):
+            vehicle_id = f"V{i % (NUM_INITIAL + NUM_REGISTERED // 2)}"     # New vehicles and re-keyed ones
+            secrets[vehicle_id] = f"secret-{i}-b"
+            rsu.register_vehicle(vehicle_id, secrets[vehicle_id])
+            if i % 20 == 0:
+                clock["now"] += 1                                       # Keep the ticker rolling the window
+        assert rsu._ticker.is_alive()
+    finally:
+        rsu.stop_ticker()
+    assert errors == []
+    assert rsu._expected
+    for timestamp, expected in rsu._expected.items():
+        assert expected == {vehicle_id: _proof(secret, timestamp) for vehicle_id, secret in secrets.items()}
+    vehicle_id = f"V{NUM_INITIAL + 1}"
+    assert rsu.verify_zkp(vehicle_id, _proof(secrets[vehicle_id], clock["now"]), clock["now"])
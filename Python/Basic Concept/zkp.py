@@ -9,18 +9,48 @@ Methodology:
     - Simulates ZKP generation by hashing OTP and timestamp for rapid prototyping and testing.
     - Provides wrapper functions to interact with ZoKrates CLI for real ZKP workflows.
     - Designed to be used by Vehicle and RSU classes for proof generation and verification.
+    - A real proof is bound to one vehicle and timestamp through its leading public inputs,
+      [OTP as a field element, timestamp]; otp_public_inputs gives the values the RSU expects.
 """
 
 import hashlib
 
-# Import ZoKrates interface functions for future use
-from zokrates_interface import (
-    run_zokrates_compile,
-    run_zokrates_setup,
-    run_zokrates_compute_witness,
-    run_zokrates_generate_proof,
-    run_zokrates_verify
-)
+# Import ZoKrates helpers for the real proof workflow
+from zokrates_cache import get_circuit_artifacts
+from zokrates_pool import prove_witness_isolated
+
+# Order of the bn128 scalar field; ZoKrates circuit inputs are elements of this field
+BN128_FIELD_MODULUS = 21888242871839275222246405745257275088548364400416034343698204186575808495617
+
+"""
+Encode an OTP and timestamp as the public inputs a real proof for them carries.
+Args:
+    otp (str): The one-time password (hex digest) generated by the vehicle.
+    timestamp (int): The timestamp used in OTP generation.
+Returns:
+    list of int: [OTP reduced into the bn128 field, timestamp].
+"""
+def otp_public_inputs(otp, timestamp):
+    return [int(otp, 16) % BN128_FIELD_MODULUS, int(timestamp)]
+
+"""
+Check that a proof.json-format proof is bound to the expected OTP and timestamp.
+Args:
+    proof_json (dict): Parsed proof.json ({"proof": ..., "inputs": [...]}).
+    otp (str): The OTP the RSU derives from the vehicle's secret for this timestamp.
+    timestamp (int): The timestamp the request claims.
+Returns:
+    bool: True if the proof's leading public inputs equal otp_public_inputs(otp, timestamp).
+"""
+def public_inputs_match(proof_json, otp, timestamp):
+    expected = otp_public_inputs(otp, timestamp)
+    try:
+        inputs = proof_json["inputs"][:len(expected)]
+        # ZoKrates writes inputs as 0x-prefixed hex strings
+        actual = [value if isinstance(value, int) else int(value, 0) for value in inputs]
+    except (KeyError, TypeError, ValueError):
+        return False
+    return actual == expected
 
 """
 Simulate ZoKrates proof generation (hash-based).
@@ -40,6 +70,8 @@ def generate_zkp_proof_simulated(otp, timestamp):
 
 """
 Generate a real ZKP proof using the ZoKrates CLI interface.
+Compile and setup artifacts come from the content-addressed cache, so they are only built on the first proof for a circuit.
+The witness and proof live in a per-call scratch directory, so concurrent calls do not collide.
 Args:
     circuit_path (str): Path to the ZoKrates .zok circuit file.
     otp (str): The one-time password generated by the vehicle.
@@ -48,22 +80,15 @@ Returns:
     bool: True if proof is valid, False otherwise.
 """
 def generate_zkp_proof_real(circuit_path, otp, timestamp):
-    # Compile the ZoKrates circuit; return False if compilation fails
-    if not run_zokrates_compile(circuit_path):
-        return False
-    # Run ZoKrates setup to generate keys; return False if setup fails
-    if not run_zokrates_setup():
-        return False
-    # Prepare the arguments as strings for the witness computation
-    args = [str(otp), str(timestamp)]
-    # Compute the witness; return False if this step fails
-    if not run_zokrates_compute_witness(args):
-        return False
-    # Generate the proof; return False if this step fails
-    if not run_zokrates_generate_proof():
+    # Fetch (or build once) the compiled circuit and keys; return False if compile or setup fails
+    artifacts = get_circuit_artifacts(circuit_path)
+    if artifacts is None:
         return False
-    # Verify the proof and return the result (True if valid, False otherwise)
-    return run_zokrates_verify()
+    # Compute the witness, generate and verify the proof in a private workspace (safe to run concurrently);
+    # the OTP is passed as a field element so the proof's public inputs match otp_public_inputs
+    result = prove_witness_isolated(artifacts, [str(value) for value in otp_public_inputs(otp, timestamp)])
+    # Return the verification result (True if valid, False otherwise)
+    return bool(result["verified"])
 
 # For backward compatibility, you can alias the simulated version as the default:
 generate_zkp_proof = generate_zkp_proof_simulated
@@ -0,0 +1,260 @@
+"""
+zokrates_async.py
+
+Purpose:
+    Provides asyncio counterparts of the ZoKrates CLI wrappers in zokrates_interface.py, so a single event loop
+    (e.g. an asyncio-based RSU or test harness) can keep many compile/setup/witness/proof/verify jobs in flight
+    without a thread per call.
+
+Methodology:
+    - Launches ZoKrates with asyncio subprocesses using the same command builders as the blocking wrappers.
+    - Bounds the number of ZoKrates processes running at once with a semaphore (configurable limit).
+    - Every wrapper is a coroutine returning the same ZokratesResult the blocking wrapper returns; callers await it
+      or schedule it with asyncio.gather / asyncio.create_task.
+    - Per-step timeouts, deadlines and retries follow zokrates_interface.py; a timed-out or cancelled step has its
+      ZoKrates process tree killed.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import zokrates_interface
+from zokrates_interface import (
+    ZokratesResult,
+    step_timeout,
+    new_process_group_kwargs,
+    kill_process_tree,
+    zokrates_compile_command,
+    zokrates_setup_command,
+    zokrates_compute_witness_command,
+    zokrates_generate_proof_command,
+    zokrates_verify_command,
+    verify_output_passed
+)
+
+# Maximum number of ZoKrates processes running at once (default: one per core)
+_concurrency_limit = os.cpu_count() or 1
+_semaphore = None
+_semaphore_loop = None
+
+
+"""
+Function: set_concurrency_limit
+
+Set the maximum number of ZoKrates processes the async wrappers run at once.
+
+Args:
+    limit (int): Maximum concurrent ZoKrates processes (must be >= 1).
+"""
+def set_concurrency_limit(limit):
+    global _concurrency_limit, _semaphore
+    if limit < 1:
+        raise ValueError("Concurrency limit must be at least 1")
+    _concurrency_limit = limit
+    _semaphore = None       # Recreated with the new limit on next use
+
+
+"""
+Function: _get_semaphore
+
+Return the semaphore for the running event loop, creating it on first use (or when the loop changes).
+"""
+def _get_semaphore():
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore = asyncio.Semaphore(_concurrency_limit)
+        _semaphore_loop = loop
+    return _semaphore
+
+
+"""
+Function: _run_zokrates_async
+
+Run one ZoKrates command as an asyncio subprocess with the same timeout, deadline and retry rules as
+zokrates_interface.run_zokrates_step, respecting the concurrency limit.
+
+Args:
+    step (str): Step name, e.g. "compile".
+    command (list of str): Full ZoKrates command line.
+    cwd (str, optional): Working directory for the ZoKrates process.
+    timeout (float, optional): Per-attempt timeout in seconds (default DEFAULT_TIMEOUTS[step]).
+    retries (int, optional): Extra attempts after a transient failure (default DEFAULT_RETRIES).
+    deadline (float, optional): Absolute time.monotonic() value after which no attempt may run.
+    success_check (callable, optional): Extra check on stdout for a zero exit code (used by verify).
+
+Returns:
+    ZokratesResult: Structured outcome (truthy on success).
+"""
+async def _run_zokrates_async(step, command, cwd=None, timeout=None, retries=None, deadline=None,
+                              success_check=None):
+    retries = zokrates_interface.DEFAULT_RETRIES if retries is None else retries
+    result = ZokratesResult(step, False)
+    start = time.monotonic()
+    for attempt in range(retries + 1):
+        async with _get_semaphore():
+            # Resolve the timeout after acquiring a slot, so time spent queued counts against the deadline
+            attempt_timeout = step_timeout(step, timeout, deadline)
+            if attempt_timeout is not None and attempt_timeout <= 0:
+                result.timed_out = True
+                break
+            result.attempts = attempt + 1
+            result.timed_out = False
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=cwd,
+                    **new_process_group_kwargs()
+                )
+            except OSError as e:
+                result.error = str(e)       # Retrying cannot fix a missing executable
+                break
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), attempt_timeout)
+            except asyncio.TimeoutError:
+                kill_process_tree(process.pid)
+                stdout, stderr = await process.communicate()
+                result.timed_out = True
+            except asyncio.CancelledError:
+                # Do not leave an orphaned ZoKrates process tree behind
+                kill_process_tree(process.pid)
+                await process.wait()
+                raise
+        stdout = stdout.decode(errors="replace")
+        result.returncode = None if result.timed_out else process.returncode
+        result.stdout, result.stderr = stdout, stderr.decode(errors="replace")
+        result.ok = (not result.timed_out and process.returncode == 0
+                     and (success_check is None or success_check(stdout)))
+        if result.ok or not result.is_transient():
+            break
+        if attempt < retries:
+            if zokrates_interface.DEBUG_MODE:
+                print(f"ZoKrates {step} attempt {attempt + 1} failed, retrying:", result.summary())
+            await asyncio.sleep(zokrates_interface.RETRY_BACKOFF)
+    result.elapsed = time.monotonic() - start
+    if zokrates_interface.DEBUG_MODE:
+        if result.ok:
+            print(f"ZoKrates {step} output:", result.stdout)
+        else:
+            print(f"ZoKrates {step} failed:", result.summary())
+    return result
+
+
+"""
+Async counterparts of the run_zokrates_* wrappers
+
+Each coroutine takes the same arguments as its blocking counterpart in zokrates_interface.py (including timeout,
+retries and deadline) and resolves to the same ZokratesResult.
+"""
+async def run_zokrates_compile_async(circuit_path, output_path=None, abi_path=None, r1cs_path=None, cwd=None,
+                                     timeout=None, retries=None, deadline=None):
+    return await _run_zokrates_async(
+        "compile", zokrates_compile_command(circuit_path, output_path, abi_path, r1cs_path),
+        cwd, timeout, retries, deadline)
+
+async def run_zokrates_setup_async(program_path=None, proving_key_path=None, verification_key_path=None,
+                                   backend=None, proving_scheme=None, cwd=None,
+                                   timeout=None, retries=None, deadline=None):
+    return await _run_zokrates_async(
+        "setup",
+        zokrates_setup_command(program_path, proving_key_path, verification_key_path, backend, proving_scheme),
+        cwd, timeout, retries, deadline)
+
+async def run_zokrates_compute_witness_async(args, program_path=None, abi_path=None, witness_path=None, cwd=None,
+                                             timeout=None, retries=None, deadline=None):
+    return await _run_zokrates_async(
+        "compute-witness", zokrates_compute_witness_command(args, program_path, abi_path, witness_path),
+        cwd, timeout, retries, deadline)
+
+async def run_zokrates_generate_proof_async(program_path=None, witness_path=None, proving_key_path=None,
+                                            proof_path=None, backend=None, proving_scheme=None, cwd=None,
+                                            timeout=None, retries=None, deadline=None):
+    return await _run_zokrates_async(
+        "generate-proof",
+        zokrates_generate_proof_command(program_path, witness_path, proving_key_path, proof_path,
+                                        backend, proving_scheme),
+        cwd, timeout, retries, deadline)
+
+async def run_zokrates_verify_async(verification_key_path=None, proof_path=None, backend=None, cwd=None,
+                                    timeout=None, retries=None, deadline=None):
+    return await _run_zokrates_async(
+        "verify", zokrates_verify_command(verification_key_path, proof_path, backend),
+        cwd, timeout, retries, deadline, success_check=verify_output_passed)
+
+
+"""
+Function: prove_witness_isolated_async
+
+Async counterpart of zokrates_pool.prove_witness_isolated: witness, proof and verification in a private workspace.
+
+Args:
+    artifacts (dict): Circuit artifacts from get_circuit_artifacts.
+    args (list): Arguments to pass to the circuit's main function.
+    verify (bool): Whether to verify the proof after generating it (default True).
+    deadline_seconds (float, optional): Budget for the whole job; steps still running when it expires are killed.
+
+Returns:
+    dict: Same shape as zokrates_pool.prove_witness_isolated.
+"""
+async def prove_witness_isolated_async(artifacts, args, verify=True, deadline_seconds=None):
+    start = time.monotonic()
+    deadline = None if deadline_seconds is None else start + deadline_seconds
+    result = {"args": list(args), "proof": None, "verified": None, "failed_step": None, "error": None, "elapsed": 0.0}
+    with tempfile.TemporaryDirectory(prefix="zokrates-job-") as workdir:
+        witness_path = os.path.join(workdir, "witness")
+        proof_path = os.path.join(workdir, "proof.json")
+        step = await run_zokrates_compute_witness_async(
+            args, artifacts["program"], artifacts["abi"], witness_path, cwd=workdir, deadline=deadline)
+        if step:
+            step = await run_zokrates_generate_proof_async(
+                artifacts["program"], witness_path, artifacts["proving_key"], proof_path,
+                cwd=workdir, deadline=deadline)
+        if step:
+            with open(proof_path) as f:
+                result["proof"] = json.load(f)
+            if verify:
+                step = await run_zokrates_verify_async(
+                    artifacts["verification_key"], proof_path, cwd=workdir, deadline=deadline)
+                result["verified"] = bool(step)
+        if not step:
+            result["failed_step"] = step.step
+            result["error"] = step.as_dict()
+    result["elapsed"] = time.monotonic() - start
+    return result
+
+
+"""
+Function: prove_many_async
+
+Prove many witnesses concurrently on the running event loop (bounded by the concurrency limit).
+
+Args:
+    artifacts (dict): Circuit artifacts from get_circuit_artifacts.
+    arg_lists (list of list): One argument list per vehicle.
+    verify (bool): Whether each job verifies its own proof (default True).
+    deadline_seconds (float, optional): Per-job budget passed to prove_witness_isolated_async.
+
+Returns:
+    list of dict: One result per argument list, in input order.
+"""
+async def prove_many_async(artifacts, arg_lists, verify=True, deadline_seconds=None):
+    return await asyncio.gather(*(
+        prove_witness_isolated_async(artifacts, args, verify, deadline_seconds) for args in arg_lists
+    ))
+
+
+if __name__ == "__main__":
+    # Simple test: overlap several dummy.zok proofs on one event loop
+    from zokrates_cache import get_circuit_artifacts
+    artifacts = get_circuit_artifacts("dummy.zok")
+    if artifacts is None:
+        print("[ZoKrates Async] Compilation or setup failed.")
+    else:
+        results = asyncio.run(prove_many_async(artifacts, [[i, i + 1] for i in range(8)]))
+        for r in results:
+            print(f"[ZoKrates Async] args={r['args']} verified={r['verified']} failed_step={r['failed_step']}")
@@ -0,0 +1,169 @@
+"""
+zokrates_cache.py
+
+Purpose:
+    Provides a persistent, content-addressed store for the ZoKrates artifacts that only depend on the circuit
+    (compiled program, ABI, proving key and verification key), so compile and setup run once per circuit instead
+    of once per proof.
+
+Methodology:
+    - Hashes the .zok source together with the backend, proving scheme and ZoKrates version to form a cache key.
+    - Builds missing entries in a private temporary directory and atomically renames it into place, so concurrent
+      builders never observe a half-written entry.
+    - Returns absolute artifact paths that the witness/proof/verify wrappers in zokrates_interface.py accept.
+
+Note:
+    Only the top-level .zok file is hashed; circuits that import other .zok files must be cleared manually
+    (clear_circuit_cache) when an imported file changes.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+
+from zokrates_interface import run_zokrates_compile, run_zokrates_setup
+
+# Default cache location; override with the ZOKRATES_CACHE_DIR environment variable
+CACHE_DIR = os.environ.get(
+    "ZOKRATES_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".zokrates_cache")
+)
+
+# Artifact file names inside a cache entry (same names ZoKrates uses by default)
+ARTIFACT_FILES = {
+    "program": "out",
+    "abi": "abi.json",
+    "proving_key": "proving.key",
+    "verification_key": "verification.key",
+}
+
+_zokrates_version = None
+
+
+"""
+Function: get_zokrates_version
+
+Return the installed ZoKrates version string, queried once per process.
+
+Returns:
+    str: Output of `zokrates --version`, or "unknown" if it cannot be determined.
+"""
+def get_zokrates_version():
+    global _zokrates_version
+    if _zokrates_version is None:
+        try:
+            result = subprocess.run(["zokrates", "--version"], capture_output=True, text=True, check=True)
+            _zokrates_version = result.stdout.strip() or "unknown"
+        except Exception:
+            _zokrates_version = "unknown"
+    return _zokrates_version
+
+
+"""
+Function: circuit_cache_key
+
+Compute the cache key for a circuit and backend/scheme combination.
+
+Args:
+    circuit_path (str): Path to the ZoKrates .zok circuit file.
+    backend (str): Proving backend (e.g. "ark").
+    proving_scheme (str): Proving scheme (e.g. "g16").
+
+Returns:
+    str: Hex SHA-256 digest identifying the artifact set.
+"""
+def circuit_cache_key(circuit_path, backend="ark", proving_scheme="g16"):
+    digest = hashlib.sha256()
+    with open(circuit_path, "rb") as f:
+        digest.update(f.read())
+    for part in (backend, proving_scheme, get_zokrates_version()):
+        digest.update(b"\0" + part.encode())
+    return digest.hexdigest()
+
+
+"""
+Function: _artifact_paths
+
+Map artifact names to their paths inside a cache entry directory.
+"""
+def _artifact_paths(entry_dir):
+    return {name: os.path.join(entry_dir, filename) for name, filename in ARTIFACT_FILES.items()}
+
+
+"""
+Function: get_circuit_artifacts
+
+Return the compiled program, ABI and keys for a circuit, building them on the first request.
+
+Args:
+    circuit_path (str): Path to the ZoKrates .zok circuit file.
+    backend (str): Proving backend passed to setup (default "ark").
+    proving_scheme (str): Proving scheme passed to setup (default "g16").
+    cache_dir (str, optional): Cache root directory (default CACHE_DIR).
+
+Returns:
+    dict or None: Mapping of "program", "abi", "proving_key", "verification_key" to absolute paths,
+                  or None if compile or setup failed.
+
+Steps:
+1. Compute the cache key and return the existing entry if every artifact is present
+2. Otherwise compile and run setup into a temporary directory inside the cache root
+3. Rename the temporary directory into place (if another process won the race, use its entry)
+"""
+def get_circuit_artifacts(circuit_path, backend="ark", proving_scheme="g16", cache_dir=None):
+    cache_dir = os.path.abspath(cache_dir or CACHE_DIR)
+    entry_dir = os.path.join(cache_dir, circuit_cache_key(circuit_path, backend, proving_scheme))
+    paths = _artifact_paths(entry_dir)
+    if all(os.path.exists(path) for path in paths.values()):
+        return paths
+
+    os.makedirs(cache_dir, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=".build-", dir=cache_dir)
+    build_paths = _artifact_paths(build_dir)
+    try:
+        if not run_zokrates_compile(
+            circuit_path,
+            output_path=build_paths["program"],
+            abi_path=build_paths["abi"],
+            r1cs_path=os.path.join(build_dir, "out.r1cs"),
+        ):
+            return None
+        if not run_zokrates_setup(
+            program_path=build_paths["program"],
+            proving_key_path=build_paths["proving_key"],
+            verification_key_path=build_paths["verification_key"],
+            backend=backend,
+            proving_scheme=proving_scheme,
+        ):
+            return None
+        try:
+            os.rename(build_dir, entry_dir)
+        except OSError:
+            # Another process published the same entry first
+            if not all(os.path.exists(path) for path in paths.values()):
+                raise
+        return paths
+    finally:
+        if os.path.isdir(build_dir):
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+
+"""
+Function: clear_circuit_cache
+
+Delete every cached artifact set.
+
+Args:
+    cache_dir (str, optional): Cache root directory (default CACHE_DIR).
+"""
+def clear_circuit_cache(cache_dir=None):
+    shutil.rmtree(cache_dir or CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    # Simple test: the second lookup should be served from the cache
+    artifacts = get_circuit_artifacts("dummy.zok")
+    print(f"[ZoKrates Cache] Artifacts: {artifacts}")
+    print(f"[ZoKrates Cache] Cached on second lookup: {get_circuit_artifacts('dummy.zok') == artifacts}")
@@ -7,11 +7,17 @@ Purpose:
 Methodology:
     - Simulates ZKP generation by hashing OTP and timestamp.
     - Provides wrapper functions to compile ZoKrates circuits, set up keys, compute witnesses, generate proofs, and verify proofs using the ZoKrates CLI.
+    - Every CLI step runs with a per-step timeout (and optional overall deadline and bounded retries); a timed-out
+      step has its whole process tree killed, and each wrapper returns a structured ZokratesResult.
+    - Only transient failures (timeouts, processes killed by a signal) are retried; a deterministic failure such as
+      a compile error, an unsatisfied witness or a missing file is returned after the first attempt.
     - Designed to be used by Vehicle and RSU classes for proof generation and verification.
 """
 
 import subprocess       # For running ZoKrates CLI commands
 import os               # For file path operations (if needed)
+import signal           # For killing timed-out ZoKrates process groups
+import time             # For timeouts, deadlines and elapsed-time measurement
 
 DEBUG_MODE = False
 
@@ -20,7 +26,80 @@ def set_debug_mode(enabled: bool):
     global DEBUG_MODE
     DEBUG_MODE = enabled
 
-def cleanup_zokrates_files():
+"""
+Function: _optional_flags
+
+Build the CLI flag list for the optional path/option arguments that were actually provided.
+
+Args:
+    pairs (list of tuple): (flag (str), value (str or None)) pairs.
+
+Returns:
+    list of str: Flags and values, skipping any pair whose value is None so the ZoKrates default applies.
+"""
+def _optional_flags(pairs):
+    flags = []
+    for flag, value in pairs:
+        if value is not None:
+            flags += [flag, str(value)]
+    return flags
+
+
+"""
+Command builders
+
+Build the argument list for each ZoKrates CLI step. Shared by the blocking wrappers below and the asyncio
+wrappers in zokrates_async.py so both always invoke ZoKrates identically. Arguments mirror the run_zokrates_* functions.
+"""
+def zokrates_compile_command(circuit_path, output_path=None, abi_path=None, r1cs_path=None):
+    return ["zokrates", "compile", "-i", circuit_path] + _optional_flags(
+        [("-o", output_path), ("-s", abi_path), ("-r", r1cs_path)]
+    )
+
+def zokrates_setup_command(program_path=None, proving_key_path=None, verification_key_path=None,
+                           backend=None, proving_scheme=None):
+    return ["zokrates", "setup"] + _optional_flags([
+        ("-i", program_path),
+        ("-p", proving_key_path),
+        ("-v", verification_key_path),
+        ("-b", backend),
+        ("-s", proving_scheme),
+    ])
+
+def zokrates_compute_witness_command(args, program_path=None, abi_path=None, witness_path=None):
+    return (["zokrates", "compute-witness"]
+            + _optional_flags([("-i", program_path), ("-s", abi_path), ("-o", witness_path)])
+            + ["-a"] + [str(arg) for arg in args])
+
+def zokrates_generate_proof_command(program_path=None, witness_path=None, proving_key_path=None,
+                                    proof_path=None, backend=None, proving_scheme=None):
+    return ["zokrates", "generate-proof"] + _optional_flags([
+        ("-i", program_path),
+        ("-w", witness_path),
+        ("-p", proving_key_path),
+        ("-j", proof_path),
+        ("-b", backend),
+        ("-s", proving_scheme),
+    ])
+
+def zokrates_verify_command(verification_key_path=None, proof_path=None, backend=None):
+    return ["zokrates", "verify"] + _optional_flags(
+        [("-v", verification_key_path), ("-j", proof_path), ("-b", backend)]
+    )
+
+"""Return True if `zokrates verify` output reports a valid proof."""
+def verify_output_passed(stdout):
+    return ("Proof is valid" in stdout) or ("PASSED" in stdout)
+
+"""
+Function: cleanup_zokrates_files
+
+Remove the default-named ZoKrates artifacts from a directory.
+
+Args:
+    directory (str): Directory to clean (default: current directory). Isolated jobs pass their own workspace.
+"""
+def cleanup_zokrates_files(directory="."):
     files_to_remove = [
         "out",
         "out.r1cs",
@@ -32,11 +111,214 @@ def cleanup_zokrates_files():
         "abi.json"
     ]
     for filename in files_to_remove:
-        if os.path.exists(filename):
-            os.remove(filename)
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            os.remove(path)
             if DEBUG_MODE:
                 print(f"Removed {filename}")
 
+"""
+ZokratesResult Class
+
+Structured outcome of one ZoKrates CLI step.
+
+Functionality:
+    - Evaluates truthy only when the step succeeded, so existing `if not run_zokrates_...():` callers keep working.
+    - Records the step name, exit code, stdout/stderr, elapsed wall time, attempts used and whether a deadline expired.
+
+Usage:
+    result = run_zokrates_generate_proof(timeout=30)
+    if not result:
+        print(result.summary())
+"""
+class ZokratesResult:
+
+    def __init__(self, step, ok, returncode=None, stdout="", stderr="", elapsed=0.0, attempts=0,
+                 timed_out=False, error=None):
+        self.step = step                    # ZoKrates sub-command, e.g. "generate-proof"
+        self.ok = ok                        # True if the step succeeded
+        self.returncode = returncode        # Exit code of the last attempt (None if killed or never started)
+        self.stdout = stdout                # Captured stdout of the last attempt
+        self.stderr = stderr                # Captured stderr of the last attempt
+        self.elapsed = elapsed              # Total wall time across all attempts, in seconds
+        self.attempts = attempts            # Number of processes started
+        self.timed_out = timed_out          # True if the last attempt hit its timeout or the deadline
+        self.error = error                  # Launch error message (e.g. ZoKrates not installed)
+
+    def __bool__(self):
+        return self.ok
+
+    def __repr__(self):
+        return f"ZokratesResult({self.summary()})"
+
+    """Return True if the failure may not recur on retry: a timeout, or a process killed by a signal."""
+    def is_transient(self):
+        if self.ok or self.error:
+            return False
+        return (self.timed_out or (self.returncode is not None and self.returncode < 0)
+                or self.returncode in TRANSIENT_EXIT_CODES)
+
+    """Return a one-line description of the outcome."""
+    def summary(self):
+        if self.ok:
+            return f"{self.step} succeeded in {self.elapsed:.2f}s"
+        if self.error:
+            return f"{self.step} failed: {self.error}"
+        if self.timed_out:
+            return f"{self.step} timed out after {self.elapsed:.2f}s ({self.attempts} attempt(s))"
+        detail = self.stderr.strip().splitlines()[-1] if self.stderr.strip() else "no stderr"
+        return f"{self.step} exited with code {self.returncode} after {self.attempts} attempt(s): {detail}"
+
+    """Return the result as a plain dict (e.g. for JSON output or passing between processes)."""
+    def as_dict(self):
+        return {
+            "step": self.step,
+            "ok": self.ok,
+            "returncode": self.returncode,
+            "stderr": self.stderr,
+            "elapsed": self.elapsed,
+            "attempts": self.attempts,
+            "timed_out": self.timed_out,
+            "error": self.error,
+            "summary": self.summary(),
+        }
+
+
+# Per-attempt timeout (seconds) for each step; None disables the timeout for that step
+DEFAULT_TIMEOUTS = {
+    "compile": 120.0,
+    "setup": 300.0,
+    "compute-witness": 60.0,
+    "generate-proof": 120.0,
+    "verify": 30.0,
+}
+# Extra attempts after a transient failure (timeout or kill); deterministic failures are never retried
+DEFAULT_RETRIES = 0
+# Exit codes of a killed process as reported through a shell or container runtime (128 + SIGKILL / SIGTERM)
+TRANSIENT_EXIT_CODES = frozenset({137, 143})
+# Pause between attempts, in seconds
+RETRY_BACKOFF = 0.5
+
+
+"""
+Function: step_timeout
+
+Resolve the timeout for one attempt from the per-step default, an explicit override and an absolute deadline.
+
+Args:
+    step (str): Step name (key of DEFAULT_TIMEOUTS).
+    timeout (float, optional): Explicit per-attempt timeout; None uses DEFAULT_TIMEOUTS[step].
+    deadline (float, optional): Absolute time.monotonic() value by which the step must finish.
+
+Returns:
+    float or None: Seconds allowed for the attempt (may be <= 0 if the deadline already passed), or None for no limit.
+"""
+def step_timeout(step, timeout=None, deadline=None):
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUTS.get(step)
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        timeout = remaining if timeout is None else min(timeout, remaining)
+    return timeout
+
+
+"""
+Function: new_process_group_kwargs
+
+Popen keyword arguments that start the child in its own process group, so the whole tree can be killed at once.
+"""
+def new_process_group_kwargs():
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+"""
+Function: kill_process_tree
+
+Forcefully terminate a process and every process it started.
+
+Args:
+    pid (int): PID of a process started with new_process_group_kwargs().
+"""
+def kill_process_tree(pid):
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True)
+        else:
+            os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass                                # Already exited
+
+
+"""
+Function: run_zokrates_step
+
+Run one ZoKrates command with a per-attempt timeout, an optional overall deadline and bounded retries.
+
+Args:
+    step (str): Step name, e.g. "generate-proof".
+    command (list of str): Full ZoKrates command line.
+    cwd (str, optional): Working directory for the ZoKrates process.
+    timeout (float, optional): Per-attempt timeout in seconds (default DEFAULT_TIMEOUTS[step]).
+    retries (int, optional): Extra attempts after a transient failure (default DEFAULT_RETRIES).
+    deadline (float, optional): Absolute time.monotonic() value after which no attempt may run.
+    success_check (callable, optional): Extra check on stdout for a zero exit code (used by verify).
+
+Returns:
+    ZokratesResult: Structured outcome (truthy on success).
+
+Steps:
+1. Stop if the deadline has already passed
+2. Start ZoKrates in its own process group and wait up to the attempt timeout
+3. On timeout, kill the whole process tree and collect whatever output exists
+4. Return on success or on a deterministic failure (see ZokratesResult.is_transient)
+5. Otherwise retry (after a short backoff) while attempts and deadline allow
+"""
+def run_zokrates_step(step, command, cwd=None, timeout=None, retries=None, deadline=None, success_check=None):
+    retries = DEFAULT_RETRIES if retries is None else retries
+    result = ZokratesResult(step, False)
+    start = time.monotonic()
+    for attempt in range(retries + 1):
+        attempt_timeout = step_timeout(step, timeout, deadline)
+        if attempt_timeout is not None and attempt_timeout <= 0:
+            result.timed_out = True
+            break
+        result.attempts = attempt + 1
+        result.timed_out = False
+        try:
+            process = subprocess.Popen(
+                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=cwd,
+                **new_process_group_kwargs()
+            )
+        except OSError as e:
+            result.error = str(e)           # Retrying cannot fix a missing executable
+            break
+        try:
+            stdout, stderr = process.communicate(timeout=attempt_timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_tree(process.pid)
+            stdout, stderr = process.communicate()
+            result.timed_out = True
+        result.returncode = None if result.timed_out else process.returncode
+        result.stdout, result.stderr = stdout, stderr
+        result.ok = (not result.timed_out and process.returncode == 0
+                     and (success_check is None or success_check(stdout)))
+        if result.ok or not result.is_transient():
+            break
+        if attempt < retries:
+            if DEBUG_MODE:
+                print(f"ZoKrates {step} attempt {attempt + 1} failed, retrying:", result.summary())
+            time.sleep(RETRY_BACKOFF)
+    result.elapsed = time.monotonic() - start
+    if DEBUG_MODE:
+        if result.ok:
+            print(f"ZoKrates {step} output:", result.stdout)
+        else:
+            print(f"ZoKrates {step} failed:", result.summary())
+    return result
+
+
 """
 Function: run_zokrates_compile
 
@@ -44,32 +326,24 @@ Compile a ZoKrates circuit file.
 
 Args:
     circuit_path (str): Path to the ZoKrates .zok circuit file.
+    output_path (str, optional): Path of the compiled program (ZoKrates default: out).
+    abi_path (str, optional): Path of the ABI specification (ZoKrates default: abi.json).
+    r1cs_path (str, optional): Path of the R1CS file (ZoKrates default: out.r1cs).
+    cwd (str, optional): Working directory for the ZoKrates process (default: current directory).
+    timeout, retries, deadline: See run_zokrates_step.
     
 Returns:
-    bool: True if compilation succeeds, False otherwise.
+    ZokratesResult: Truthy if compilation succeeds; carries exit code, stderr and timing otherwise.
     
 Side Effects:
-    Prints ZoKrates CLI output or error message.
-    
-Steps:
-1. Run the ZoKrates compile command with the given circuit file
-2. Print the output from ZoKrates
-3. Return True if successful, otherwise print error and return False
+    Prints ZoKrates CLI output or error message in debug mode.
 """
-def run_zokrates_compile(circuit_path):
-    try:
-        # Run the ZoKrates compile command with the given circuit file
-        result = subprocess.run(
-            ["zokrates", "compile", "-i", circuit_path],
-            capture_output=True, text=True, check=True
-        )
-        if DEBUG_MODE:
-            print("ZoKrates compile output:", result.stdout)
-        return True
-    except Exception as e:
-        if DEBUG_MODE:
-            print("ZoKrates compile failed:", e)
-        return False
+def run_zokrates_compile(circuit_path, output_path=None, abi_path=None, r1cs_path=None, cwd=None,
+                         timeout=None, retries=None, deadline=None):
+    return run_zokrates_step(
+        "compile", zokrates_compile_command(circuit_path, output_path, abi_path, r1cs_path),
+        cwd=cwd, timeout=timeout, retries=retries, deadline=deadline
+    )
 
 
 """
@@ -77,31 +351,28 @@ Function: run_zokrates_setup
 
 Run ZoKrates setup to generate proving and verification keys.
 
+Args:
+    program_path (str, optional): Path of the compiled program (ZoKrates default: out).
+    proving_key_path (str, optional): Where to write the proving key (ZoKrates default: proving.key).
+    verification_key_path (str, optional): Where to write the verification key (ZoKrates default: verification.key).
+    backend (str, optional): Proving backend, e.g. "ark" or "bellman".
+    proving_scheme (str, optional): Proving scheme, e.g. "g16".
+    cwd (str, optional): Working directory for the ZoKrates process (default: current directory).
+    timeout, retries, deadline: See run_zokrates_step.
+
 Returns:
-    bool: True if setup succeeds, False otherwise.
+    ZokratesResult: Truthy if setup succeeds.
     
 Side Effects:
-    Prints ZoKrates CLI output or error message.
-    
-Steps:
-1. Run the ZoKrates setup command
-2. Print the output from ZoKrates
-3. Return True if successful, otherwise print error and return False
+    Prints ZoKrates CLI output or error message in debug mode.
 """
-def run_zokrates_setup():
-    try:
-        # Run the ZoKrates setup command
-        result = subprocess.run(
-            ["zokrates", "setup"],
-            capture_output=True, text=True, check=True
-        )
-        if DEBUG_MODE:
-            print("ZoKrates setup output:", result.stdout)
-        return True
-    except Exception as e:
-        if DEBUG_MODE:
-            print("ZoKrates setup failed:", e)
-        return False
+def run_zokrates_setup(program_path=None, proving_key_path=None, verification_key_path=None,
+                       backend=None, proving_scheme=None, cwd=None, timeout=None, retries=None, deadline=None):
+    return run_zokrates_step(
+        "setup",
+        zokrates_setup_command(program_path, proving_key_path, verification_key_path, backend, proving_scheme),
+        cwd=cwd, timeout=timeout, retries=retries, deadline=deadline
+    )
 
 
 """
@@ -111,31 +382,24 @@ Compute the witness for a ZoKrates circuit.
 
 Args:
     args (list of str): Arguments to pass to the circuit (e.g., private/public inputs).
+    program_path (str, optional): Path of the compiled program (ZoKrates default: out).
+    abi_path (str, optional): Path of the ABI specification (ZoKrates default: abi.json).
+    witness_path (str, optional): Where to write the witness (ZoKrates default: witness).
+    cwd (str, optional): Working directory for the ZoKrates process (default: current directory).
+    timeout, retries, deadline: See run_zokrates_step.
     
 Returns:
-    bool: True if witness computation succeeds, False otherwise.
+    ZokratesResult: Truthy if witness computation succeeds.
     
 Side Effects:
-    Prints ZoKrates CLI output or error message.
-Steps:
-1. Run the ZoKrates compute-witness command with arguments
-2. Print the output from ZoKrates
-3. Return True if successful, otherwise print error and return False
+    Prints ZoKrates CLI output or error message in debug mode.
 """
-def run_zokrates_compute_witness(args):
-    try:
-        # Run the ZoKrates compute-witness command with arguments
-        result = subprocess.run(
-            ["zokrates", "compute-witness", "-a"] + args,
-            capture_output=True, text=True, check=True
-        )
-        if DEBUG_MODE:
-            print("ZoKrates compute-witness output:", result.stdout)
-        return True
-    except Exception as e:
-        if DEBUG_MODE:
-            print("ZoKrates compute-witness failed:", e)
-        return False
+def run_zokrates_compute_witness(args, program_path=None, abi_path=None, witness_path=None, cwd=None,
+                                 timeout=None, retries=None, deadline=None):
+    return run_zokrates_step(
+        "compute-witness", zokrates_compute_witness_command(args, program_path, abi_path, witness_path),
+        cwd=cwd, timeout=timeout, retries=retries, deadline=deadline
+    )
 
 
 """
@@ -143,31 +407,31 @@ Function: run_zokrates_generate_proof
 
 Generate a ZoKrates proof using the computed witness and setup keys.
 
+Args:
+    program_path (str, optional): Path of the compiled program (ZoKrates default: out).
+    witness_path (str, optional): Path of the witness file (ZoKrates default: witness).
+    proving_key_path (str, optional): Path of the proving key (ZoKrates default: proving.key).
+    proof_path (str, optional): Where to write the JSON proof (ZoKrates default: proof.json).
+    backend (str, optional): Proving backend, e.g. "ark" or "bellman".
+    proving_scheme (str, optional): Proving scheme, e.g. "g16".
+    cwd (str, optional): Working directory for the ZoKrates process (default: current directory).
+    timeout, retries, deadline: See run_zokrates_step.
+
 Returns:
-    bool: True if proof generation succeeds, False otherwise.
+    ZokratesResult: Truthy if proof generation succeeds.
     
 Side Effects:
-    Prints ZoKrates CLI output or error message.
-    
-Steps:
-1. Run the ZoKrates generate-proof command
-2. Print the output from ZoKrates
-3. Return True if successful, otherwise print error and return False
+    Prints ZoKrates CLI output or error message in debug mode.
 """
-def run_zokrates_generate_proof():
-    try:
-        # Run the ZoKrates generate-proof command
-        result = subprocess.run(
-            ["zokrates", "generate-proof"],
-            capture_output=True, text=True, check=True
-        )
-        if DEBUG_MODE:
-            print("ZoKrates generate-proof output:", result.stdout)
-        return True
-    except Exception as e:
-        if DEBUG_MODE:
-            print("ZoKrates generate-proof failed:", e)
-        return False
+def run_zokrates_generate_proof(program_path=None, witness_path=None, proving_key_path=None,
+                                proof_path=None, backend=None, proving_scheme=None, cwd=None,
+                                timeout=None, retries=None, deadline=None):
+    return run_zokrates_step(
+        "generate-proof",
+        zokrates_generate_proof_command(program_path, witness_path, proving_key_path, proof_path,
+                                        backend, proving_scheme),
+        cwd=cwd, timeout=timeout, retries=retries, deadline=deadline
+    )
 
 
 """
@@ -175,32 +439,25 @@ Function: run_zokrates_verify
 
 Verify a ZoKrates proof using the verification key.
 
+Args:
+    verification_key_path (str, optional): Path of the verification key (ZoKrates default: verification.key).
+    proof_path (str, optional): Path of the JSON proof (ZoKrates default: proof.json).
+    backend (str, optional): Proving backend, e.g. "ark" or "bellman".
+    cwd (str, optional): Working directory for the ZoKrates process (default: current directory).
+    timeout, retries, deadline: See run_zokrates_step.
+
 Returns:
-    bool: True if the proof is valid, False otherwise.
+    ZokratesResult: Truthy if ZoKrates exits cleanly and its output contains the success message.
     
 Side Effects:
-    Prints ZoKrates CLI output or error message.
-    
-Steps:
-1. Run the ZoKrates verify command
-2. Print the output from ZoKrates
-3. Return True if the output contains the success message, otherwise print error and return False
+    Prints ZoKrates CLI output or error message in debug mode.
 """
-def run_zokrates_verify():
-    try:
-        # Run the ZoKrates verify command
-        result = subprocess.run(
-            ["zokrates", "verify"],
-            capture_output=True, text=True, check=True
-        )
-        if DEBUG_MODE:
-            print("ZoKrates verify output:", result.stdout)
-        # Check if the output contains the success message
-        return ("Proof is valid" in result.stdout) or ("PASSED" in result.stdout)
-    except Exception as e:
-        if DEBUG_MODE:
-            print("ZoKrates verify failed:", e)
-        return False
+def run_zokrates_verify(verification_key_path=None, proof_path=None, backend=None, cwd=None,
+                        timeout=None, retries=None, deadline=None):
+    return run_zokrates_step(
+        "verify", zokrates_verify_command(verification_key_path, proof_path, backend),
+        cwd=cwd, timeout=timeout, retries=retries, deadline=deadline, success_check=verify_output_passed
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+"""
+zokrates_pool.py
+
+Purpose:
+    Runs ZoKrates witness computation, proof generation and verification in isolated per-job workspaces, and proves
+    many vehicles' witnesses in parallel across a process pool.
+
+Methodology:
+    - Each job gets its own temporary directory; the ZoKrates process runs inside it with explicit paths for the
+      witness and proof, so no two jobs share a file name and cleanup never touches another job's files.
+    - The compiled program and keys are read-only and shared by every job (see zokrates_cache.py).
+    - Proving is CPU-bound, so jobs are spread over a ProcessPoolExecutor (one worker per core by default).
+    - An optional per-job deadline bounds each job end to end; a job that cannot finish in time is abandoned
+      and reports which step failed and why.
+"""
+
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from zokrates_interface import (
+    run_zokrates_compute_witness,
+    run_zokrates_generate_proof,
+    run_zokrates_verify
+)
+from zokrates_cache import get_circuit_artifacts
+
+
+"""
+Function: prove_witness_isolated
+
+Compute a witness, generate a proof and (optionally) verify it inside a private scratch directory.
+
+Args:
+    artifacts (dict): Circuit artifacts from get_circuit_artifacts ("program", "abi", "proving_key", "verification_key").
+    args (list of str): Arguments to pass to the circuit's main function.
+    verify (bool): Whether to verify the proof after generating it (default True).
+    deadline_seconds (float, optional): Budget for the whole job; steps still running when it expires are killed.
+
+Returns:
+    dict: {"args": list, "proof": dict or None, "verified": bool or None, "failed_step": str or None,
+           "error": dict or None (ZokratesResult.as_dict() of the failed step), "elapsed": float}
+
+Steps:
+1. Create a temporary workspace for this job
+2. Compute the witness into the workspace
+3. Generate the proof into the workspace and load it
+4. Verify the proof if requested
+5. Remove the workspace
+"""
+def prove_witness_isolated(artifacts, args, verify=True, deadline_seconds=None):
+    start = time.monotonic()
+    deadline = None if deadline_seconds is None else start + deadline_seconds
+    result = {"args": list(args), "proof": None, "verified": None, "failed_step": None, "error": None, "elapsed": 0.0}
+    with tempfile.TemporaryDirectory(prefix="zokrates-job-") as workdir:
+        witness_path = os.path.join(workdir, "witness")
+        proof_path = os.path.join(workdir, "proof.json")
+        step = run_zokrates_compute_witness(
+            [str(arg) for arg in args],
+            program_path=artifacts["program"],
+            abi_path=artifacts["abi"],
+            witness_path=witness_path,
+            cwd=workdir,
+            deadline=deadline,
+        )
+        if step:
+            step = run_zokrates_generate_proof(
+                program_path=artifacts["program"],
+                witness_path=witness_path,
+                proving_key_path=artifacts["proving_key"],
+                proof_path=proof_path,
+                cwd=workdir,
+                deadline=deadline,
+            )
+        if step:
+            with open(proof_path) as f:
+                result["proof"] = json.load(f)
+            if verify:
+                step = run_zokrates_verify(
+                    verification_key_path=artifacts["verification_key"],
+                    proof_path=proof_path,
+                    cwd=workdir,
+                    deadline=deadline,
+                )
+                result["verified"] = bool(step)
+        if not step:
+            result["failed_step"] = step.step
+            result["error"] = step.as_dict()
+    result["elapsed"] = time.monotonic() - start
+    return result
+
+
+"""
+Function: prove_many
+
+Prove many witnesses for the same circuit in parallel, one isolated workspace per job.
+
+Args:
+    circuit_path (str): Path to the ZoKrates .zok circuit file (compiled and set up once via the cache).
+    arg_lists (list of list): One argument list per vehicle.
+    max_workers (int, optional): Number of worker processes (default: os.cpu_count()).
+    verify (bool): Whether each job verifies its own proof (default True).
+    deadline_seconds (float, optional): Per-job budget passed to prove_witness_isolated.
+
+Returns:
+    list of dict or None: One prove_witness_isolated result per argument list, in input order,
+                          or None if the circuit could not be compiled/set up.
+"""
+def prove_many(circuit_path, arg_lists, max_workers=None, verify=True, deadline_seconds=None):
+    artifacts = get_circuit_artifacts(circuit_path)
+    if artifacts is None:
+        return None
+    arg_lists = list(arg_lists)
+    if not arg_lists:
+        return []
+    max_workers = min(max_workers or os.cpu_count() or 1, len(arg_lists))
+    job = partial(prove_witness_isolated, artifacts, verify=verify, deadline_seconds=deadline_seconds)
+    if max_workers == 1:
+        return [job(args) for args in arg_lists]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(job, arg_lists))
+
+
+if __name__ == "__main__":
+    # Simple test: prove four dummy.zok witnesses in parallel
+    results = prove_many("dummy.zok", [[i, i + 1] for i in range(4)])
+    if results is None:
+        print("[ZoKrates Pool] Compilation or setup failed.")
+    else:
+        for r in results:
+            print(f"[ZoKrates Pool] args={r['args']} verified={r['verified']} failed_step={r['failed_step']} "
+                  f"elapsed={r['elapsed']:.2f}s")
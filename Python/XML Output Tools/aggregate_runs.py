@@ -0,0 +1,244 @@
+"""
+aggregate_runs.py
+
+Purpose:
+    Finds every SUMO tripinfo and stopinfo output under a directory tree, parses them in parallel and prints a
+    merged per-scenario summary table (trip counts, travel time, delay, throughput, stops), so runs and parameter
+    sweeps can be compared side by side.
+
+Methodology:
+    - Discovery walks the tree and identifies outputs by their root element (sumo_output.detect_kind), so file
+      names do not matter; a scenario is the directory an output sits in.
+    - Every file is one task in a process pool. Tasks are submitted largest file first so a big output does not
+      start last and leave the other workers idle; with many files the run scales with the number of cores.
+    - Workers return compact per-file arrays (durations, time losses, ...) rather than records; the parent merges
+      them per scenario and computes means and percentiles over all trips of the scenario.
+    - With --cache-dir the workers go through the columnar cache (output_cache.py), so re-running a sweep only
+      re-parses outputs that changed.
+    - Throughput is completed trips per hour between the first departure and the last arrival.
+    - A file that fails to parse (truncated run, corrupt gzip, ...) is reported with its error and left out; the
+      remaining files are still summarized.
+
+Usage:
+    python aggregate_runs.py ../../SUMO --workers 8 --csv summary.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from output_cache import build_columns, load_columns
+from sumo_output import detect_kind
+
+AGGREGATED_KINDS = ("tripinfo", "stopinfo")
+OUTPUT_SUFFIXES = (".xml", ".xml.gz")
+TABLE_COLUMNS = (
+    ("scenario", "Scenario", "{}"),
+    ("trips", "Trips", "{:d}"),
+    ("travel_time_mean", "TT mean", "{:.1f}"),
+    ("travel_time_p50", "TT p50", "{:.1f}"),
+    ("travel_time_p95", "TT p95", "{:.1f}"),
+    ("delay_mean", "Delay mean", "{:.1f}"),
+    ("delay_p95", "Delay p95", "{:.1f}"),
+    ("waiting_mean", "Wait mean", "{:.1f}"),
+    ("throughput_per_hour", "Veh/h", "{:.0f}"),
+    ("stops", "Stops", "{:d}"),
+    ("stop_duration_mean", "Stop mean", "{:.1f}"),
+)
+
+
+"""
+Function: find_outputs
+
+Walk a directory tree and return every aggregatable SUMO output.
+
+Args:
+    root (str): Directory to search.
+    kinds (tuple of str): Output kinds to keep (default AGGREGATED_KINDS).
+
+Returns:
+    list of tuple: (path, kind) pairs, sorted by path.
+"""
+def find_outputs(root, kinds=AGGREGATED_KINDS):
+    outputs = []
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if not name.endswith(OUTPUT_SUFFIXES):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                kind = detect_kind(path)
+            except (ValueError, ET.ParseError, OSError, EOFError):
+                continue                                    # Not a SUMO output (network, routes, config, ...)
+            if kind in kinds:
+                outputs.append((path, kind))
+    return sorted(outputs)
+
+
+"""
+Function: summarize_file
+
+Worker task: load one output and return the per-record arrays the scenario summary is built from.
+
+Args:
+    path (str): Output file.
+    kind (str): "tripinfo" or "stopinfo".
+    cache_dir (str, optional): Columnar cache directory; without it the file is parsed directly.
+
+Returns:
+    dict: path, kind and numpy arrays (tripinfo: duration, time_loss, waiting_time, depart, arrival;
+          stopinfo: duration).
+"""
+def summarize_file(path, kind, cache_dir=None):
+    columns = load_columns(path, kind, cache_dir=cache_dir) if cache_dir else build_columns(path, kind)
+    if kind == "tripinfo":
+        arrays = {name: columns[name] for name in ("duration", "time_loss", "waiting_time", "depart", "arrival")}
+    else:
+        arrays = {"duration": columns["ended"] - columns["started"]}
+    return {"path": path, "kind": kind, "arrays": arrays}
+
+
+"""
+Function: _stat
+
+Mean or percentile of an array ignoring NaN (None when there is no data).
+"""
+def _stat(values, percentile=None):
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return None
+    return float(values.mean() if percentile is None else np.percentile(values, percentile))
+
+
+"""
+Function: summarize_scenario
+
+Merge the per-file results of one scenario into a summary row.
+
+Returns:
+    dict: One value per TABLE_COLUMNS key (None where the scenario has no data for it), plus "files".
+"""
+def summarize_scenario(scenario, results):
+    def merged(kind, name):
+        parts = [result["arrays"][name] for result in results if result["kind"] == kind]
+        return np.concatenate(parts) if parts else np.empty(0)
+
+    durations = merged("tripinfo", "duration")
+    time_loss = merged("tripinfo", "time_loss")
+    departs = merged("tripinfo", "depart")
+    arrivals = merged("tripinfo", "arrival")
+    stop_durations = merged("stopinfo", "duration")
+    span = (np.nanmax(arrivals) - np.nanmin(departs)) if len(durations) else 0.0
+    return {
+        "scenario": scenario,
+        "files": len(results),
+        "trips": int(len(durations)),
+        "travel_time_mean": _stat(durations),
+        "travel_time_p50": _stat(durations, 50),
+        "travel_time_p95": _stat(durations, 95),
+        "delay_mean": _stat(time_loss),
+        "delay_p95": _stat(time_loss, 95),
+        "waiting_mean": _stat(merged("tripinfo", "waiting_time")),
+        "throughput_per_hour": len(durations) / span * 3600 if span > 0 else None,
+        "stops": int(len(stop_durations)),
+        "stop_duration_mean": _stat(stop_durations),
+    }
+
+
+"""
+Function: aggregate
+
+Find, parse and summarize every scenario under a directory tree.
+
+Args:
+    root (str): Directory to search.
+    max_workers (int, optional): Worker processes (default: one per CPU).
+    cache_dir (str, optional): Columnar cache directory shared by the workers.
+
+Returns:
+    tuple: (rows, failures) - one summary row per scenario, sorted by scenario path, and a sorted list of
+           (path, error message) for the files that could not be summarized.
+
+Steps:
+1. Discover outputs and submit one task per file, largest first
+2. Collect per-file arrays as they complete, grouped by scenario directory; record failed files and go on
+3. Merge each scenario's files into one summary row
+"""
+def aggregate(root, max_workers=None, cache_dir=None):
+    outputs = find_outputs(root)
+    outputs.sort(key=lambda output: os.path.getsize(output[0]), reverse=True)
+    by_scenario = {}
+    failures = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(summarize_file, path, kind, cache_dir): path for path, kind in outputs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                failures.append((futures[future], f"{type(e).__name__}: {e}"))
+                continue
+            scenario = os.path.relpath(os.path.dirname(result["path"]), root)
+            by_scenario.setdefault(scenario, []).append(result)
+    rows = [summarize_scenario(scenario, results) for scenario, results in sorted(by_scenario.items())]
+    return rows, sorted(failures)
+
+
+"""
+Function: print_table
+
+Print summary rows as an aligned text table ("-" for missing values).
+"""
+def print_table(rows):
+    cells = [[header for _, header, _ in TABLE_COLUMNS]]
+    for row in rows:
+        cells.append([("-" if row[key] is None else fmt.format(row[key])) for key, _, fmt in TABLE_COLUMNS])
+    widths = [max(len(line[i]) for line in cells) for i in range(len(TABLE_COLUMNS))]
+    for line in cells:
+        print("  ".join(cell.ljust(width) if i == 0 else cell.rjust(width)
+                        for i, (cell, width) in enumerate(zip(line, widths))))
+
+
+"""
+Function: main
+
+Command-line entry point.
+"""
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize every SUMO run under a directory tree.")
+    parser.add_argument("root", help="Directory to search for tripinfo/stopinfo outputs")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--cache-dir", help="Columnar cache directory (re-runs only parse changed outputs)")
+    parser.add_argument("--csv", help="Also write the table to this CSV file")
+    parser.add_argument("--json", help="Also write the rows to this JSON file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows, failures = aggregate(args.root, args.workers, args.cache_dir)
+    elapsed = time.perf_counter() - start
+    print_table(rows)
+    print(f"\n[Aggregate] {len(rows)} scenarios, {sum(row['files'] for row in rows)} outputs in {elapsed:.2f}s")
+    if failures:
+        print(f"[Aggregate] {len(failures)} outputs failed:")
+        for path, error in failures:
+            print(f"    {path}: {error}")
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["scenario"])
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    # Simple test: python aggregate_runs.py ../../SUMO
+    sys.exit(main())
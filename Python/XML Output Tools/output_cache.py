@@ -0,0 +1,278 @@
+"""
+output_cache.py
+
+Purpose:
+    Columnar NumPy cache of SUMO outputs, so repeated analysis of the same run (tripinfo durations, waiting times,
+    time losses, route lengths, detector flows, ...) loads arrays in milliseconds instead of re-parsing XML.
+
+Methodology:
+    - The first load streams the output through sumo_output.py and builds one array per record field:
+      float fields become float64 (missing values are NaN), int fields int64 (missing values are MISSING_INT,
+      the int64 minimum, since -1 is a real value of e.g. lane-change directions), and
+      string fields (IDs, lanes, vTypes) are dictionary-encoded as int32 codes into a vocabulary array
+      (missing values are code -1). "x,y" positions become two float64 columns, <field>_x and <field>_y.
+      Nested recognition points in bt output are not cached.
+    - Columns are built in compact `array` buffers while streaming, so conversion memory stays close to the
+      size of the final arrays.
+    - The arrays and the source's SHA-256, size and mtime are written to an uncompressed .npz next to the source
+      (or in cache_dir), atomically via a temporary file and os.replace.
+    - A cache is valid when its recorded hash matches the source. When size and mtime are unchanged the hash is
+      trusted without re-reading the source, so a warm load never touches the XML; a touched file is re-hashed and
+      only rebuilt if its content actually changed.
+
+Usage:
+    trips = load_columns("tripinfos.xml")
+    trips.distribution("time_loss")
+    trips["vtype"]                      # decoded string column
+"""
+
+import hashlib
+import os
+from array import array
+
+import numpy as np
+
+from sumo_output import READERS, RECORD_TYPES, detect_kind
+
+CACHE_VERSION = 2                   # Bump when the cache layout changes
+MISSING_INT = -(1 << 63)            # Marks a missing value in an int64 column
+HASH_CHUNK_SIZE = 1 << 20           # Bytes read per step when hashing a source file
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+
+"""
+Function: file_digest
+
+SHA-256 of a file, read in HASH_CHUNK_SIZE chunks.
+"""
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+"""
+Function: cache_path
+
+Path of the cache file for a source output.
+
+Args:
+    path (str): Source output file.
+    kind (str): Output kind (see sumo_output.READERS).
+    cache_dir (str, optional): Directory for cache files (default: next to the source).
+"""
+def cache_path(path, kind, cache_dir=None):
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(cache_dir or directory, f"{name}.{kind}.npz")
+
+
+"""
+Function: build_columns
+
+Stream an output and convert it to columnar arrays.
+
+Args:
+    path (str): Source output file.
+    kind (str): Output kind.
+
+Returns:
+    dict: Column name -> numpy array, plus "<name>__vocab" arrays for dictionary-encoded string columns.
+"""
+def build_columns(path, kind):
+    field_types = RECORD_TYPES[kind].field_types
+    buffers = {}
+    vocabularies = {}
+    for field, converter in field_types.items():
+        if converter is float:
+            buffers[field] = array("d")
+        elif converter is int:
+            buffers[field] = array("q")
+        elif converter is str:
+            buffers[field] = array("i")
+            vocabularies[field] = {}
+        elif converter is not tuple:                                # "x,y" point
+            buffers[field + "_x"] = array("d")
+            buffers[field + "_y"] = array("d")
+
+    for record in READERS[kind](path):
+        for field, value in zip(record._fields, record):
+            converter = field_types[field]
+            if converter is float:
+                buffers[field].append(np.nan if value is None else value)
+            elif converter is int:
+                buffers[field].append(MISSING_INT if value is None else value)
+            elif converter is str:
+                vocabulary = vocabularies[field]
+                buffers[field].append(-1 if value is None else vocabulary.setdefault(value, len(vocabulary)))
+            elif converter is not tuple:
+                x, y = (np.nan, np.nan) if value is None else value
+                buffers[field + "_x"].append(x)
+                buffers[field + "_y"].append(y)
+
+    columns = {name: np.frombuffer(buffer, dtype={"d": np.float64, "q": np.int64, "i": np.int32}[buffer.typecode])
+               for name, buffer in buffers.items()}
+    for field, vocabulary in vocabularies.items():
+        columns[field + "__vocab"] = np.array(list(vocabulary), dtype=str)
+    return columns
+
+
+"""
+OutputColumns Class
+
+Columnar view of one cached SUMO output.
+
+Functionality:
+    - table[name] returns a column; string columns are decoded from their dictionary ("" for missing).
+    - codes(name) / vocabulary(name) give the raw dictionary encoding for fast grouping and filtering.
+    - distribution(name) summarizes a numeric column (ignoring missing values).
+
+Args:
+    kind (str): Output kind.
+    arrays (dict): Column arrays as produced by build_columns.
+    source (str): Source output file.
+"""
+class OutputColumns:
+
+    def __init__(self, kind, arrays, source):
+        self.kind = kind
+        self.source = source
+        self._arrays = arrays
+        self.columns = [name for name in arrays if not name.endswith("__vocab")]
+
+
+    def __len__(self):
+        return len(self._arrays[self.columns[0]]) if self.columns else 0
+
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+
+    def __getitem__(self, name):
+        vocabulary = self._arrays.get(name + "__vocab")
+        column = self._arrays[name]
+        if vocabulary is None:
+            return column
+        return np.append(vocabulary, "")[column]                    # Code -1 picks the appended ""
+
+
+    """
+    Function: codes
+
+    Dictionary codes of a string column (-1 for missing).
+    """
+    def codes(self, name):
+        return self._arrays[name]
+
+
+    """
+    Function: vocabulary
+
+    Distinct values of a string column, indexed by code.
+    """
+    def vocabulary(self, name):
+        return self._arrays[name + "__vocab"]
+
+
+    """
+    Function: distribution
+
+    Summary statistics of a numeric column.
+
+    Args:
+        name (str): Column name.
+        percentiles (tuple of float): Percentiles to report (default DEFAULT_PERCENTILES).
+
+    Returns:
+        dict: count, mean, std, min, max and "p<N>" for each percentile (missing values excluded).
+    """
+    def distribution(self, name, percentiles=DEFAULT_PERCENTILES):
+        column = self._arrays[name]
+        if column.dtype == np.int64:
+            column = column[column != MISSING_INT]
+        column = column.astype(np.float64)
+        column = column[~np.isnan(column)]
+        if not len(column):
+            return {"count": 0}
+        stats = {"count": int(len(column)), "mean": float(column.mean()), "std": float(column.std()),
+                 "min": float(column.min()), "max": float(column.max())}
+        for percentile, value in zip(percentiles, np.percentile(column, percentiles)):
+            stats[f"p{percentile:g}"] = float(value)
+        return stats
+
+
+"""
+Function: load_columns
+
+Load an output as columns, building or rebuilding the cache when needed.
+
+Args:
+    path (str): Source output file.
+    kind (str, optional): Output kind (default: detected from the root element).
+    cache_dir (str, optional): Directory for cache files (default: next to the source).
+    rebuild (bool): Ignore any existing cache.
+
+Returns:
+    OutputColumns: The output's columns.
+
+Steps:
+1. Open the cache if it exists and was built by this CACHE_VERSION for the same kind
+2. Accept it if the source's size and mtime match, or else if the source's SHA-256 still matches
+3. Otherwise stream the source into columns and write a new cache atomically
+"""
+def load_columns(path, kind=None, cache_dir=None, rebuild=False):
+    kind = kind or detect_kind(path)
+    target = cache_path(path, kind, cache_dir)
+    stat = os.stat(path)
+    digest = None
+    if not rebuild and os.path.exists(target):
+        with np.load(target) as cached:
+            arrays = {name: cached[name] for name in cached.files}
+        meta = {name: arrays.pop(name).item() for name in list(arrays) if name.startswith("__")}
+        if meta.get("__version") == CACHE_VERSION and meta.get("__kind") == kind:
+            if meta["__size"] == stat.st_size and meta["__mtime_ns"] == stat.st_mtime_ns:
+                return OutputColumns(kind, arrays, path)
+            digest = file_digest(path)
+            if meta["__sha256"] == digest:
+                return OutputColumns(kind, arrays, path)
+
+    digest = digest or file_digest(path)
+    arrays = build_columns(path, kind)
+    meta = {"__version": CACHE_VERSION, "__kind": kind, "__sha256": digest, "__size": stat.st_size,
+            "__mtime_ns": stat.st_mtime_ns}
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp_path = target + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays, **{name: np.array(value) for name, value in meta.items()})
+    os.replace(tmp_path, target)
+    return OutputColumns(kind, arrays, path)
+
+
+if __name__ == "__main__":
+    # Simple test: cache the Bologna pasubio tripinfos and E1 detector outputs, then compare cold and warm loads
+    import tempfile
+    import time
+
+    scenario = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "SUMO",
+                            "Existing Sims with Focus on Realistic Demands", "Bologna_small-0.29.0", "pasubio")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name in ("tripinfos.xml", "e1_output.xml"):
+            source = os.path.join(scenario, name)
+            start = time.perf_counter()
+            table = load_columns(source, cache_dir=cache_dir)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            table = load_columns(source, cache_dir=cache_dir)
+            warm = time.perf_counter() - start
+            print(f"[Output Cache] {name} ({table.kind}): {len(table)} records, "
+                  f"cold {cold * 1000:.1f} ms, warm {warm * 1000:.1f} ms")
+
+        trips = load_columns(os.path.join(scenario, "tripinfos.xml"), cache_dir=cache_dir)
+        for column in ("duration", "waiting_time", "time_loss", "route_length"):
+            stats = trips.distribution(column)
+            print(f"[Output Cache] {column}: mean {stats['mean']:.1f}, p50 {stats['p50']:.1f}, "
+                  f"p95 {stats['p95']:.1f}, max {stats['max']:.1f}")
+        counts = np.bincount(trips.codes("vtype"), minlength=len(trips.vocabulary("vtype")))
+        print(f"[Output Cache] Trips per vType: {dict(zip(trips.vocabulary('vtype').tolist(), counts.tolist()))}")